@@ -0,0 +1,63 @@
+# -------------------------
+# benchmarks/present.py
+# -------------------------
+# Part de l'écran réellement envoyée à l'affichage par jeu (present.py).
+# Chaque jeu est lancé sans fenêtre, on choisit la première option du menu
+# puis on laisse tourner SECONDS secondes avant de fermer.
+#   images     : images présentées
+#   flips      : images envoyées en entier (première image, grands changements)
+#   écran      : part moyenne de la fenêtre envoyée par image (flip = 100 %)
+#   ms/image   : coût moyen de la présentation
+# Avec le pilote vidéo « dummy », seules les parts d'écran sont parlantes ;
+# pour le coût réel, lancer avec une vraie fenêtre :
+#   SDL_VIDEODRIVER=x11 python benchmarks/present.py [secondes]
+# Les parties jouées ici ne touchent pas aux données des joueurs : scores et
+# historique dans un dossier temporaire (MINI_JEUX_DATA), pas de relecture.
+import atexit
+import os
+import shutil
+import sys
+import tempfile
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ['MINI_JEUX_DATA'] = tempfile.mkdtemp(prefix='mini-jeux-bench-')
+os.environ['MINI_JEUX_REPLAYS'] = '0'
+atexit.register(shutil.rmtree, os.environ['MINI_JEUX_DATA'], True)  # après l'écriture des scores (atexit : ordre inverse)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import pygame  # noqa: E402
+
+from mini_games import present  # noqa: E402
+from mini_games.registry import GAMES, load_game  # noqa: E402
+
+SECONDS = 2.0
+SKIP = ("high_scores",)  # pas un jeu
+
+
+def play(label, seconds):
+    screen = pygame.display.set_mode((640, 480))
+    pygame.event.clear()
+    game = load_game(label)(screen)
+    pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_1, unicode='1', mod=0, scancode=0))
+    # QUIT répété : ferme la partie puis l'écran de fin
+    pygame.time.set_timer(pygame.QUIT, int(seconds * 1000))
+    try:
+        game.run()
+    finally:
+        pygame.time.set_timer(pygame.QUIT, 0)
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else SECONDS
+    pygame.init()
+    for label, module, _ in GAMES:
+        if module not in SKIP:
+            play(label, seconds)
+    print(f"{'jeu':<20} {'images':>7} {'flips':>6} {'écran':>7} {'ms/image':>9}")
+    for name, s in sorted(present.stats().items()):
+        print(f"{name:<20} {s['frames']:>7} {s['flips']:>6} {s['screen_share']:>7.1%} {s['present_ms']:>9.3f}")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
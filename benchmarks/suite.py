@@ -0,0 +1,377 @@
+# -------------------------
+# benchmarks/suite.py
+# -------------------------
+# Suite de mesures des moteurs de jeu, résultats en JSON pour comparer
+# deux versions (ou deux machines).
+#   micro  : les calculs coûteux pris isolément (génération du Sudoku,
+#            coups du 2048, minimax du Morpion, mélange du Taquin,
+#            collisions du Casse-briques). Temps par appel en µs.
+#   sim    : les règles seules (objets d'état de sim.py), sans fenêtre ni
+#            dessin, pas après pas aussi vite que possible avec des
+#            actions aléatoires. Pas simulés par seconde.
+#   frames : une image complète par jeu (simulation + dessin +
+#            présentation), enchaînée FRAMES fois sans attente. Temps par
+#            image en ms, et nombre d'images au-delà du budget de 60 i/s.
+# Sans fenêtre (pilote vidéo « dummy ») : seuls les temps relatifs d'une
+# même machine sont comparables.
+#   python benchmarks/suite.py [--quick] [--out fichier.json]
+# Par défaut, le JSON est écrit dans benchmarks/results/AAAAMMJJ-HHMMSS.json.
+# Les scores des parties jouées au hasard vont dans un dossier temporaire
+# (MINI_JEUX_DATA), jamais dans best_scores.json ; rien n'est enregistré
+# dans replays/.
+import argparse
+import atexit
+import copy
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('MINI_JEUX_SON', '0')
+os.environ['MINI_JEUX_DATA'] = tempfile.mkdtemp(prefix='mini-jeux-bench-')
+atexit.register(shutil.rmtree, os.environ['MINI_JEUX_DATA'], True)  # après l'écriture des scores (atexit : ordre inverse)
+os.environ['MINI_JEUX_REPLAYS'] = '0'
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import pygame  # noqa: E402
+
+from mini_games.breackout import BreakoutState  # noqa: E402
+from mini_games.display import get_display  # noqa: E402
+from mini_games.flappy import FlappyState  # noqa: E402
+from mini_games.game_2048 import Game2048State  # noqa: E402
+from mini_games.pong import PongState  # noqa: E402
+from mini_games.present import Presenter  # noqa: E402
+from mini_games.registry import find_class  # noqa: E402
+from mini_games.snake import SnakeState  # noqa: E402
+
+FRAMES = 600  # 10 s de jeu à 60 i/s
+FRAME_BUDGET_MS = 1000 / 60
+SEED = 1234  # mêmes grilles et mêmes coups d'une mesure à l'autre
+SIM_STEPS = 20000
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+
+def summary(samples, unit):
+    samples = sorted(samples)
+    scale = 1e6 if unit == 'us' else 1e3
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    return {
+        "runs": len(samples),
+        f"mean_{unit}": round(statistics.fmean(samples) * scale, 3),
+        f"p50_{unit}": round(statistics.median(samples) * scale, 3),
+        f"p99_{unit}": round(p99 * scale, 3),
+        f"min_{unit}": round(samples[0] * scale, 3),
+        f"max_{unit}": round(samples[-1] * scale, 3),
+    }
+
+
+def measure(fn, runs, setup=None):
+    """Temps (s) de chaque appel fn(*setup()) ; setup n'est pas chronométré."""
+    samples = []
+    for i in range(runs):
+        args = setup(i) if setup is not None else ()
+        start = time.perf_counter()
+        fn(*args)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def choose(method, key):
+    """Répond key au menu de choix du jeu (modal.pick) sans attendre le clavier."""
+    pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=ord(key), unicode=key, mod=0, scancode=0))
+    return method()
+
+
+def game(class_name):
+    return find_class(class_name)(get_display().surface)
+
+
+# --- micro ---
+
+def micro_benchmarks(scale):
+    results = {}
+    sudoku = game("SudokuGame")
+    solution, givens = sudoku.generate(40)
+    results["sudoku.fill_full"] = measure(
+        sudoku.fill_full, 50 * scale, lambda i: ([[0] * 9 for _ in range(9)],))
+    results["sudoku.count_solutions"] = measure(
+        sudoku.count_solutions, 50 * scale, lambda i: (copy.deepcopy(givens), 2))
+    results["sudoku.dig_holes"] = measure(sudoku.dig_holes, 3 * scale, lambda i: (solution, 40))
+
+    directions = ('left', 'up', 'right', 'down')
+    boards = []
+    for _ in range(64):
+        g2048 = Game2048State(4)
+        for _ in range(random.randrange(5, 60)):
+            g2048.step(random.choice(directions), 0.0)
+        boards.append([row[:] for row in g2048.grid])
+
+    def load_board(i):
+        g2048.grid = [row[:] for row in boards[i % len(boards)]]
+        g2048.over = False
+        return ()
+    results["2048.move"] = measure(
+        lambda: g2048.step(directions[random.randrange(4)], 0.0), 2000 * scale, load_board)
+    results["2048.can_move"] = measure(g2048.can_move, 2000 * scale, load_board)
+
+    ttt = game("TicTacToeGame")
+
+    def opening(i):
+        board = [['' for _ in range(3)] for _ in range(3)]
+        board[i % 3][(i // 3) % 3] = ttt.human_symbol
+        return board, 0, True
+    results["tictactoe.minimax"] = measure(ttt.minimax, 5 * scale, opening)
+
+    taquin = game("SlidingPuzzleGame")
+    taquin.size = 4
+    results["taquin.shuffle"] = measure(taquin.shuffle, 50 * scale, lambda i: (1000,))
+
+    width, height = get_display().surface.get_size()
+
+    def fresh_wall(i):
+        # balle lancée vers le mur de briques, toutes intactes (difficile : 9x7)
+        breakout = BreakoutState(width, height, 9, 7, 150)
+        breakout.ball_pos = [width / 2 + (i % 7) * 20, 200]
+        return (breakout,)
+    results["breakout.step"] = measure(
+        lambda breakout: breakout.step(0, 1 / 60), 2000 * scale, fresh_wall)
+    return {name: summary(samples, 'us') for name, samples in results.items()}
+
+
+# --- sim ---
+
+# jeu -> (nouvel état, action aléatoire)
+SIM_GAMES = {
+    "SnakeState": (lambda w, h, rng: SnakeState(w // 20, h // 20, 0.1, 45, 10, rng=rng),
+                   lambda: random.choice((None, None, None, (0, -1), (0, 1), (-1, 0), (1, 0)))),
+    "FlappyState": (lambda w, h, rng: FlappyState(w, h, 130, 150, 1300, rng=rng),
+                    lambda: random.random() < 0.05),
+    "BreakoutState": (lambda w, h, rng: BreakoutState(w, h, 7, 6, 120, rng=rng),
+                      lambda: random.choice((-1, 0, 1))),
+    "PongState": (lambda w, h, rng: PongState(w, h, ai=True, rng=rng),
+                  lambda: (random.choice((-1, 0, 1)), 0)),
+    "Game2048State": (lambda w, h, rng: Game2048State(4, rng=rng),
+                      lambda: random.choice(('left', 'up', 'right', 'down'))),
+}
+
+
+def sim_benchmarks(steps):
+    """Pas de 1/60 s enchaînés sans fenêtre ; une nouvelle partie dès que la précédente finit."""
+    results = {}
+    width, height = get_display().surface.get_size()
+    dt = 1 / 60
+    for name, (new_state, random_action) in SIM_GAMES.items():
+        actions = [random_action() for _ in range(steps)]  # tirées hors chronométrage
+        rng = random.Random(SEED)
+        state = new_state(width, height, rng)
+        games = 1
+        start = time.perf_counter()
+        for action in actions:
+            state.step(action, dt)
+            if state.over:
+                state = new_state(width, height, rng)
+                games += 1
+        elapsed = time.perf_counter() - start
+        results[name] = {
+            "steps": steps,
+            "games": games,
+            "steps_per_s": round(steps / elapsed),
+            "mean_us": round(elapsed / steps * 1e6, 3),
+        }
+    return results
+
+
+# --- frames ---
+
+def loop_frames(game):
+    """Une image d'un jeu en temps réel (loop.GameLoop) : un pas, le dessin, la présentation."""
+    dt = 1.0 / game.tick_rate
+    game.presenter = Presenter(game.screen, type(game).__name__)
+    game.running = True
+    game.time = 0.0
+
+    def frame(i):
+        game.update(dt)
+        game.time += dt
+        game.render(1.0)
+        game.presenter.present()
+    return frame
+
+
+def pong():
+    g = game("PongGame")
+    choose(g.choose_mode, '2')
+    g.new_match()
+    return loop_frames(g)
+
+
+def breakout():
+    g = game("BreakoutGame")
+    choose(g.choose_difficulty, '1')
+    g.new_match()
+    return loop_frames(g)
+
+
+def flappy():
+    g = game("FlappyGame")
+    choose(g.choose_difficulty, '1')
+    g.new_match()
+    return loop_frames(g)
+
+
+def whack():
+    g = game("WhackAMoleGame")
+    g.prepare_holes()
+    g.build_layers()
+    g.start_level(0)
+    return loop_frames(g)
+
+
+def game_2048():
+    g = game("Game2048")
+    choose(g.choose_size, '2')
+    g.new_match()
+    g.presenter = Presenter(g.screen, "Game2048")
+    directions = ('left', 'up', 'right', 'down')
+
+    def frame(i):
+        g.move(directions[i % 4])
+        if g.state.over:
+            g.new_match()
+        g.draw()
+    return frame
+
+
+def sudoku():
+    g = game("SudokuGame")
+    choose(g.choose_difficulty, '1')
+    g.prepared['1'][0].result()  # la grille suivante se génère dans un thread : on l'attend
+    g.presenter = Presenter(g.screen, "SudokuGame")
+    g.build_layers()
+
+    def frame(i):
+        g.selected = (i // 9 % 9, i % 9)
+        g.draw()
+        g.presenter.present()
+    return frame
+
+
+def taquin():
+    g = game("SlidingPuzzleGame")
+    choose(g.choose_difficulty, '2')
+    g.shuffle(500 + g.size * 200)
+    g.start_time = time.time()
+    g.presenter = Presenter(g.screen, "SlidingPuzzleGame")
+
+    def frame(i):
+        g.swap_with_empty(random.choice(g.valid_moves()))
+        g.draw()
+    return frame
+
+
+def hangman():
+    g = game("HangmanGame")
+    choose(g.choose_difficulty, '1')
+    g.presenter = Presenter(g.screen, "HangmanGame")
+    return lambda i: g.draw()
+
+
+def tictactoe():
+    g = game("TicTacToeGame")
+    g.screen = get_display().use((g.width, g.height))
+    g.build_layers()
+    g.presenter = Presenter(g.screen, "TicTacToeGame")
+    cells = [(r, c) for r in range(3) for c in range(3)]
+
+    def frame(i):
+        if i % 9 == 0:
+            g.board = [['' for _ in range(3)] for _ in range(3)]
+        r, c = cells[i % 9]
+        g.board[r][c] = 'X' if i % 2 else 'O'
+        g.draw_board()
+        g.presenter.present()
+    return frame
+
+
+# Jeux dont la logique et le dessin sont encore mêlés dans run() : pas
+# d'image isolable (Snake, Memory, Simon, Devinez, Math Quiz, Réaction).
+FRAME_BENCHMARKS = {
+    "PongGame": pong,
+    "BreakoutGame": breakout,
+    "FlappyGame": flappy,
+    "WhackAMoleGame": whack,
+    "Game2048": game_2048,
+    "SudokuGame": sudoku,
+    "SlidingPuzzleGame": taquin,
+    "HangmanGame": hangman,
+    "TicTacToeGame": tictactoe,
+}
+
+
+def frame_benchmarks(frames):
+    results = {}
+    for name, make in FRAME_BENCHMARKS.items():
+        frame = make()
+        samples = measure(frame, frames, lambda i: (i,))
+        get_display().restore()
+        report = summary(samples, 'ms')
+        report["over_budget"] = sum(1 for s in samples if s * 1000 > FRAME_BUDGET_MS)
+        results[name] = report
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mesures des moteurs de jeu (JSON).")
+    parser.add_argument('--quick', action='store_true', help="moins de répétitions (vérification rapide)")
+    parser.add_argument('--out', help="fichier JSON (défaut : benchmarks/results/<date>.json)")
+    args = parser.parse_args()
+
+    pygame.init()
+    get_display().open()
+    random.seed(SEED)
+    scale = 1 if args.quick else 3
+    report = {
+        "meta": {
+            "date": time.strftime('%Y-%m-%dT%H:%M:%S'),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "sdl": ".".join(map(str, pygame.get_sdl_version())),
+            "platform": platform.platform(),
+            "video_driver": pygame.display.get_driver(),
+            "seed": SEED,
+            "frame_budget_ms": round(FRAME_BUDGET_MS, 3),
+        },
+        "micro": micro_benchmarks(scale),
+        "sim": sim_benchmarks(SIM_STEPS * scale),
+        "frames": frame_benchmarks(FRAMES // 3 if args.quick else FRAMES),
+    }
+    pygame.quit()
+
+    print(f"{'micro':<24} {'appels':>7} {'moy. µs':>10} {'p50 µs':>10} {'p99 µs':>10}")
+    for name, s in report["micro"].items():
+        print(f"{name:<24} {s['runs']:>7} {s['mean_us']:>10.1f} {s['p50_us']:>10.1f} {s['p99_us']:>10.1f}")
+    print(f"\n{'sim':<24} {'pas':>7} {'parties':>10} {'pas/s':>10} {'moy. µs':>10}")
+    for name, s in report["sim"].items():
+        print(f"{name:<24} {s['steps']:>7} {s['games']:>10} {s['steps_per_s']:>10} {s['mean_us']:>10.1f}")
+    print(f"\n{'image':<24} {'images':>7} {'moy. ms':>10} {'p99 ms':>10} {'> budget':>10}")
+    for name, s in report["frames"].items():
+        print(f"{name:<24} {s['runs']:>7} {s['mean_ms']:>10.3f} {s['p99_ms']:>10.3f} {s['over_budget']:>10}")
+
+    out = args.out
+    if out is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        out = os.path.join(RESULTS_DIR, time.strftime('%Y%m%d-%H%M%S') + '.json')
+    with open(out, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=1)
+    print(f"\n-> {out}")
+
+
+if __name__ == "__main__":
+    main()
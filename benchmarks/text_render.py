@@ -0,0 +1,89 @@
+# -------------------------
+# benchmarks/text_render.py
+# -------------------------
+# Coût par image de l'affichage des compteurs (temps, score, coups) :
+#   avant      : pygame font.render() + blit à chaque image
+#   cache      : CachedFont.render() (LRU) -- le texte change, peu de hits
+#   atlas      : font.glyphs(couleur).draw() depuis la planche (transparente)
+#   atlas+fond : font.glyphs(couleur, fond).draw() (blits opaques)
+# Lancer depuis la racine du projet : python benchmarks/text_render.py [images]
+import os
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import pygame  # noqa: E402
+
+from mini_games import fonts  # noqa: E402
+
+FONT_SIZES = (28, 48)
+COLOR = (240, 240, 240)
+BG = (30, 30, 50)
+REPEATS = 3
+
+
+def counters(frame):
+    # HUD typique : un temps qui change chaque seconde, un score et un
+    # compteur qui changent à chaque image
+    return (f"Temps: {frame // 60}s", f"Score: {frame * 7}", f"Touches: {frame % 25}/25")
+
+
+def bench(draw_frame, frames):
+    best = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        for frame in range(frames):
+            draw_frame(frame)
+        elapsed = (time.perf_counter() - start) / frames
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1e6  # µs par image
+
+
+def run_size(screen, size, frames):
+    raw_font = pygame.font.Font(None, size)
+    font = fonts.get_font(size)
+    atlas = font.glyphs(COLOR)
+    atlas_bg = font.glyphs(COLOR, BG)
+
+    def draw_raw(frame):
+        for i, text in enumerate(counters(frame)):
+            screen.blit(raw_font.render(text, True, COLOR), (20, 20 + size * i))
+
+    def draw_cached(frame):
+        for i, text in enumerate(counters(frame)):
+            screen.blit(font.render(text, True, COLOR), (20, 20 + size * i))
+
+    def draw_atlas(frame):
+        for i, text in enumerate(counters(frame)):
+            atlas.draw(screen, text, (20, 20 + size * i))
+
+    def draw_atlas_bg(frame):
+        for i, text in enumerate(counters(frame)):
+            atlas_bg.draw(screen, text, (20, 20 + size * i))
+
+    results = [("avant", bench(draw_raw, frames)),
+               ("cache", bench(draw_cached, frames)),
+               ("atlas", bench(draw_atlas, frames)),
+               ("atlas+fond", bench(draw_atlas_bg, frames))]
+    before = results[0][1]
+    print(f"taille {size} :")
+    for name, cost in results:
+        print(f"  {name:<11} {cost:7.1f} µs/image  x{before / cost:.1f}")
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    pygame.init()
+    screen = pygame.display.set_mode((640, 480))
+    print(f"{frames} images, 3 compteurs par image (meilleur de {REPEATS})")
+    for size in FONT_SIZES:
+        run_size(screen, size, frames)
+    stats = fonts.stats()
+    print(f"cache de textes : {stats['hit_rate']:.0%} de hits, {stats['entries']} surfaces, {stats['bytes'] // 1024} Ko")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
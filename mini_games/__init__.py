@@ -2,18 +2,13 @@
 # mini_games/__init__.py
 # -------------------------
 # Ce fichier rend le dossier mini_games importable comme un package
-from .guess_number import GuessNumberGame
-from .memory import MemoryGame
-from .pong import PongGame
-from .high_scores import HighScores
-from .snake import SnakeGame
-from .tic_tac_toe import TicTacToeGame
-from .breakout import BreakoutGame
-from .whack_a_mole import WhackAMoleGame
-from .sliding_puzzle import SlidingPuzzleGame
-from .simon_says import SimonSaysGame
-from .reaction_timer import ReactionTimerGame
-from .math_quiz import MathQuizGame
-from .pendu import PenduGame
-from .sudoku import SudokuGame
-from .game_2048 import Game2048
+# Les jeux ne sont plus importés ici : voir registry.py (import à la demande).
+# "from mini_games import SnakeGame" reste possible grâce à __getattr__.
+
+
+def __getattr__(name):
+    from .registry import find_class
+    try:
+        return find_class(name)
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
@@ -0,0 +1,93 @@
+# -------------------------
+# mini_games/assets.py
+# -------------------------
+# Sprites pré-rendus des jeux.
+# Au lieu de tracer à chaque image les mêmes formes (ellipse de l'oiseau,
+# cercles des taupes, cartes du Memory...), chaque jeu déclare ses sprites
+# une fois ; ils sont dessinés ensemble dans une planche (atlas) convertie
+# au format de l'écran, et le jeu en copie ensuite des morceaux : un blit
+# au lieu d'un tracé.
+# La planche est opaque avec une couleur transparente (colorkey) et
+# RLEACCEL : pour ces formes à bords nets, c'est le blit le plus rapide
+# (la transparence par pixel de convert_alpha() coûte plus cher que de
+# retracer le cercle). Un sprite qui a besoin d'anticrénelage (texte)
+# peint donc son propre fond.
+# Les atlas sont gardés pour toute la session : relancer un jeu ne
+# redessine rien.
+import pygame
+
+PADDING = 1  # pixels vides entre deux sprites de la planche
+SHEET_WIDTH = 512
+COLORKEY = (255, 0, 255)  # couleur « transparente » de la planche
+
+_atlases = {}  # nom du jeu -> SpriteAtlas
+
+
+class SpriteAtlas:
+    def __init__(self, name):
+        self.name = name
+        self.pending = []  # (clé, taille, paint) en attente de build()
+        self.areas = {}  # clé -> Rect dans la planche
+        self.sheet = None
+
+    def add(self, key, size, paint):
+        """Déclare un sprite : paint(surface) dessine dans une surface vide (transparente) de taille size."""
+        self.pending.append((key, size, paint))
+
+    def circle(self, key, color, radius, width=0):
+        self.add(key, (radius * 2, radius * 2),
+                 lambda surf: pygame.draw.circle(surf, color, (radius, radius), radius, width))
+
+    def ellipse(self, key, color, size, width=0):
+        self.add(key, size, lambda surf: pygame.draw.ellipse(surf, color, surf.get_rect(), width))
+
+    def rect(self, key, color, size, width=0, border_radius=0):
+        self.add(key, size, lambda surf: pygame.draw.rect(surf, color, surf.get_rect(), width, border_radius))
+
+    def build(self):
+        """Range les sprites sur une planche par étagères (les plus hauts d'abord) et les dessine."""
+        pending = sorted(self.pending, key=lambda item: item[1][1], reverse=True)
+        width = max([SHEET_WIDTH] + [w + PADDING for _, (w, _), _ in pending])
+        slots = []
+        x = y = shelf = 0
+        for key, (w, h), paint in pending:
+            if x + w > width:
+                x, y, shelf = 0, y + shelf + PADDING, 0
+            slots.append((key, pygame.Rect(x, y, w, h), paint))
+            x += w + PADDING
+            shelf = max(shelf, h)
+        sheet = pygame.Surface((width, max(1, y + shelf)))
+        sheet.fill(COLORKEY)
+        for key, rect, paint in slots:
+            paint(sheet.subsurface(rect))
+        if pygame.display.get_surface() is not None:
+            sheet = sheet.convert()
+        sheet.set_colorkey(COLORKEY, pygame.RLEACCEL)
+        self.sheet = sheet
+        self.areas = {key: rect for key, rect, _ in slots}
+        self.pending = []
+        return self
+
+    def __getitem__(self, key):
+        """Sous-surface du sprite (pour transform, get_size...) ; pour dessiner, préférer blit()."""
+        return self.sheet.subsurface(self.areas[key])
+
+    def blit(self, dest, key, pos=None, **anchor):
+        """Copie le sprite key sur dest ; pos = coin haut-gauche, ou ancre (center=...). Retourne le rect."""
+        area = self.areas[key]
+        rect = pygame.Rect(0, 0, area.width, area.height)
+        if pos is not None:
+            rect.topleft = pos
+        for name, value in anchor.items():
+            setattr(rect, name, value)
+        return dest.blit(self.sheet, rect, area)
+
+
+def get_atlas(name, define):
+    """Atlas du jeu name ; define(atlas) y déclare les sprites au premier appel seulement."""
+    atlas = _atlases.get(name)
+    if atlas is None:
+        atlas = SpriteAtlas(name)
+        define(atlas)
+        _atlases[name] = atlas.build()
+    return atlas
@@ -0,0 +1,82 @@
+# -------------------------
+# mini_games/audio.py
+# -------------------------
+# Sons des jeux, synthétisés une seule fois.
+# Un jeu déclare ses sons à la construction avec tone(clé, fréquence,
+# durée) : l'onde est calculée à ce moment-là, directement dans le format
+# du mixer (échantillons 16 bits, mono ou stéréo), et gardée pour toute la
+# session. Pendant la partie, play_sound(clé) ne fait que lancer le son
+# sur le canal suivant d'un pool fixe de POOL_SIZE canaux : ni calcul, ni
+# décodage, ni allocation dans la boucle de jeu. Si tous les canaux sont
+# pris, le plus ancien son est coupé.
+# Sans carte son (ou avec MINI_JEUX_SON=0), tone() et play_sound() ne
+# font rien.
+import array
+import math
+import os
+
+import pygame
+
+SAMPLE_RATE = 22050  # si le mixer n'est pas déjà ouvert par pygame.init()
+POOL_SIZE = 8
+VOLUME = 0.25
+FADE = 0.005  # attaque / relâchement (s) : évite les clics en début et fin de son
+ENABLED = os.environ.get('MINI_JEUX_SON', '1') != '0'
+
+_sounds = {}  # clé -> pygame.mixer.Sound
+_pool = []  # canaux réservés aux jeux
+_next = 0  # prochain canal du pool
+_ready = None  # None : mixer pas encore essayé
+
+
+def _init():
+    global _ready
+    if _ready is None:
+        _ready = False
+        if not ENABLED:
+            return False
+        try:
+            if pygame.mixer.get_init() is None:
+                pygame.mixer.init(SAMPLE_RATE, -16, 1, 512)
+            _ready = pygame.mixer.get_init()[1] == -16
+        except pygame.error:
+            return False  # pas de périphérique audio : jeux muets
+        if _ready:
+            pygame.mixer.set_num_channels(POOL_SIZE)
+            _pool.extend(pygame.mixer.Channel(i) for i in range(POOL_SIZE))
+    return _ready
+
+
+def _synth(freq, seconds, volume, wave):
+    rate, _, channels = pygame.mixer.get_init()
+    count = int(rate * seconds)
+    fade = max(1, int(rate * FADE))
+    amplitude = 32767 * volume
+    samples = array.array('h', bytes(2 * count * channels))
+    for i in range(count):
+        phase = (i * freq / rate) % 1.0
+        if wave == 'square':
+            value = 1.0 if phase < 0.5 else -1.0
+        else:
+            value = math.sin(2 * math.pi * phase)
+        sample = int(amplitude * value * min(1.0, i / fade, (count - i) / fade))
+        for c in range(channels):
+            samples[i * channels + c] = sample
+    return pygame.mixer.Sound(buffer=samples.tobytes())
+
+
+def tone(key, freq, seconds, volume=VOLUME, wave='sine'):
+    """Déclare le son key (onde 'sine' ou 'square'), synthétisé au premier appel seulement ; retourne key."""
+    if key not in _sounds and _init():
+        _sounds[key] = _synth(freq, seconds, volume, wave)
+    return key
+
+
+def play_sound(key):
+    """Joue le son key sur le canal suivant du pool."""
+    global _next
+    sound = _sounds.get(key)
+    if sound is None:
+        return
+    _pool[_next].play(sound)
+    _next = (_next + 1) % POOL_SIZE
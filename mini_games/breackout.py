@@ -1,9 +1,17 @@
 # mini_games/breakout.py
 import pygame
-import random
-import time
-import json
-import os
+
+from .assets import get_atlas
+from .audio import play_sound, tone
+from .fonts import get_font
+from .layers import Compositor
+from .loop import GameLoop, lerp
+from .modal import pick, wait_key
+from .replay import Recorder
+from .scores import get_store
+from .sim import GameState
+
+GAME_INFO = {"name": "Casse-briques", "class": "BreakoutGame", "scores": {"Breakout_*": "max"}, "order": 30}
 
 # Couleurs
 BG = (10, 10, 30)
@@ -22,93 +30,40 @@ BRICK_PADDING = 5
 TOP_OFFSET = 80
 
 FONT_SIZE = 28
-SCORES_FILE = os.path.join(os.path.dirname(__file__), '..', 'best_scores.json')
+
+PADDLE_SPEED = 360  # px/s
+# Sons (Hz, s) : raquette, brique, mur, balle perdue
+PADDLE_TONE = (440, 0.04)
+BRICK_TONE = (660, 0.05)
+WALL_TONE = (330, 0.03)
+LOST_TONE = (150, 0.4)
 
 DIFFICULTIES = {
-    '1': ('Facile', 4, 5, 1.5),    # (nom, colonnes de briques, rangées, vitesse de balle)
-    '2': ('Moyen', 7, 6, 2.0),
-    '3': ('Difficile', 9, 7, 2.5),
+    '1': ('Facile', 4, 5, 90),    # (nom, colonnes de briques, rangées, vitesse de balle en px/s)
+    '2': ('Moyen', 7, 6, 120),
+    '3': ('Difficile', 9, 7, 150),
 }
 
 
-class BreakoutGame:
-    def __init__(self, screen):
-        self.screen = screen
-        self.width, self.height = screen.get_size()
-        self.font = pygame.font.Font(None, FONT_SIZE)
-        self.difficulty = None
-        self.cols = 7
-        self.rows = 5
-        self.ball_speed = 2.0
-        self.paddle = pygame.Rect(
-            (self.width - PADDLE_WIDTH) // 2,
-            self.height - 50,
-            PADDLE_WIDTH,
-            PADDLE_HEIGHT,
-        )
-        self.ball_pos = [self.width // 2, self.height // 2]
-        self.ball_vel = [self.ball_speed, -self.ball_speed]
-        self.bricks = []
-        self.lives = 3
-        self.score = 0
-        self.best_scores = self.load_scores()
-
-    def load_scores(self):
-        try:
-            with open(SCORES_FILE, 'r') as f:
-                return json.load(f)
-        except Exception:
-            return {}
-
-    def save_scores(self):
-        try:
-            with open(SCORES_FILE, 'w') as f:
-                json.dump(self.best_scores, f)
-        except Exception:
-            pass
+class BreakoutState(GameState):
+    """Règles du casse-briques ; action = sens de la raquette, -1, 0 ou 1.
 
-    def choose_difficulty(self):
-        choosing = True
-        while choosing:
-            self.screen.fill(BG)
-            title = self.font.render("Casse-briques : Choisis la difficulté", True, TEXT_COLOR)
-            self.screen.blit(title, title.get_rect(center=(self.width // 2, 80)))
-            for key, (name, cols, rows, speed) in DIFFICULTIES.items():
-                desc = f"{key}. {name} - {cols}x{rows} briques, vitesse {speed:.1f}"
-                txt = self.font.render(desc, True, TEXT_COLOR)
-                self.screen.blit(txt, (40, 160 + int(key) * 50))
-            info = self.font.render("1/2/3 pour choisir, Q pour quitter", True, TEXT_COLOR)
-            self.screen.blit(info, (40, self.height - 50))
-            pygame.display.flip()
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    return False
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_q:
-                        return False
-                    if event.unicode in DIFFICULTIES:
-                        name, cols, rows, speed = DIFFICULTIES[event.unicode]
-                        self.difficulty = name
-                        self.cols = cols
-                        self.rows = rows
-                        self.ball_speed = speed
-                        return True
-        return False
-
-    def setup(self):
-        # Paddle
-        self.paddle.width = PADDLE_WIDTH
-        self.paddle.x = (self.width - PADDLE_WIDTH) // 2
-        # Ball
-        self.ball_pos = [self.width // 2, self.height - 60]
-        self.ball_vel = [self.ball_speed, -self.ball_speed]
-        # Bricks
+    Événements : 'wall', 'paddle', ('brick', rect de la brique), 'lost'.
+    """
+
+    def __init__(self, width, height, cols, rows, ball_speed, rng=None):
+        super().__init__(rng)
+        self.width, self.height = width, height
+        self.ball_speed = ball_speed
+        self.paddle = pygame.Rect((width - PADDLE_WIDTH) // 2, height - 50, PADDLE_WIDTH, PADDLE_HEIGHT)
+        self.ball_pos = [width // 2, height - 60]
+        self.prev_ball_pos = list(self.ball_pos)
+        self.ball_vel = [ball_speed, -ball_speed]
         self.bricks = []
-        total_width = self.cols * (BRICK_WIDTH + BRICK_PADDING) - BRICK_PADDING
-        start_x = (self.width - total_width) // 2
-        for row in range(self.rows):
-            for col in range(self.cols):
+        total_width = cols * (BRICK_WIDTH + BRICK_PADDING) - BRICK_PADDING
+        start_x = (width - total_width) // 2
+        for row in range(rows):
+            for col in range(cols):
                 x = start_x + col * (BRICK_WIDTH + BRICK_PADDING)
                 y = TOP_OFFSET + row * (BRICK_HEIGHT + BRICK_PADDING)
                 rect = pygame.Rect(x, y, BRICK_WIDTH, BRICK_HEIGHT)
@@ -118,130 +73,207 @@ class BreakoutGame:
         self.lives = 3
         self.score = 0
 
-    def draw(self):
-        self.screen.fill(BG)
-        # Bricks
+    @property
+    def won(self):
+        return all(b['hit'] for b in self.bricks)
+
+    def advance(self, direction, dt):
+        # Input paddle
+        self.paddle.x += direction * round(PADDLE_SPEED * dt)
+        # Clamp paddle
+        if self.paddle.left < 0:
+            self.paddle.left = 0
+        if self.paddle.right > self.width:
+            self.paddle.right = self.width
+
+        # Move ball
+        self.prev_ball_pos = list(self.ball_pos)
+        self.ball_pos[0] += self.ball_vel[0] * dt
+        self.ball_pos[1] += self.ball_vel[1] * dt
+
+        # Collisions murs
+        if self.ball_pos[0] - BALL_RADIUS <= 0 or self.ball_pos[0] + BALL_RADIUS >= self.width:
+            self.ball_vel[0] *= -1
+            self.emit('wall')
+        if self.ball_pos[1] - BALL_RADIUS <= 0:
+            self.ball_vel[1] *= -1
+            self.emit('wall')
+
+        # Collision paddle
+        paddle_rect = self.paddle
+        ball_rect = pygame.Rect(int(self.ball_pos[0] - BALL_RADIUS), int(self.ball_pos[1] - BALL_RADIUS),
+                                BALL_RADIUS * 2, BALL_RADIUS * 2)
+        if ball_rect.colliderect(paddle_rect) and self.ball_vel[1] > 0:
+            self.ball_vel[1] *= -1
+            # ajuster direction selon position sur la raquette
+            offset = (self.ball_pos[0] - (paddle_rect.x + paddle_rect.width / 2)) / (paddle_rect.width / 2)
+            self.ball_vel[0] = self.ball_speed * offset
+            self.emit('paddle')
+
+        # Collision briques
         for b in self.bricks:
-            if not b['hit']:
-                pygame.draw.rect(self.screen, b['color'], b['rect'])
-                pygame.draw.rect(self.screen, (30, 30, 30), b['rect'], 2)
-        # Paddle
-        pygame.draw.rect(self.screen, PADDLE_COLOR, self.paddle)
-        # Ball
-        pygame.draw.circle(self.screen, BALL_COLOR, (int(self.ball_pos[0]), int(self.ball_pos[1])), BALL_RADIUS)
-        # UI
-        score_txt = self.font.render(f"Score: {self.score}", True, TEXT_COLOR)
-        lives_txt = self.font.render(f"Vies: {self.lives}", True, TEXT_COLOR)
+            if not b['hit'] and ball_rect.colliderect(b['rect']):
+                b['hit'] = True
+                self.score += 10
+                self.emit('brick', b['rect'])
+                # rebond approximatif
+                if abs(ball_rect.bottom - b['rect'].top) < 10 and self.ball_vel[1] > 0:
+                    self.ball_vel[1] *= -1
+                elif abs(ball_rect.top - b['rect'].bottom) < 10 and self.ball_vel[1] < 0:
+                    self.ball_vel[1] *= -1
+                else:
+                    self.ball_vel[0] *= -1
+                break
+
+        # Ball out bottom
+        if self.ball_pos[1] - BALL_RADIUS > self.height:
+            self.lives -= 1
+            self.emit('lost')
+            if self.lives <= 0:
+                self.over = True
+            else:
+                # reset position
+                self.ball_pos = [self.width // 2, self.height - 60]
+                self.prev_ball_pos = list(self.ball_pos)
+                self.ball_vel = [self.ball_speed * self.rng.choice((1, -1)), -self.ball_speed]
+
+        # Victoire
+        if self.won:
+            self.over = True
+
+
+class BreakoutGame(GameLoop):
+    def __init__(self, screen):
+        self.screen = screen
+        self.width, self.height = screen.get_size()
+        self.font = get_font(FONT_SIZE)
+        self.difficulty = None
+        self.cols = 7
+        self.rows = 5
+        self.ball_speed = 120
+        self.state = None
+        self.alpha = 1.0  # fraction de pas pour interpoler la balle à l'affichage
+        self.best_scores = get_store()
+        self.sprites = get_atlas("BreakoutGame", self.define_sprites)
+        tone('breakout_paddle', *PADDLE_TONE)
+        tone('breakout_brick', *BRICK_TONE, wave='square')
+        tone('breakout_wall', *WALL_TONE)
+        tone('breakout_lost', *LOST_TONE, wave='square')
+
+    def define_sprites(self, atlas):
+        atlas.circle('ball', BALL_COLOR, BALL_RADIUS)
+
+    def draw_difficulty_menu(self):
+        self.screen.fill(BG)
+        title = self.font.render("Casse-briques : Choisis la difficulté", True, TEXT_COLOR)
+        self.screen.blit(title, title.get_rect(center=(self.width // 2, 80)))
+        for key, (name, cols, rows, speed) in DIFFICULTIES.items():
+            desc = f"{key}. {name} - {cols}x{rows} briques, vitesse {speed} px/s"
+            txt = self.font.render(desc, True, TEXT_COLOR)
+            self.screen.blit(txt, (40, 160 + int(key) * 50))
+        info = self.font.render("1/2/3 pour choisir, Q pour quitter", True, TEXT_COLOR)
+        self.screen.blit(info, (40, self.height - 50))
+
+    def choose_difficulty(self):
+        choice = pick(self.draw_difficulty_menu, DIFFICULTIES)
+        if choice is None:
+            return False
+        name, cols, rows, speed = DIFFICULTIES[choice]
+        self.difficulty = name
+        self.cols = cols
+        self.rows = rows
+        self.ball_speed = speed
+        return True
+
+    def new_match(self, replay=None):
+        params = {"width": self.width, "height": self.height, "cols": self.cols, "rows": self.rows,
+                  "ball_speed": self.ball_speed}
+        self.session = replay or Recorder(self, BreakoutState, params, dt=1 / self.tick_rate,
+                                          settings={"difficulty": self.difficulty})
+        self.state = self.session.state
+        # fond + briques : une image en cache, retouchée brique par brique
+        self.layers = Compositor(self.screen)
+        self.layers.add('background', self.paint_background)
+        self.layers.add('bricks', self.paint_bricks)
+        self.layers.add('sprites', self.paint_sprites, static=False)
+        self.layers.add('hud', self.paint_hud, static=False)
+
+    def paint_background(self, surf):
+        surf.fill(BG)
         best_key = f"Breakout_{self.difficulty}"
         best = self.best_scores.get(best_key, 0)
         best_txt = self.font.render(f"Meilleur: {best}", True, TEXT_COLOR)
         diff_txt = self.font.render(f"Difficulté: {self.difficulty}", True, TEXT_COLOR)
-        self.screen.blit(score_txt, (10, 10))
-        self.screen.blit(lives_txt, (10, 40))
-        self.screen.blit(diff_txt, (self.width - 220, 10))
-        self.screen.blit(best_txt, (self.width - 220, 40))
+        surf.blit(diff_txt, (self.width - 220, 10))
+        surf.blit(best_txt, (self.width - 220, 40))
+
+    def paint_bricks(self, surf):
+        for b in self.state.bricks:
+            if not b['hit']:
+                pygame.draw.rect(surf, b['color'], b['rect'])
+                pygame.draw.rect(surf, (30, 30, 30), b['rect'], 2)
+
+    def paint_sprites(self, surf):
+        state = self.state
+        present = self.presenter
+        # Paddle
+        present.sprite('paddle', pygame.draw.rect(surf, PADDLE_COLOR, state.paddle))
+        # Ball
+        ball_x = lerp(state.prev_ball_pos[0], state.ball_pos[0], self.alpha)
+        ball_y = lerp(state.prev_ball_pos[1], state.ball_pos[1], self.alpha)
+        present.sprite('ball', self.sprites.blit(surf, 'ball', center=(int(ball_x), int(ball_y))))
+
+    def paint_hud(self, surf):
+        score, lives = self.state.score, self.state.lives
+        score_txt = self.font.render(f"Score: {score}", True, TEXT_COLOR)
+        lives_txt = self.font.render(f"Vies: {lives}", True, TEXT_COLOR)
+        self.presenter.sprite('score', surf.blit(score_txt, (10, 10)), score)
+        self.presenter.sprite('lives', surf.blit(lives_txt, (10, 40)), lives)
+
+    def draw(self, alpha=1.0):
+        self.alpha = alpha
+        self.layers.compose(self.presenter)
+
+    def update(self, dt):
+        keys = pygame.key.get_pressed()
+        direction = ((keys[pygame.K_RIGHT] or keys[pygame.K_d]) - (keys[pygame.K_LEFT] or keys[pygame.K_a]))
+        for name, rect in self.session.step(direction, dt):
+            if name == 'brick':
+                self.layers.invalidate('bricks', rect)
+            play_sound('breakout_' + name)
+        if self.state.over or self.session.finished:
+            self.stop()
+
+    def render(self, alpha):
+        self.draw(alpha)
 
     def run(self):
         if not self.choose_difficulty():
             return
-        self.setup()
-        clock = pygame.time.Clock()
-        running = True
-        while running:
-            dt = clock.tick(60)
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-
-            # Input paddle
-            keys = pygame.key.get_pressed()
-            if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-                self.paddle.x -= 6
-            if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-                self.paddle.x += 6
-            # Clamp paddle
-            if self.paddle.left < 0:
-                self.paddle.left = 0
-            if self.paddle.right > self.width:
-                self.paddle.right = self.width
-
-            # Move ball
-            self.ball_pos[0] += self.ball_vel[0]
-            self.ball_pos[1] += self.ball_vel[1]
-
-            # Collisions murs
-            if self.ball_pos[0] - BALL_RADIUS <= 0 or self.ball_pos[0] + BALL_RADIUS >= self.width:
-                self.ball_vel[0] *= -1
-            if self.ball_pos[1] - BALL_RADIUS <= 0:
-                self.ball_vel[1] *= -1
-
-            # Collision paddle
-            paddle_rect = self.paddle
-            ball_rect = pygame.Rect(int(self.ball_pos[0] - BALL_RADIUS), int(self.ball_pos[1] - BALL_RADIUS),
-                                    BALL_RADIUS * 2, BALL_RADIUS * 2)
-            if ball_rect.colliderect(paddle_rect) and self.ball_vel[1] > 0:
-                self.ball_vel[1] *= -1
-                # ajuster direction selon position sur la raquette
-                offset = (self.ball_pos[0] - (paddle_rect.x + paddle_rect.width / 2)) / (paddle_rect.width / 2)
-                self.ball_vel[0] = self.ball_speed * offset
-
-            # Collision briques
-            for b in self.bricks:
-                if not b['hit'] and ball_rect.colliderect(b['rect']):
-                    b['hit'] = True
-                    self.score += 10
-                    # rebond approximatif
-                    if abs(ball_rect.bottom - b['rect'].top) < 10 and self.ball_vel[1] > 0:
-                        self.ball_vel[1] *= -1
-                    elif abs(ball_rect.top - b['rect'].bottom) < 10 and self.ball_vel[1] < 0:
-                        self.ball_vel[1] *= -1
-                    else:
-                        self.ball_vel[0] *= -1
-                    break
-
-            # Ball out bottom
-            if self.ball_pos[1] - BALL_RADIUS > self.height:
-                self.lives -= 1
-                if self.lives <= 0:
-                    running = False
-                else:
-                    # reset position
-                    self.ball_pos = [self.width // 2, self.height - 60]
-                    self.ball_vel = [self.ball_speed * random.choice((1, -1)), -self.ball_speed]
-
-            # Victoire
-            if all(b['hit'] for b in self.bricks):
-                running = False
-
-            self.draw()
-            pygame.display.flip()
+        self.new_match()
+        self.run_loop()
+        self.session.save()
 
         # Fin de partie : sauvegarde meilleur score
         key = f"Breakout_{self.difficulty}"
         prev = self.best_scores.get(key, 0)
-        if self.score > prev:
-            self.best_scores[key] = self.score
-            self.save_scores()
+        score = self.state.score
+        if score > prev:
+            self.best_scores[key] = score
+        self.best_scores.record_run("Breakout", self.difficulty, score, self.state.time)
 
         # Écran de fin
         self.screen.fill(BG)
-        if all(b['hit'] for b in self.bricks):
+        if self.state.won:
             end_msg = "Gagné !"
         else:
             end_msg = "Perdu..."
         end_txt = self.font.render(end_msg, True, TEXT_COLOR)
-        score_txt = self.font.render(f"Score: {self.score}", True, TEXT_COLOR)
+        score_txt = self.font.render(f"Score: {score}", True, TEXT_COLOR)
         best_txt = self.font.render(f"Meilleur ({self.difficulty}): {self.best_scores.get(key)}", True, TEXT_COLOR)
         prompt = self.font.render("Appuie sur Entrée pour revenir", True, TEXT_COLOR)
         self.screen.blit(end_txt, end_txt.get_rect(center=(self.width // 2, self.height // 2 - 40)))
         self.screen.blit(score_txt, score_txt.get_rect(center=(self.width // 2, self.height // 2)))
         self.screen.blit(best_txt, best_txt.get_rect(center=(self.width // 2, self.height // 2 + 40)))
         self.screen.blit(prompt, prompt.get_rect(center=(self.width // 2, self.height // 2 + 90)))
-        pygame.display.flip()
-        waiting = True
-        while waiting:
-            for e in pygame.event.get():
-                if e.type == pygame.QUIT:
-                    waiting = False
-                elif e.type == pygame.KEYDOWN and e.key == pygame.K_RETURN:
-                    waiting = False
+        wait_key()
@@ -0,0 +1,92 @@
+# -------------------------
+# mini_games/discovery.py
+# -------------------------
+# Découverte des jeux sans les importer.
+# Chaque module de jeu déclare un dictionnaire littéral GAME_INFO :
+#     GAME_INFO = {"name": "Snake", "class": "SnakeGame", "scores": {"Snake_*": "max"}, "order": 20}
+# "scores" : motifs (fnmatch) des clés de best_scores.json et de
+# l'historique écrites par le jeu -> "max" ou "min" (temps, coups : le plus
+# petit est le meilleur). Le premier motif qui correspond l'emporte ; voir
+# registry.score_rule().
+# On le lit avec ast (pas d'exécution du module). Le résultat est gardé
+# dans un manifeste indexé par la date de modification de chaque fichier :
+# aux lancements suivants, seuls les fichiers modifiés ou nouveaux sont relus.
+import ast
+import json
+import os
+import tempfile
+
+GAMES_DIR = os.path.dirname(os.path.abspath(__file__))
+MANIFEST_FILE = os.path.join(GAMES_DIR, '..', '.games_manifest.json')
+MANIFEST_VERSION = 2  # 2 : "scores" est un dict motif -> sens
+DEFAULT_ORDER = 500  # les nouveaux jeux sans "order" arrivent après les jeux d'origine
+
+
+def read_game_info(path):
+    """Extrait GAME_INFO d'un fichier source, ou None si ce n'est pas un jeu."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            tree = ast.parse(f.read(), filename=path)
+    except (OSError, SyntaxError, ValueError):
+        return None
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(
+                isinstance(t, ast.Name) and t.id == 'GAME_INFO' for t in node.targets):
+            try:
+                info = ast.literal_eval(node.value)
+            except ValueError:
+                return None
+            if isinstance(info, dict) and 'name' in info and 'class' in info:
+                return info
+    return None
+
+
+def _load_manifest(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get("version") == MANIFEST_VERSION:
+            return manifest
+    except Exception:
+        pass
+    return {"version": MANIFEST_VERSION, "modules": {}}
+
+
+def _save_manifest(path, manifest):
+    try:
+        fd, tmp = tempfile.mkstemp(prefix='.games_manifest.', suffix='.tmp', dir=os.path.dirname(path))
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, path)
+    except Exception:
+        pass  # dossier en lecture seule : on refera la découverte au prochain lancement
+
+
+def discover(games_dir=GAMES_DIR, manifest_path=MANIFEST_FILE):
+    """Retourne la liste des jeux [{"module", "name", "class", ...}] triée pour le menu."""
+    manifest = _load_manifest(manifest_path)
+    cached = manifest["modules"]
+    modules = {}
+    changed = False
+    for entry in os.scandir(games_dir):
+        if not entry.name.endswith('.py') or entry.name.startswith('_'):
+            continue
+        module = entry.name[:-3]
+        mtime = entry.stat().st_mtime
+        previous = cached.get(module)
+        if previous is not None and previous["mtime"] == mtime:
+            modules[module] = previous
+            continue
+        modules[module] = {"mtime": mtime, "info": read_game_info(entry.path)}
+        changed = True
+    if changed or len(modules) != len(cached):
+        manifest["modules"] = modules
+        _save_manifest(manifest_path, manifest)
+
+    games = []
+    for module, entry in modules.items():
+        info = entry["info"]
+        if info:
+            games.append(dict(info, module=module))
+    games.sort(key=lambda g: (g.get("order", DEFAULT_ORDER), g["name"].lower()))
+    return games
@@ -0,0 +1,138 @@
+# -------------------------
+# mini_games/display.py
+# -------------------------
+# Gestion de l'unique fenêtre du programme.
+# La fenêtre est créée une seule fois (open) et n'est plus jamais recréée :
+# un jeu qui veut une autre taille (Morpion, plus haut que large) ne
+# rappelle pas display.set_mode, il demande une surface logique à sa
+# taille (use) et la rend avec restore() en sortant.
+# Il dessine dans cette surface comme avant ; à chaque image, flip() ou
+# update() la met à l'échelle une fois dans la fenêtre (proportions
+# gardées, bandes noires autour) puis l'envoie à l'écran. Les clics sont
+# ramenés aux coordonnées logiques par to_logical() / mouse_pos().
+# Quand la surface logique a la taille de la fenêtre (cas général), le jeu
+# dessine directement dans la fenêtre : aucune copie, aucune mise à
+# l'échelle.
+# layout() garde les calculs de mise en page d'un jeu (taille des cases,
+# marges...) par résolution, au lieu de les refaire à chaque image.
+import pygame
+
+WINDOW_SIZE = (640, 480)
+BAR_COLOR = (0, 0, 0)  # bandes autour d'une surface logique mise à l'échelle
+
+_display = None
+
+
+class Display:
+    def __init__(self):
+        self.window = None
+        self.logical = None  # surface logique du jeu en cours
+        self.dest = None  # zone de la fenêtre où elle est affichée (None : la fenêtre elle-même)
+        self.target = None  # sous-surface de la fenêtre correspondant à dest
+        self.surfaces = {}  # taille -> surface logique, réutilisée d'une partie à l'autre
+        self.layouts = {}  # (clé, taille) -> mise en page calculée
+        self.scale = pygame.transform.scale
+
+    def open(self, size=WINDOW_SIZE):
+        """Crée la fenêtre au premier appel ; ensuite, la retourne telle quelle."""
+        if pygame.display.get_surface() is None:
+            pygame.display.set_mode(size)
+        self._sync()
+        return self.restore()
+
+    def _sync(self):
+        # fenêtre créée ailleurs (benchmarks) : on l'adopte
+        window = pygame.display.get_surface()
+        if window is not self.window:
+            self.window = window
+            self.surfaces.clear()  # format de pixels peut-être différent
+            self.restore()
+
+    def use(self, size):
+        """Surface logique de taille size pour le jeu en cours ; la fenêtre ne change pas."""
+        self._sync()
+        size = tuple(size)
+        if size == self.window.get_size():
+            return self.restore()
+        surface = self.surfaces.get(size)
+        if surface is None:
+            surface = self.surfaces[size] = pygame.Surface(size).convert()
+        ratio = min(self.window.get_width() / size[0], self.window.get_height() / size[1])
+        dest = pygame.Rect(0, 0, round(size[0] * ratio), round(size[1] * ratio))
+        dest.center = self.window.get_rect().center
+        self.logical, self.dest = surface, dest
+        self.target = self.window.subsurface(dest)
+        # smoothscale (plus propre en réduction) demande des pixels 24/32 bits
+        if self.window.get_bitsize() in (24, 32):
+            self.scale = pygame.transform.smoothscale
+        else:
+            self.scale = pygame.transform.scale
+        self.window.fill(BAR_COLOR)
+        return surface
+
+    @property
+    def surface(self):
+        """Surface où dessine le jeu en cours (la fenêtre ou sa surface logique)."""
+        self._sync()
+        return self.logical
+
+    def restore(self):
+        """Revient au dessin direct dans la fenêtre."""
+        self.logical, self.dest, self.target = self.window, None, None
+        return self.window
+
+    def _blit_scaled(self):
+        self.scale(self.logical, self.dest.size, self.target)
+
+    def flip(self):
+        self._sync()
+        if self.dest is not None:
+            self._blit_scaled()
+        pygame.display.flip()
+
+    def update(self, rects):
+        self._sync()
+        if self.dest is None:
+            pygame.display.update(rects)
+            return
+        self._blit_scaled()
+        pygame.display.update([self.to_window(rect) for rect in rects])
+
+    def to_window(self, rect):
+        """Rect logique -> rect de la fenêtre (arrondi vers l'extérieur)."""
+        rect = pygame.Rect(rect)
+        if self.dest is None:
+            return rect
+        w, h = self.logical.get_size()
+        left = self.dest.x + rect.left * self.dest.width // w
+        top = self.dest.y + rect.top * self.dest.height // h
+        right = self.dest.x + -(-rect.right * self.dest.width // w)
+        bottom = self.dest.y + -(-rect.bottom * self.dest.height // h)
+        return pygame.Rect(left, top, right - left, bottom - top).clip(self.dest)
+
+    def to_logical(self, pos):
+        """Position dans la fenêtre (clic) -> position dans la surface logique."""
+        if self.dest is None:
+            return pos
+        w, h = self.logical.get_size()
+        return ((pos[0] - self.dest.x) * w // self.dest.width,
+                (pos[1] - self.dest.y) * h // self.dest.height)
+
+    def mouse_pos(self):
+        return self.to_logical(pygame.mouse.get_pos())
+
+    def layout(self, key, size, compute):
+        """Mise en page du jeu key pour la résolution size : compute(largeur, hauteur), calculé une fois."""
+        entry = (key, size)
+        value = self.layouts.get(entry)
+        if value is None:
+            value = self.layouts[entry] = compute(*size)
+        return value
+
+
+def get_display():
+    """Gestionnaire de fenêtre partagé par le menu et tous les jeux."""
+    global _display
+    if _display is None:
+        _display = Display()
+    return _display
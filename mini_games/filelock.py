@@ -0,0 +1,28 @@
+# -------------------------
+# mini_games/filelock.py
+# -------------------------
+# Verrou inter-processus (fcntl.flock) pour plusieurs copies de main.py
+# lancées sur la même machine. Le verrou porte sur un fichier ".lock"
+# séparé, car les fichiers de scores sont remplacés par rename.
+# Il n'est tenu que le temps d'une écriture, jamais pendant une partie.
+import contextlib
+import os
+
+try:
+    import fcntl
+except ImportError:  # Windows : pas de verrou, comportement d'avant
+    fcntl = None
+
+
+@contextlib.contextmanager
+def file_lock(path):
+    if fcntl is None:
+        yield
+        return
+    fd = os.open(path + '.lock', os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
@@ -1,9 +1,15 @@
 # mini_games/flappy.py
 import pygame
-import random
-import time
-import json
-import os
+
+from .assets import get_atlas
+from .fonts import get_font
+from .loop import GameLoop, lerp
+from .modal import pick, wait_key
+from .replay import Recorder
+from .scores import get_store
+from .sim import GameState
+
+GAME_INFO = {"name": "Flappy", "class": "FlappyGame", "scores": {"Flappy_*": "max"}, "order": 150}
 
 # Couleurs / paramètres
 BG = (30, 180, 230)
@@ -13,114 +19,165 @@ GROUND_COLOR = (170, 100, 40)
 TEXT_COLOR = (15, 15, 15)
 FONT_SIZE = 28
 
-GRAVITY = 0.5
-FLAP_STRENGTH = -8
-
-SCORES_FILE = os.path.join(os.path.dirname(__file__), '..', 'best_scores.json')
+# Physique en unités par seconde (indépendante du nombre d'images)
+GRAVITY = 1800  # px/s²
+FLAP_STRENGTH = -480  # px/s
 
 DIFFICULTIES = {
-    '1': ('Facile', 160, 2.0, 1500),    # (nom, gap, vitesse, intervalle_ms)
-    '2': ('Moyen', 130, 2.5, 1300),
-    '3': ('Difficile', 100, 3.0, 1100),
+    '1': ('Facile', 160, 120, 1500),    # (nom, gap, vitesse px/s, intervalle_ms)
+    '2': ('Moyen', 130, 150, 1300),
+    '3': ('Difficile', 100, 180, 1100),
 }
+GROUND_HEIGHT = 50
 
 
-class FlappyGame:
-    def __init__(self, screen):
-        self.screen = screen
-        self.width, self.height = screen.get_size()
-        self.font = pygame.font.Font(None, FONT_SIZE)
-        self.difficulty = None
-        self.pipe_gap = 150
-        self.pipe_speed = 2.0
-        self.spawn_interval = 1500  # en ms
-        self.bird = None
-        self.bird_vel = 0
-        self.pipes = []  # liste de tuples (x, top_height)
-        self.last_spawn = 0
-        self.score = 0
-        self.best_scores = self.load_scores()
-        self.ground_height = 50
-
-    def load_scores(self):
-        try:
-            with open(SCORES_FILE, 'r') as f:
-                return json.load(f)
-        except Exception:
-            return {}
-
-    def save_scores(self):
-        try:
-            with open(SCORES_FILE, 'w') as f:
-                json.dump(self.best_scores, f)
-        except Exception:
-            pass
+class FlappyState(GameState):
+    """Règles de Flappy ; action = vrai si l'oiseau bat des ailes pendant ce pas.
 
-    def choose_difficulty(self):
-        choosing = True
-        while choosing:
-            self.screen.fill(BG)
-            title = self.font.render("Flappy : Choisis la difficulté", True, TEXT_COLOR)
-            self.screen.blit(title, title.get_rect(center=(self.width // 2, 80)))
-            for key, (name, gap, speed, interval) in DIFFICULTIES.items():
-                desc = f"{key}. {name} - Écart: {gap}px, vitesse: {speed:.1f}"
-                txt = self.font.render(desc, True, TEXT_COLOR)
-                self.screen.blit(txt, (40, 160 + int(key) * 50))
-            info = self.font.render("1/2/3 pour choisir, Echap pour quitter", True, TEXT_COLOR)
-            self.screen.blit(info, (40, self.height - 50))
-            pygame.display.flip()
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    return False
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        return False
-                    if event.unicode in DIFFICULTIES:
-                        name, gap, speed, interval = DIFFICULTIES[event.unicode]
-                        self.difficulty = name
-                        self.pipe_gap = gap
-                        self.pipe_speed = speed
-                        self.spawn_interval = interval
-                        return True
-        return False
+    Événement : 'point' quand un tuyau est passé.
+    """
 
-    def reset(self):
-        # Oiseau : carré simple ou cercle
-        self.bird = [self.width // 4, self.height // 2]
+    def __init__(self, width, height, pipe_gap, pipe_speed, spawn_interval, rng=None):
+        super().__init__(rng)
+        self.width, self.height = width, height
+        self.pipe_gap = pipe_gap
+        self.pipe_speed = pipe_speed
+        self.spawn_interval = spawn_interval  # en ms
+        self.ground_height = GROUND_HEIGHT
+        self.bird = [width // 4, height // 2]
         self.bird_vel = 0
-        self.pipes = []
-        self.last_spawn = pygame.time.get_ticks()
+        self.prev_bird_y = self.bird[1]  # position au pas précédent, pour l'interpolation
+        self.pipes = []  # liste de [x, top_height]
+        self.last_spawn = 0  # en temps simulé (s)
         self.score = 0
 
     def spawn_pipe(self):
         # hauteur aléatoire pour le haut entre 50 et height - gap - ground - 50
         min_top = 50
         max_top = self.height - self.pipe_gap - self.ground_height - 50
-        top_height = random.randint(min_top, max_top)
+        top_height = self.rng.randint(min_top, max_top)
         x = self.width
         self.pipes.append([x, top_height])
 
-    def draw(self):
-        self.screen.fill(BG)
+    def check_collision(self):
+        # Oiseau
+        bx, by = self.bird
+        bird_rect = pygame.Rect(int(bx) - 12, int(by) - 12, 24, 24)
+        # Sol / plafond
+        if by - 12 <= 0 or by + 12 >= self.height - self.ground_height:
+            return True
         # Pipes
         for px, top_h in self.pipes:
+            top_rect = pygame.Rect(px, 0, 60, top_h)
+            bottom_rect = pygame.Rect(px, top_h + self.pipe_gap, 60, self.height - top_h - self.pipe_gap - self.ground_height)
+            if bird_rect.colliderect(top_rect) or bird_rect.colliderect(bottom_rect):
+                return True
+        return False
+
+    def advance(self, flap, dt):
+        # Physique
+        if flap:
+            self.bird_vel = FLAP_STRENGTH
+        self.prev_bird_y = self.bird[1]
+        self.bird_vel += GRAVITY * dt
+        self.bird[1] += self.bird_vel * dt
+
+        # Pipes mouvement + score quand l'arrière d'un pipe passe l'oiseau
+        for pipe in self.pipes:
+            before = pipe[0] + 60
+            pipe[0] -= self.pipe_speed * dt
+            if before >= self.bird[0] > pipe[0] + 60:
+                self.score += 1
+                self.emit('point')
+
+        # Génération de pipe
+        if (self.time - self.last_spawn) * 1000 >= self.spawn_interval:
+            self.spawn_pipe()
+            self.last_spawn = self.time
+
+        # Retirer pipes passées
+        self.pipes = [p for p in self.pipes if p[0] + 60 > 0]
+
+        # Collision
+        if self.check_collision():
+            self.over = True
+
+
+class FlappyGame(GameLoop):
+    def __init__(self, screen):
+        self.screen = screen
+        self.width, self.height = screen.get_size()
+        self.font = get_font(FONT_SIZE)
+        self.sprites = get_atlas("FlappyGame", self.define_sprites)
+        self.difficulty = None
+        self.pipe_gap = 150
+        self.pipe_speed = 120
+        self.spawn_interval = 1500  # en ms
+        self.state = None
+        self.flap = False  # battement demandé depuis le dernier pas
+        self.best_scores = get_store()
+        self.ground_height = GROUND_HEIGHT
+
+    def draw_difficulty_menu(self):
+        self.screen.fill(BG)
+        title = self.font.render("Flappy : Choisis la difficulté", True, TEXT_COLOR)
+        self.screen.blit(title, title.get_rect(center=(self.width // 2, 80)))
+        for key, (name, gap, speed, interval) in DIFFICULTIES.items():
+            desc = f"{key}. {name} - Écart: {gap}px, vitesse: {speed} px/s"
+            txt = self.font.render(desc, True, TEXT_COLOR)
+            self.screen.blit(txt, (40, 160 + int(key) * 50))
+        info = self.font.render("1/2/3 pour choisir, Echap pour quitter", True, TEXT_COLOR)
+        self.screen.blit(info, (40, self.height - 50))
+
+    def choose_difficulty(self):
+        choice = pick(self.draw_difficulty_menu, DIFFICULTIES, quit_keys=(pygame.K_ESCAPE,))
+        if choice is None:
+            return False
+        name, gap, speed, interval = DIFFICULTIES[choice]
+        self.difficulty = name
+        self.pipe_gap = gap
+        self.pipe_speed = speed
+        self.spawn_interval = interval
+        return True
+
+    def define_sprites(self, atlas):
+        atlas.ellipse('bird', BIRD_COLOR, (24, 24))
+
+    def new_match(self, replay=None):
+        params = {"width": self.width, "height": self.height, "pipe_gap": self.pipe_gap,
+                  "pipe_speed": self.pipe_speed, "spawn_interval": self.spawn_interval}
+        self.session = replay or Recorder(self, FlappyState, params, dt=1 / self.tick_rate,
+                                          settings={"difficulty": self.difficulty})
+        self.state = self.session.state
+        self.flap = False
+
+    def draw(self, alpha=1.0):
+        self.screen.fill(BG)
+        # les tuyaux avancent tous à la même vitesse : on les recule de la
+        # fraction de pas pas encore jouée
+        state = self.state
+        shift = state.pipe_speed * (1.0 - alpha) / self.tick_rate
+        present = self.presenter
+        # Pipes
+        for i, (px, top_h) in enumerate(state.pipes):
+            px += shift
             # haut
-            pygame.draw.rect(self.screen, PIPE_COLOR, pygame.Rect(px, 0, 60, top_h))
+            present.sprite(('pipe', i), pygame.draw.rect(self.screen, PIPE_COLOR, pygame.Rect(px, 0, 60, top_h)))
             # bas
-            pygame.draw.rect(
+            present.sprite(('pipe_bottom', i), pygame.draw.rect(
                 self.screen,
                 PIPE_COLOR,
-                pygame.Rect(px, top_h + self.pipe_gap, 60, self.height - top_h - self.pipe_gap - self.ground_height)
-            )
+                pygame.Rect(px, top_h + state.pipe_gap, 60, self.height - top_h - state.pipe_gap - self.ground_height)
+            ))
         # Sol
         pygame.draw.rect(self.screen, GROUND_COLOR, pygame.Rect(0, self.height - self.ground_height, self.width, self.ground_height))
         # Oiseau
-        bird_rect = pygame.Rect(int(self.bird[0]) - 12, int(self.bird[1]) - 12, 24, 24)
-        pygame.draw.ellipse(self.screen, BIRD_COLOR, bird_rect)
+        bird_y = lerp(state.prev_bird_y, state.bird[1], alpha)
+        bird_rect = pygame.Rect(int(state.bird[0]) - 12, int(bird_y) - 12, 24, 24)
+        present.sprite('bird', self.sprites.blit(self.screen, 'bird', bird_rect.topleft))
         # Score
-        score_txt = self.font.render(f"Score: {self.score}", True, TEXT_COLOR)
-        self.screen.blit(score_txt, (10, 10))
+        score_txt = self.font.render(f"Score: {state.score}", True, TEXT_COLOR)
+        present.sprite('score', self.screen.blit(score_txt, (10, 10)), state.score)
         best_key = f"Flappy_{self.difficulty}"
         best = self.best_scores.get(best_key, 0)
         best_txt = self.font.render(f"Meilleur: {best}", True, TEXT_COLOR)
@@ -128,94 +185,47 @@ class FlappyGame:
         diff_txt = self.font.render(f"Difficulté: {self.difficulty}", True, TEXT_COLOR)
         self.screen.blit(diff_txt, (self.width - 220, 10))
 
-    def check_collision(self):
-        # Oiseau
-        bx, by = self.bird
-        bird_rect = pygame.Rect(int(bx) - 12, int(by) - 12, 24, 24)
-        # Sol / plafond
-        if by - 12 <= 0 or by + 12 >= self.height - self.ground_height:
-            return True
-        # Pipes
-        for px, top_h in self.pipes:
-            top_rect = pygame.Rect(px, 0, 60, top_h)
-            bottom_rect = pygame.Rect(px, top_h + self.pipe_gap, 60, self.height - top_h - self.pipe_gap - self.ground_height)
-            if bird_rect.colliderect(top_rect) or bird_rect.colliderect(bottom_rect):
-                return True
-        return False
+    def handle_event(self, event):
+        if event.type == pygame.QUIT:
+            self.stop()
+        elif event.type == pygame.KEYDOWN:
+            if event.key in (pygame.K_SPACE, pygame.K_UP):
+                self.flap = True
+            elif event.key == pygame.K_ESCAPE:
+                self.stop()
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            self.flap = True
+
+    def update(self, dt):
+        self.session.step(self.flap, dt)
+        self.flap = False
+        if self.state.over or self.session.finished:
+            self.stop()
+
+    def render(self, alpha):
+        self.draw(alpha)
 
     def run(self):
         if not self.choose_difficulty():
             return
-        self.reset()
-        clock = pygame.time.Clock()
-        running = True
-        passed_pipes = set()
-
-        while running:
-            dt = clock.tick(60)
-            now = pygame.time.get_ticks()
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                elif event.type == pygame.KEYDOWN:
-                    if event.key in (pygame.K_SPACE, pygame.K_UP):
-                        self.bird_vel = FLAP_STRENGTH
-                    elif event.key == pygame.K_ESCAPE:
-                        running = False
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    self.bird_vel = FLAP_STRENGTH
-
-            # Physique
-            self.bird_vel += GRAVITY
-            self.bird[1] += self.bird_vel
-
-            # Pipes mouvement
-            for pipe in self.pipes:
-                pipe[0] -= self.pipe_speed
-
-            # Génération de pipe
-            if now - self.last_spawn >= self.spawn_interval:
-                self.spawn_pipe()
-                self.last_spawn = now
-
-            # Retirer pipes passées
-            self.pipes = [p for p in self.pipes if p[0] + 60 > 0]
-
-            # Score : quand l'oiseau passe un pipe (x de pipe+largeur passe sous bird)
-            for i, (px, top_h) in enumerate(self.pipes):
-                if px + 60 < self.bird[0] and i not in passed_pipes:
-                    passed_pipes.add(i)
-                    self.score += 1
-
-            # Dessin
-            self.draw()
-            pygame.display.flip()
-
-            # Collision
-            if self.check_collision():
-                break
+        self.new_match()
+        self.run_loop()
+        self.session.save()
 
         # Mise à jour du meilleur score
         key = f"Flappy_{self.difficulty}"
         prev = self.best_scores.get(key, 0)
-        if self.score > prev:
-            self.best_scores[key] = self.score
-            self.save_scores()
+        score = self.state.score
+        if score > prev:
+            self.best_scores[key] = score
+        self.best_scores.record_run("Flappy", self.difficulty, score, self.state.time)
 
         # Écran de fin
         self.screen.fill(BG)
-        end_txt = self.font.render(f"Fin! Score: {self.score}", True, TEXT_COLOR)
+        end_txt = self.font.render(f"Fin! Score: {score}", True, TEXT_COLOR)
         best_txt = self.font.render(f"Meilleur ({self.difficulty}): {self.best_scores.get(key)}", True, TEXT_COLOR)
         prompt = self.font.render("Appuie sur Entrée pour revenir", True, TEXT_COLOR)
         self.screen.blit(end_txt, end_txt.get_rect(center=(self.width // 2, self.height // 2 - 30)))
         self.screen.blit(best_txt, best_txt.get_rect(center=(self.width // 2, self.height // 2 + 10)))
         self.screen.blit(prompt, prompt.get_rect(center=(self.width // 2, self.height // 2 + 50)))
-        pygame.display.flip()
-        waiting = True
-        while waiting:
-            for e in pygame.event.get():
-                if e.type == pygame.QUIT:
-                    waiting = False
-                elif e.type == pygame.KEYDOWN and e.key == pygame.K_RETURN:
-                    waiting = False
+        wait_key()
@@ -0,0 +1,223 @@
+# -------------------------
+# mini_games/fonts.py
+# -------------------------
+# Polices et textes rendus partagés entre tous les jeux.
+# get_font(taille) retourne toujours la même police pour une taille donnée
+# (au lieu d'un pygame.font.Font par jeu), et son render() passe par un
+# cache LRU des surfaces déjà rendues : les consignes et libellés fixes
+# redessinés à chaque image ne sont rendus qu'une fois.
+# Le cache est borné en mémoire (octets des surfaces), les plus anciennes
+# sont oubliées en premier. Les surfaces retournées sont partagées : ne pas
+# les modifier (fill, set_alpha...), en faire une copie si besoin.
+# Pour les compteurs qui changent à chaque image (temps, score), le cache
+# ne servirait à rien : font.glyphs(couleur, fond).draw(écran, texte, pos)
+# compose le texte depuis une planche de chiffres (GlyphAtlas) rendue une
+# seule fois, sans nouveau rendu ni nouvelle surface.
+# Les rendus réels et les blits de glyphes sont comptés dans metrics.py.
+import re
+from collections import OrderedDict
+
+import pygame
+
+from .metrics import get_counter
+
+TEXT_CACHE_BYTES = 8 * 1024 * 1024
+RENDERS = get_counter("fonts.renders")  # rendus réels (hors cache)
+BLITS = get_counter("fonts.glyph_blits")
+
+
+class TextCache:
+    def __init__(self, max_bytes=TEXT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._surfaces = OrderedDict()  # clé -> (surface, taille en octets)
+
+    def get(self, key, render):
+        entry = self._surfaces.get(key)
+        if entry is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+        self.misses += 1
+        surf = render()
+        size = surf.get_pitch() * surf.get_height()
+        if size > self.max_bytes:
+            return surf  # trop gros pour le cache : rendu à chaque fois
+        self._surfaces[key] = (surf, size)
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            _, (_, old_size) = self._surfaces.popitem(last=False)
+            self.bytes -= old_size
+            self.evictions += 1
+        return surf
+
+    def clear(self):
+        self._surfaces.clear()
+        self.bytes = 0
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        return {
+            "entries": len(self._surfaces),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hit_rate(), 3),
+        }
+
+
+text_cache = TextCache()
+
+DIGITS = "0123456789"
+_DIGIT_RUNS = re.compile(r'([0-9]+)')  # pas \d : les chiffres non ASCII n'ont pas de glyphe
+MAX_LABELS = 256  # libellés gardés par planche (ex. "Temps: ", "s")
+MAX_LAYOUTS = 64  # découpages récents gardés (un compteur change rarement à chaque image)
+
+
+class GlyphAtlas:
+    """Planche des chiffres d'une police dans une couleur (et un fond).
+
+    Un texte comme "Temps: 123s" est découpé en libellés ("Temps: ", "s"),
+    rendus une fois d'un bloc et gardés, et en chiffres copiés depuis la
+    planche : aucun rendu de police pour une nouvelle valeur.
+    Avec un fond uni (background), les blits sont opaques, donc bien plus
+    rapides ; sans fond, les glyphes gardent leur transparence.
+    """
+
+    def __init__(self, font, color, background=None):
+        self.font = font
+        self.color = tuple(color)
+        self.background = tuple(background) if background is not None else None
+        self.labels = {}
+        self.layouts = {}
+        surfaces = [self._render(d) for d in DIGITS]
+        height = max(s.get_height() for s in surfaces)
+        width = sum(s.get_width() for s in surfaces)
+        if self.background is None:
+            sheet = pygame.Surface((width, height), pygame.SRCALPHA)
+        else:
+            sheet = pygame.Surface((width, height))
+            sheet.fill(self.background)
+        self.digits = {}  # chiffre -> Rect dans la planche
+        x = 0
+        for d, surf in zip(DIGITS, surfaces):
+            # MAX sur une planche transparente vide : copie exacte, alpha compris
+            flags = pygame.BLEND_RGBA_MAX if self.background is None else 0
+            sheet.blit(surf, (x, 0), special_flags=flags)
+            self.digits[d] = pygame.Rect(x, 0, surf.get_width(), height)
+            x += surf.get_width()
+        self.sheet = self._convert(sheet)
+        self.height = height
+
+    def _convert(self, surf):
+        # format de l'écran si la fenêtre existe déjà : blits sans conversion
+        if pygame.display.get_surface() is None:
+            return surf
+        return surf.convert() if self.background is not None else surf.convert_alpha()
+
+    def _render(self, text):
+        return self.font.render(text, True, self.color, self.background)
+
+    def _label(self, text):
+        surf = self.labels.get(text)
+        if surf is None:
+            if len(self.labels) >= MAX_LABELS:
+                self.labels.clear()
+            surf = self.labels[text] = self._convert(self._render(text))
+        return surf
+
+    def _layout(self, text):
+        layout = self.layouts.get(text)
+        if layout is None:
+            if len(self.layouts) >= MAX_LAYOUTS:
+                self.layouts.clear()
+            layout = self.layouts[text] = self._split(text)
+        return layout
+
+    def _split(self, text):
+        parts = []  # (surface, x, zone ou None)
+        x = 0
+        for i, part in enumerate(_DIGIT_RUNS.split(text)):
+            if not part:
+                continue
+            if i % 2:  # suite de chiffres
+                for d in part:
+                    area = self.digits[d]
+                    parts.append((self.sheet, x, area))
+                    x += area.width
+            else:
+                surf = self._label(part)
+                parts.append((surf, x, None))
+                x += surf.get_width()
+        return parts, x
+
+    def size(self, text):
+        return self._layout(text)[1], self.height
+
+    def draw(self, dest, text, pos=None, **anchor):
+        """Dessine text sur dest ; pos = coin haut-gauche, ou ancre (center=..., topright=...)."""
+        parts, width = self._layout(text)
+        rect = pygame.Rect(0, 0, width, self.height)
+        if pos is not None:
+            rect.topleft = pos
+        for name, value in anchor.items():
+            setattr(rect, name, value)
+        x, y = rect.topleft
+        dest.blits([(surf, (x + dx, y), area) for surf, dx, area in parts], doreturn=False)
+        BLITS.inc(len(parts))
+        return rect
+
+
+class CachedFont:
+    """Police partagée : render() passe par le cache, le reste est délégué à pygame."""
+
+    def __init__(self, name, size):
+        self.name = name
+        self.size_px = size
+        self.font = pygame.font.Font(name, size)
+        self._atlases = {}
+
+    def glyphs(self, color, background=None):
+        """Planche de glyphes de cette police (compteurs redessinés à chaque image)."""
+        key = (tuple(color), tuple(background) if background is not None else None)
+        atlas = self._atlases.get(key)
+        if atlas is None:
+            atlas = self._atlases[key] = GlyphAtlas(self.font, color, background)
+        return atlas
+
+    def render(self, text, antialias, color, background=None):
+        key = (self.name, self.size_px, text, bool(antialias), tuple(color),
+               tuple(background) if background is not None else None)
+        return text_cache.get(key, lambda: self._render(text, antialias, color, background))
+
+    def _render(self, text, antialias, color, background):
+        RENDERS.inc()  # seulement les textes absents du cache
+        return self.font.render(text, antialias, color, background)
+
+    def __getattr__(self, attr):
+        # size(), get_linesize(), set_bold()... comme une pygame.font.Font
+        return getattr(self.font, attr)
+
+
+_fonts = {}
+
+
+def get_font(size, name=None):
+    """Retourne la police partagée pour (nom, taille) ; None = police par défaut."""
+    font = _fonts.get((name, size))
+    if font is None:
+        font = _fonts[(name, size)] = CachedFont(name, size)
+    return font
+
+
+def stats():
+    """Statistiques du cache de textes (hits, misses, taux de réussite, mémoire)."""
+    return dict(text_cache.stats(), fonts=len(_fonts))
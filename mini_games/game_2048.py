@@ -1,9 +1,17 @@
 import pygame
-import random
-import json
-import os
 import time
 
+from .display import get_display
+from .fonts import get_font
+from .loop import FrameGovernor
+from .modal import pick
+from .present import Presenter
+from .replay import Recorder
+from .scores import get_store
+from .sim import GameState
+
+GAME_INFO = {"name": "2048", "class": "Game2048", "scores": {"2048_*": "max"}, "order": 140}
+
 # mini_games/game_2048.py
 # Version avec choix de taille (3x3 = facile, 4x4 = standard, 5x5 = difficile)
 # Score + meilleur score + meilleure tuile sont sauvegardés dans best_scores.json
@@ -29,92 +37,40 @@ TEXT_COLOR_LIGHT = (249, 246, 242)
 
 FONT_NAME = None  # default font
 
-SCORES_FILE = os.path.join(os.path.dirname(__file__), '..', 'best_scores.json')
-
-
-def load_best():
-    try:
-        with open(SCORES_FILE, 'r') as f:
-            return json.load(f)
-    except Exception:
-        return {}
+SIZE_OPTIONS = {
+    '1': ("1. Facile (3x3)", 3),
+    '2': ("2. Standard (4x4)", 4),
+    '3': ("3. Difficile (5x5)", 5),
+}
 
+def board_layout(width, height, size):
+    """Taille des tuiles et coin haut-gauche d'un plateau size x size."""
+    margin = 40
+    board_size = min(width, height) - 2 * margin
+    tile_size = board_size // size
+    offset_x = (width - (tile_size * size)) // 2
+    offset_y = 120
+    return tile_size, offset_x, offset_y
 
-def save_best(d):
-    try:
-        with open(SCORES_FILE, 'w') as f:
-            json.dump(d, f)
-    except Exception:
-        pass
 
+class Game2048State(GameState):
+    """Règles du 2048 ; action = 'left', 'right', 'up', 'down', 'continue'
+    (jouer après la victoire) ou None (le temps passe).
 
-class Game2048:
-    def __init__(self, screen):
-        self.screen = screen
-        self.width, self.height = screen.get_size()
-        self.best_scores = load_best()
-        self.font = pygame.font.Font(FONT_NAME, 24)
-        self.big_font = pygame.font.Font(FONT_NAME, 48)
-        self.reset()
+    Événement : ('moved', points gagnés) quand le coup a changé la grille.
+    """
 
-    def choose_size(self):
-        choosing = True
-        while choosing:
-            self.screen.fill(BG)
-            title = self.big_font.render("2048 : Choisis la taille", True, TEXT_COLOR_DARK)
-            self.screen.blit(title, title.get_rect(center=(self.width // 2, 80)))
-            opts = [
-                ("1. Facile (3x3)", 3),
-                ("2. Standard (4x4)", 4),
-                ("3. Difficile (5x5)", 5),
-            ]
-            for i, (text, _) in enumerate(opts):
-                txt = self.font.render(text, True, TEXT_COLOR_DARK)
-                self.screen.blit(txt, (self.width // 2 - 120, 160 + i * 50))
-            info = self.font.render("1/2/3 pour choisir, Q pour quitter", True, TEXT_COLOR_DARK)
-            self.screen.blit(info, (self.width // 2 - info.get_width() // 2, self.height - 60))
-            pygame.display.flip()
-            for e in pygame.event.get():
-                if e.type == pygame.QUIT:
-                    return False
-                elif e.type == pygame.KEYDOWN:
-                    if e.key == pygame.K_q:
-                        return False
-                    if e.unicode == '1':
-                        self.size = 3
-                        return True
-                    if e.unicode == '2':
-                        self.size = 4
-                        return True
-                    if e.unicode == '3':
-                        self.size = 5
-                        return True
-        return False
-
-    def reset(self):
-        self.grid = []
-        self.size = 4
+    def __init__(self, size, rng=None):
+        super().__init__(rng)
+        self.size = size
         self.score = 0
-        self.start_time = time.time()
-        self.game_over = False
         self.win = False
         self.prev_board = None
         self.prev_score = 0
-        # chosen later
-        if hasattr(self, 'size'):
-            sz = self.size
-        else:
-            sz = 4
-        self.grid = [[0] * sz for _ in range(sz)]
+        self.grid = [[0] * size for _ in range(size)]
         self.add_random()
         self.add_random()
 
-    def rotate_left(self, mat):
-        return [list(row) for row in zip(*mat[::-1])]
-
-    def rotate_right(self, mat):
-        return [list(row) for row in zip(*mat)][::-1]
-
     def move_row_left(self, row):
         """Compress and merge a single row to the left. Returns new row and points gained."""
         new = [v for v in row if v != 0]
@@ -132,8 +88,11 @@ class Game2048:
         new += [0] * (len(row) - len(new))
         return new, score_gain
 
-    def move(self, direction):
-        if self.game_over:
+    def advance(self, direction, dt):
+        if direction is None:
+            return  # le temps passe, rien ne bouge
+        if direction == 'continue':
+            self.win = False
             return
         moved = False
         gain = 0
@@ -183,15 +142,15 @@ class Game2048:
             self.add_random()
             self.check_win()
             if not self.can_move():
-                self.game_over = True
-            self.update_best()
+                self.over = True
+            self.emit('moved', gain)
 
     def add_random(self):
         empties = [(r, c) for r in range(self.size) for c in range(self.size) if self.grid[r][c] == 0]
         if not empties:
             return
-        r, c = random.choice(empties)
-        self.grid[r][c] = 4 if random.random() < 0.1 else 2
+        r, c = self.rng.choice(empties)
+        self.grid[r][c] = 4 if self.rng.random() < 0.1 else 2
 
     def can_move(self):
         # any zero?
@@ -216,39 +175,88 @@ class Game2048:
             if any(v >= target for v in row):
                 self.win = True
 
+
+class Game2048:
+    def __init__(self, screen):
+        self.screen = screen
+        self.width, self.height = screen.get_size()
+        self.best_scores = get_store()
+        self.font = get_font(24, FONT_NAME)
+        self.big_font = get_font(48, FONT_NAME)
+        self.size = 4
+        self.new_match()
+
+    def draw_size_menu(self):
+        self.screen.fill(BG)
+        title = self.big_font.render("2048 : Choisis la taille", True, TEXT_COLOR_DARK)
+        self.screen.blit(title, title.get_rect(center=(self.width // 2, 80)))
+        for i, (text, _) in enumerate(SIZE_OPTIONS.values()):
+            txt = self.font.render(text, True, TEXT_COLOR_DARK)
+            self.screen.blit(txt, (self.width // 2 - 120, 160 + i * 50))
+        info = self.font.render("1/2/3 pour choisir, Q pour quitter", True, TEXT_COLOR_DARK)
+        self.screen.blit(info, (self.width // 2 - info.get_width() // 2, self.height - 60))
+
+    def choose_size(self):
+        choice = pick(self.draw_size_menu, SIZE_OPTIONS)
+        if choice is None:
+            return False
+        self.size = SIZE_OPTIONS[choice][1]
+        return True
+
+    def new_match(self, replay=None):
+        self.session = replay or Recorder(self, Game2048State, {"size": self.size}, settings={"size": self.size})
+        self.state = self.session.state
+        self.last_tick = time.monotonic()
+
+    def move(self, direction):
+        # le temps passé depuis le coup précédent est donné à l'état avec le coup
+        now = time.monotonic()
+        events = self.session.step(direction, now - self.last_tick)
+        self.last_tick = now
+        if any(name == 'moved' for name, _ in events):
+            self.update_best()
+
     def update_best(self):
         key_score = f"2048_{self.size}_best_score"
         key_tile = f"2048_{self.size}_best_tile"
         prev_score = self.best_scores.get(key_score, 0)
-        if self.score > prev_score:
-            self.best_scores[key_score] = self.score
-        max_tile = max([v for row in self.grid for v in row])
+        if self.state.score > prev_score:
+            self.best_scores[key_score] = self.state.score
+        max_tile = max([v for row in self.state.grid for v in row])
         prev_tile = self.best_scores.get(key_tile, 0)
         if max_tile > prev_tile:
             self.best_scores[key_tile] = max_tile
-        save_best(self.best_scores)
+
+    def end_run(self):
+        # ajoute la partie à l'historique si au moins un coup a été joué
+        if self.state.prev_board is not None:
+            self.move(None)  # avance l'horloge de la partie jusqu'à maintenant
+            self.session.save()
+            self.best_scores.record_run("2048", f"{self.size}x{self.size}", self.state.score, self.state.time)
+            self.state.prev_board = None
 
     def draw(self):
+        state = self.state
         self.screen.fill(BG)
-        margin = 40
-        board_size = min(self.width, self.height) - 2 * margin
-        tile_size = board_size // self.size
-        offset_x = (self.width - (tile_size * self.size)) // 2
-        offset_y = 120
+        # mise en page calculée une fois par taille de plateau et résolution
+        size = self.size
+        tile_size, offset_x, offset_y = get_display().layout(
+            ("Game2048", size), (self.width, self.height), lambda w, h: board_layout(w, h, size))
 
+        present = self.presenter
         # Title and scores
         title = self.big_font.render("2048", True, TEXT_COLOR_DARK)
         self.screen.blit(title, (20, 10))
-        score_txt = self.font.render(f"Score: {self.score}", True, TEXT_COLOR_DARK)
-        self.screen.blit(score_txt, (20, 70))
+        score_rect = self.font.glyphs(TEXT_COLOR_DARK, BG).draw(self.screen, f"Score: {state.score}", (20, 70))
+        present.sprite('score', score_rect, state.score)
         best_key = f"2048_{self.size}_best_score"
         best_score = self.best_scores.get(best_key, 0)
         best_txt = self.font.render(f"Meilleur score: {best_score}", True, TEXT_COLOR_DARK)
-        self.screen.blit(best_txt, (220, 70))
+        present.sprite('best_score', self.screen.blit(best_txt, (220, 70)), best_score)
         best_tile_key = f"2048_{self.size}_best_tile"
         best_tile = self.best_scores.get(best_tile_key, 0)
         best_tile_txt = self.font.render(f"Meilleure tuile: {best_tile}", True, TEXT_COLOR_DARK)
-        self.screen.blit(best_tile_txt, (20, 100))
+        present.sprite('best_tile', self.screen.blit(best_tile_txt, (20, 100)), best_tile)
 
         # Instructions
         inst = self.font.render("Flèches: déplacer | R: recommencer | Q: quitter", True, TEXT_COLOR_DARK)
@@ -258,9 +266,9 @@ class Game2048:
         for r in range(self.size):
             for c in range(self.size):
                 rect = pygame.Rect(offset_x + c * tile_size, offset_y + r * tile_size, tile_size - 5, tile_size - 5)
-                value = self.grid[r][c]
+                value = state.grid[r][c]
                 color = TILE_COLORS.get(value, (60, 58, 50)) if value != 0 else EMPTY_COLOR
-                pygame.draw.rect(self.screen, color, rect, border_radius=8)
+                present.sprite((r, c), pygame.draw.rect(self.screen, color, rect, border_radius=8), value)
                 if value != 0:
                     text_color = TEXT_COLOR_DARK if value <= 4 else TEXT_COLOR_LIGHT
                     txt = self.big_font.render(str(value), True, text_color)
@@ -274,35 +282,42 @@ class Game2048:
                         self.screen.blit(txt, txt_rect)
 
         # Game over / win overlay
-        if self.game_over or self.win:
+        if state.over or state.win:
             overlay = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
             overlay.fill((255, 255, 255, 180))
             self.screen.blit(overlay, (0, 0))
-            msg = "Tu as gagné !" if self.win else "Game Over"
-            sub = "Continue ou R pour recommencer" if self.win else "R pour recommencer"
+            msg = "Tu as gagné !" if state.win else "Game Over"
+            sub = "Continue ou R pour recommencer" if state.win else "R pour recommencer"
+            present.sprite('overlay', self.screen.get_rect(), msg)
             msg_txt = self.big_font.render(msg, True, (100, 100, 100))
             sub_txt = self.font.render(sub, True, (80, 80, 80))
             self.screen.blit(msg_txt, msg_txt.get_rect(center=(self.width // 2, self.height // 2 - 20)))
             self.screen.blit(sub_txt, sub_txt.get_rect(center=(self.width // 2, self.height // 2 + 30)))
 
-        pygame.display.flip()
+        present.present()
 
     def run(self):
         if not self.choose_size():
             return
-        self.reset()
-        clock = pygame.time.Clock()
+        self.new_match()
+        governor = FrameGovernor()  # pas de chrono : on ne redessine qu'après une touche
+        self.presenter = Presenter(self.screen, "Game2048")
         while True:
-            self.draw()
-            for e in pygame.event.get():
+            if governor.frame():
+                self.draw()
+            for e in governor.events():
+                self.presenter.notice(e)
                 if e.type == pygame.QUIT:
+                    self.end_run()
                     return
                 elif e.type == pygame.KEYDOWN:
                     if e.key == pygame.K_q:
+                        self.end_run()
                         return
                     if e.key == pygame.K_r:
-                        self.reset()
-                    if not (self.game_over or self.win):
+                        self.end_run()
+                        self.new_match()
+                    if not (self.state.over or self.state.win):
                         if e.key == pygame.K_LEFT:
                             self.move('left')
                         elif e.key == pygame.K_RIGHT:
@@ -313,6 +328,5 @@ class Game2048:
                             self.move('down')
                     else:
                         # si gagné, tu peux continuer (pas de blocage) ou reset
-                        if self.win and e.key == pygame.K_RETURN:
-                            self.win = False  # continuer la partie
-            clock.tick(60)
+                        if self.state.win and e.key == pygame.K_RETURN:
+                            self.move('continue')  # continuer la partie
@@ -3,14 +3,19 @@
 # -------------------------
 import pygame
 import random
-import json
-import os
+import time
+
+from .fonts import get_font
+from .modal import pick, wait_key
+from .present import Presenter
+from .scores import get_store
+
+GAME_INFO = {"name": "Devinez le nombre", "class": "GuessNumberGame", "scores": {"Guess_*": "min"}, "order": 50}
 
 BG = (0, 0, 0)
 TEXT = (255, 255, 255)
 FEEDBACK = (255, 200, 50)
 FONT_SIZE = 32
-SCORES_FILE = os.path.join(os.path.dirname(__file__), '..', 'best_scores.json')
 DIFFICULTIES = {
     '1': ('Facile', 50),
     '2': ('Moyen', 100),
@@ -20,68 +25,58 @@ DIFFICULTIES = {
 class GuessNumberGame:
     def __init__(self, screen):
         self.screen = screen
-        self.font = pygame.font.Font(None, FONT_SIZE)
+        self.font = get_font(FONT_SIZE)
         self.difficulty = None
         self.max_num = 100
         self.target = None
         self.input_text = ""
         self.feedback = ""
         self.attempts = 0
-        self.best_scores = self.load_scores()
+        self.best_scores = get_store()
 
-    def load_scores(self):
-        try:
-            with open(SCORES_FILE, 'r') as f:
-                return json.load(f)
-        except Exception:
-            return {}
-
-    def save_scores(self):
-        with open(SCORES_FILE, 'w') as f:
-            json.dump(self.best_scores, f)
+    def draw_difficulty_menu(self):
+        self.screen.fill(BG)
+        title = self.font.render("Choisissez difficulté", True, TEXT)
+        self.screen.blit(title, title.get_rect(center=(320, 100)))
+        for key, (name, _) in DIFFICULTIES.items():
+            txt = self.font.render(f"{key}. {name}", True, TEXT)
+            self.screen.blit(txt, (200, 180 + int(key)*60))
 
     def choose_difficulty(self):
-        choosing = True
-        while choosing:
-            self.screen.fill(BG)
-            title = self.font.render("Choisissez difficulté", True, TEXT)
-            self.screen.blit(title, title.get_rect(center=(320, 100)))
-            for key, (name, _) in DIFFICULTIES.items():
-                txt = self.font.render(f"{key}. {name}", True, TEXT)
-                self.screen.blit(txt, (200, 180 + int(key)*60))
-            pygame.display.flip()
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    return False
-                elif event.type == pygame.KEYDOWN and event.unicode in DIFFICULTIES:
-                    self.difficulty, self.max_num = DIFFICULTIES[event.unicode]
-                    return True
-        return False
+        choice = pick(self.draw_difficulty_menu, DIFFICULTIES, quit_keys=())
+        if choice is None:
+            return False
+        self.difficulty, self.max_num = DIFFICULTIES[choice]
+        return True
 
     def run(self):
         if not self.choose_difficulty():
             return
         self.target = random.randint(1, self.max_num)
         self.attempts = 0
+        self.input_text = ""
+        self.feedback = ""
         running = True
         start = time.time()
         clock = pygame.time.Clock()
+        present = Presenter(self.screen, "GuessNumberGame")
         while running:
             self.screen.fill(BG)
             prompt = self.font.render(f"Devinez (1-{self.max_num}):", True, TEXT)
             self.screen.blit(prompt, (50, 80))
             user_txt = self.font.render(self.input_text, True, TEXT)
-            self.screen.blit(user_txt, (50, 140))
+            present.sprite('input', self.screen.blit(user_txt, (50, 140)), self.input_text)
             fb_txt = self.font.render(self.feedback, True, FEEDBACK)
-            self.screen.blit(fb_txt, (50, 200))
+            present.sprite('feedback', self.screen.blit(fb_txt, (50, 200)), self.feedback)
             # affiche meilleur score
             key = f"Guess_{self.difficulty}"
             best = self.best_scores.get(key)
             if best:
                 best_txt = self.font.render(f"Meilleur: {best} coups", True, TEXT)
-                self.screen.blit(best_txt, (50, 260))
-            pygame.display.flip()
+                present.sprite('best', self.screen.blit(best_txt, (50, 260)), best)
+            present.present()
             for event in pygame.event.get():
+                present.notice(event)
                 if event.type == pygame.QUIT:
                     running = False
                 elif event.type == pygame.KEYDOWN:
@@ -99,9 +94,8 @@ class GuessNumberGame:
                                 prev = self.best_scores.get(key)
                                 if prev is None or self.attempts < prev:
                                     self.best_scores[key] = self.attempts
-                                    self.save_scores()
-                                pygame.display.flip()
-                                pygame.time.wait(1000)
+                                self.best_scores.record_run("Guess", self.difficulty, self.attempts, duration)
+                                wait_key(timeout=1)
                                 running = False
                         except ValueError:
                             self.feedback = "Entrée invalide"
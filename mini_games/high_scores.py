@@ -1,48 +1,207 @@
 # -------------------------
 # mini_games/high_scores.py
 # -------------------------
+# Deux vues, Tab pour passer de l'une à l'autre :
+#   meilleurs scores : best_scores.json, en mémoire (relu s'il a changé)
+#   classement       : les LEADERBOARD_SIZE meilleures parties de chaque
+#                      jeu / difficulté, tirées de l'historique (store.top),
+#                      calculé dans un thread (runtime.background) car il
+#                      relit tout le journal.
+import time
+
 import pygame
-import json
-import os
+
+from .fonts import get_font
+from .registry import GAMES, score_rule
+from .runtime import TASK_DONE, background
+from .scores import get_store
+
+GAME_INFO = {"name": "Meilleurs scores", "class": "HighScores", "scores": {}, "order": 1000}
 
 # Couleurs et paramètres
 BG = (40, 20, 60)
 TEXT_COLOR = (240, 240, 240)
+GROUP_COLOR = (100, 200, 255)
+SCROLLBAR_COLOR = (90, 70, 120)
 FONT_SIZE = 28
-SCORES_FILE = os.path.join(os.path.dirname(__file__), '..', 'best_scores.json')
+ROW_HEIGHT = FONT_SIZE + 6
+LIST_TOP = 100
+LIST_BOTTOM = 430
+REFRESH_MS = 1000  # relit best_scores.json s'il a changé (record écrit par une autre instance)
+LEADERBOARD_SIZE = 5  # parties montrées par jeu / difficulté
+TITLES = {'bests': "Meilleurs Scores", 'runs': "Classement des parties"}
+
+
+def group_scores(scores):
+    """Regroupe les clés par jeu (celui qui les déclare dans GAME_INFO["scores"],
+    sinon préfixe avant le premier '_') et retourne la liste à plat des
+    lignes : ('group', nom) puis ('entry', texte), jeux dans l'ordre du menu."""
+    groups = {}
+    for key, val in scores.items():
+        prefix, _, rest = key.partition('_')
+        rule = score_rule(key)
+        groups.setdefault(rule[0] if rule else prefix, []).append((rest or key, val))
+    menu_order = {label: i for i, (label, _, _) in enumerate(GAMES)}
+    rows = []
+    for game in sorted(groups, key=lambda g: (menu_order.get(g, len(menu_order)), g.lower())):
+        rows.append(('group', game))
+        for label, val in sorted(groups[game]):
+            rows.append(('entry', f"{label.replace('_', ' ')}: {val}"))
+    return rows
+
+
+def leaderboard_rows(store, limit=LEADERBOARD_SIZE):
+    """Lignes du classement : meilleures parties de chaque jeu / difficulté (lit tout l'historique)."""
+    rows = []
+    for key, entry in sorted(store.history_bests().items(), key=lambda item: item[0].lower()):
+        rows.append(('group', f"{key.replace('_', ' ')} ({entry['runs']} parties)"))
+        for rank, run in enumerate(store.top(entry["game"], entry["difficulty"], limit=limit), 1):
+            day = time.strftime('%d/%m/%Y', time.localtime(run.get("ts", 0)))
+            rows.append(('entry', f"{rank}. {run['score']:g}  ({day})"))
+    return rows
+
 
 class HighScores:
     def __init__(self, screen):
         self.screen = screen
-        self.font = pygame.font.Font(None, FONT_SIZE)
-        # Charge les scores
+        self.width, self.height = screen.get_size()
+        self.font = get_font(FONT_SIZE)
+        self.store = get_store()
+        self.scores = None
+        self.rows = []
+        self.row_cache = {}  # index de ligne -> surface rendue
+        self.scroll = 0  # en lignes
+        self.visible_rows = (LIST_BOTTOM - LIST_TOP) // ROW_HEIGHT
+        self.view = 'bests'
+        self.task = None  # classement en cours de calcul
+        self.titles = {view: self.font.render(text, True, TEXT_COLOR) for view, text in TITLES.items()}
+        self.info = self.font.render("↑↓: défiler | Tab: classement | E: revenir", True, TEXT_COLOR)
+        self.refresh()
+
+    def set_rows(self, rows):
+        self.rows = rows
+        self.row_cache = {}
+        self.scroll = min(self.scroll, self.max_scroll())
+
+    def refresh(self):
+        # Relecture disque seulement si le fichier a changé (store.reload) ;
+        # le cache de rendu n'est vidé que si les données ont changé
+        self.store.reload()
+        scores = self.store.snapshot()
+        if scores == self.scores:
+            return False
+        self.scores = scores
+        if self.view == 'bests':
+            self.set_rows(group_scores(scores))
+        return True
+
+    def switch_view(self):
+        self.scroll = 0
+        if self.view == 'bests':
+            self.view = 'runs'
+            self.set_rows([('entry', "Chargement...")])
+            self.task = background(leaderboard_rows, self.store)
+        else:
+            self.view = 'bests'
+            self.task = None
+            self.set_rows(group_scores(self.scores))
+
+    def task_done(self):
+        """Range le classement calculé s'il est prêt ; True s'il faut redessiner."""
+        if self.task is None or not self.task.done():
+            return False
         try:
-            with open(SCORES_FILE, 'r') as f:
-                self.scores = json.load(f)
+            rows = self.task.result()
         except Exception:
-            self.scores = {}
+            rows = [('entry', "Historique illisible")]
+        self.task = None
+        self.set_rows(rows)
+        return True
+
+    def max_scroll(self):
+        return max(0, len(self.rows) - self.visible_rows)
+
+    def render_row(self, idx):
+        surf = self.row_cache.get(idx)
+        if surf is None:
+            kind, text = self.rows[idx]
+            color = GROUP_COLOR if kind == 'group' else TEXT_COLOR
+            surf = self.font.render(text, True, color)
+            self.row_cache[idx] = surf
+        return surf
+
+    def draw(self):
+        self.screen.fill(BG)
+        title = self.titles[self.view]
+        self.screen.blit(title, title.get_rect(center=(self.width // 2, 60)))
+        if not self.rows:
+            empty = self.font.render("Aucun score enregistré" if self.view == 'bests' else "Aucune partie enregistrée",
+                                     True, TEXT_COLOR)
+            self.screen.blit(empty, (50, LIST_TOP))
+        # seules les lignes dans la fenêtre visible sont rendues et affichées
+        last = min(len(self.rows), self.scroll + self.visible_rows)
+        for y_idx, idx in enumerate(range(self.scroll, last)):
+            x = 40 if self.rows[idx][0] == 'group' else 70
+            self.screen.blit(self.render_row(idx), (x, LIST_TOP + y_idx * ROW_HEIGHT))
+        # barre de défilement
+        if len(self.rows) > self.visible_rows:
+            track = LIST_BOTTOM - LIST_TOP
+            bar_h = max(20, track * self.visible_rows // len(self.rows))
+            bar_y = LIST_TOP + (track - bar_h) * self.scroll // self.max_scroll()
+            pygame.draw.rect(self.screen, SCROLLBAR_COLOR, pygame.Rect(self.width - 20, bar_y, 8, bar_h))
+        self.screen.blit(self.info, self.info.get_rect(center=(self.width // 2, 455)))
+        pygame.display.flip()
+
+    def scroll_to(self, value):
+        value = max(0, min(value, self.max_scroll()))
+        changed = value != self.scroll
+        self.scroll = value
+        return changed
+
+    def handle_key(self, key):
+        page = max(1, self.visible_rows - 1)
+        if key in (pygame.K_DOWN, pygame.K_s):
+            return self.scroll_to(self.scroll + 1)
+        if key in (pygame.K_UP, pygame.K_w):
+            return self.scroll_to(self.scroll - 1)
+        if key == pygame.K_PAGEDOWN:
+            return self.scroll_to(self.scroll + page)
+        if key == pygame.K_PAGEUP:
+            return self.scroll_to(self.scroll - page)
+        if key == pygame.K_HOME:
+            return self.scroll_to(0)
+        if key == pygame.K_END:
+            return self.scroll_to(self.max_scroll())
+        return False
 
     def run(self):
+        if self.view != 'bests':
+            self.switch_view()  # on revient toujours sur les meilleurs scores
+        self.refresh()
+        self.draw()
         running = True
         while running:
-            self.screen.fill(BG)
-            title = self.font.render("Meilleurs Scores", True, TEXT_COLOR)
-            self.screen.blit(title, title.get_rect(center=(320, 60)))
-            # Affiche chaque entrée
-            y = 120
-            for key, val in self.scores.items():
-                line = f"{key}: {val}"
-                txt = self.font.render(line, True, TEXT_COLOR)
-                self.screen.blit(txt, (50, y))
-                y += FONT_SIZE + 10
-                if y > 420:
-                    break
-            info = self.font.render("Press E pour revenir", True, TEXT_COLOR)
-            self.screen.blit(info, (200, 450))
-            pygame.display.flip()
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                elif event.type == pygame.KEYDOWN and event.key in (pygame.K_e, pygame.K_RETURN):
+            # bloque jusqu'à une entrée (ou le délai de rafraîchissement)
+            event = pygame.event.wait(REFRESH_MS)
+            redraw = False
+            if event.type == pygame.NOEVENT:
+                redraw = self.refresh()
+            elif event.type == pygame.QUIT:
+                running = False
+            elif event.type == TASK_DONE:
+                redraw = self.task_done()
+            elif event.type == pygame.KEYDOWN:
+                if event.key in (pygame.K_e, pygame.K_RETURN, pygame.K_ESCAPE):
                     running = False
+                elif event.key == pygame.K_TAB:
+                    self.switch_view()
+                    redraw = True
+                else:
+                    redraw = self.handle_key(event.key)
+            elif event.type == pygame.MOUSEWHEEL:
+                redraw = self.scroll_to(self.scroll - event.y * 3)
+            elif event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+                redraw = True
+            if redraw and running:
+                self.draw()
         # Retour au menu
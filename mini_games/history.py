@@ -0,0 +1,173 @@
+# -------------------------
+# mini_games/history.py
+# -------------------------
+# Historique de toutes les parties terminées.
+# Chaque partie est ajoutée en fin de score_history.jsonl (une ligne JSON),
+# donc une écriture coûte O(1) au lieu de réécrire tout un fichier.
+# Le compactage replie périodiquement le journal dans un instantané
+# (meilleurs résultats par jeu/difficulté + position déjà lue dans le
+# journal) : au démarrage on ne relit que la fin du journal.
+# Les fichiers des joueurs (scores, historique) sont à côté du paquet, ou
+# dans le dossier MINI_JEUX_DATA s'il est donné (benchmarks : dossier
+# temporaire, pour ne jamais toucher aux vrais scores).
+import json
+import os
+import tempfile
+import time
+
+DATA_DIR = os.environ.get('MINI_JEUX_DATA') or os.path.join(os.path.dirname(__file__), '..')
+HISTORY_FILE = os.path.join(DATA_DIR, 'score_history.jsonl')
+COMPACT_BYTES = 256 * 1024  # taille de fin de journal au-delà de laquelle on compacte
+FILE_MODE = 0o644  # fichiers partagés (borne : plusieurs comptes peuvent les lire)
+
+
+def keep_mode(fd, path):
+    """Donne au fichier temporaire fd les droits de path (FILE_MODE s'il n'existe pas).
+
+    mkstemp crée en 0600 : sans cela, le fichier remplacé par os.replace ne
+    serait plus lisible par les autres comptes.
+    """
+    try:
+        mode = os.stat(path).st_mode & 0o777
+    except OSError:
+        mode = FILE_MODE
+    os.fchmod(fd, mode)
+
+
+def make_record(game, difficulty, score, duration=None, timestamp=None):
+    return {
+        "game": game,
+        "difficulty": difficulty,
+        "score": score,
+        "duration": None if duration is None else round(duration, 3),
+        "ts": round(timestamp if timestamp is not None else time.time(), 3),
+    }
+
+
+def history_key(game, difficulty):
+    return f"{game}_{difficulty}" if difficulty else game
+
+
+class ScoreJournal:
+    def __init__(self, path=HISTORY_FILE):
+        self.path = os.path.abspath(path)
+        self.snapshot_path = os.path.splitext(self.path)[0] + '.snapshot.json'
+        self._snapshot = None  # chargé à la demande
+
+    # --- écriture ---
+    def append(self, records):
+        """Ajoute des enregistrements en fin de journal (une seule écriture)."""
+        if not records:
+            return
+        data = ''.join(json.dumps(r, ensure_ascii=False) + '\n' for r in records)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(data)
+
+    # --- lecture ---
+    def _load_snapshot(self):
+        if self._snapshot is None:
+            try:
+                with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                    self._snapshot = json.load(f)
+            except Exception:
+                self._snapshot = {"offset": 0, "runs": 0, "bests": {}}
+        return self._snapshot
+
+    def _read_tail(self, offset):
+        """Retourne (enregistrements après offset, nouvel offset).
+        Une dernière ligne incomplète (écriture interrompue) est laissée de côté."""
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(offset)
+                raw = f.read()
+        except OSError:
+            return [], offset
+        end = raw.rfind(b'\n') + 1
+        records = []
+        for line in raw[:end].splitlines():
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue  # ligne corrompue, ignorée
+        return records, offset + end
+
+    def tail_size(self):
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return 0
+        return max(0, size - self._load_snapshot()["offset"])
+
+    @staticmethod
+    def _fold(bests, records):
+        for r in records:
+            score = r.get("score")
+            if not isinstance(score, (int, float)):
+                continue
+            key = history_key(r.get("game"), r.get("difficulty"))
+            entry = bests.get(key)
+            if entry is None:
+                bests[key] = {
+                    "game": r.get("game"),
+                    "difficulty": r.get("difficulty"),
+                    "runs": 1,
+                    "max": score,
+                    "min": score,
+                    "last": r.get("ts"),
+                }
+            else:
+                entry["runs"] += 1
+                entry["max"] = max(entry["max"], score)
+                entry["min"] = min(entry["min"], score)
+                entry["last"] = r.get("ts")
+        return bests
+
+    def bests(self):
+        """Résumé par clé jeu_difficulté : nombre de parties, max, min, dernière date."""
+        snap = self._load_snapshot()
+        records, _ = self._read_tail(snap["offset"])
+        bests = {k: dict(v) for k, v in snap["bests"].items()}
+        return self._fold(bests, records)
+
+    def runs(self, game=None, difficulty=None):
+        """Parcourt tout l'historique (à réserver aux écrans de consultation)."""
+        records, _ = self._read_tail(0)
+        for r in records:
+            if game is not None and r.get("game") != game:
+                continue
+            if difficulty is not None and r.get("difficulty") != difficulty:
+                continue
+            yield r
+
+    # --- compactage ---
+    def compact(self):
+        # relit l'instantané : une autre instance a pu compacter entre-temps
+        self._snapshot = None
+        snap = self._load_snapshot()
+        records, offset = self._read_tail(snap["offset"])
+        if offset == snap["offset"]:
+            return
+        bests = {k: dict(v) for k, v in snap["bests"].items()}
+        snap = {
+            "offset": offset,
+            "runs": snap["runs"] + len(records),
+            "bests": self._fold(bests, records),
+        }
+        directory = os.path.dirname(self.snapshot_path)
+        fd, tmp = tempfile.mkstemp(prefix='.score_history.', suffix='.tmp', dir=directory)
+        try:
+            keep_mode(fd, self.snapshot_path)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(snap, f, ensure_ascii=False)
+            os.replace(tmp, self.snapshot_path)
+        except Exception:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+        self._snapshot = snap
+
+    def maybe_compact(self):
+        if self.tail_size() >= COMPACT_BYTES:
+            self.compact()
@@ -0,0 +1,116 @@
+# -------------------------
+# mini_games/layers.py
+# -------------------------
+# Composition de l'image par couches.
+# Un jeu déclare ses couches de bas en haut : fond, plateau fixe, éléments
+# mobiles, HUD... Chaque couche est une fonction paint(surface).
+# Les couches fixes (static=True) sont dessinées une seule fois dans une
+# surface convertie au format de l'écran, puis simplement copiées à chaque
+# image ; elles ne sont redessinées qu'après invalidate(nom[, rect]),
+# et seulement dans rect si on le précise (brique cassée...).
+# Les couches fixes consécutives sont fusionnées : le fond et le plateau
+# sous les éléments mobiles ne coûtent qu'un blit opaque par image.
+# Les couches dynamiques (static=False) sont dessinées directement à
+# l'écran à chaque image, comme avant.
+import pygame
+
+
+class _Cache:
+    """Couches fixes consécutives, rendues ensemble dans une surface."""
+
+    def __init__(self, layers, size, opaque):
+        self.layers = layers  # [(nom, paint)]
+        self.size = size
+        self.opaque = opaque  # tout en bas : pas de transparence
+        self.surface = None
+        self.dirty = []  # zones à redessiner (vide : rien à faire)
+        self.rebuilds = 0
+
+    def invalidate(self, rect=None):
+        if rect is None or self.surface is None:
+            self.surface = None
+            self.dirty = []
+        else:
+            self.dirty.append(pygame.Rect(rect))
+
+    def _new_surface(self):
+        if self.opaque:
+            surf = pygame.Surface(self.size)
+            return surf.convert() if pygame.display.get_surface() else surf
+        surf = pygame.Surface(self.size, pygame.SRCALPHA)
+        return surf.convert_alpha() if pygame.display.get_surface() else surf
+
+    def _paint(self, clip):
+        surf = self.surface
+        surf.set_clip(clip)
+        if not self.opaque:
+            surf.fill((0, 0, 0, 0), clip)
+        for _, paint in self.layers:
+            paint(surf)
+        surf.set_clip(None)
+
+    def update(self):
+        """Redessine ce qui a été invalidé ; retourne les zones modifiées."""
+        if self.surface is None:
+            self.surface = self._new_surface()
+            self._paint(None)
+            self.rebuilds += 1
+            return [self.surface.get_rect()]
+        changed, self.dirty = self.dirty, []
+        for rect in changed:
+            self._paint(rect)
+        return changed
+
+
+class Compositor:
+    """Pile de couches d'un jeu ; compose() dessine l'image entière."""
+
+    def __init__(self, screen):
+        self.screen = screen
+        self.layers = []  # [(nom, paint, static)]
+        self.groups = None  # _Cache (couches fixes) ou (nom, paint) dynamiques
+
+    def add(self, name, paint, static=True):
+        self.layers.append((name, paint, static))
+        self.groups = None
+
+    def _build(self):
+        self.groups = []
+        size = self.screen.get_size()
+        run = []
+        for name, paint, static in self.layers:
+            if static:
+                run.append((name, paint))
+                continue
+            if run:
+                self.groups.append(_Cache(run, size, opaque=not self.groups))
+                run = []
+            self.groups.append((name, paint))
+        if run:
+            self.groups.append(_Cache(run, size, opaque=not self.groups))
+
+    def invalidate(self, name=None, rect=None):
+        """Fait redessiner la couche fixe name (toutes si None), dans rect ou en entier."""
+        if self.groups is None:
+            return  # rien n'est encore rendu
+        for group in self.groups:
+            if isinstance(group, _Cache) and (name is None or any(n == name for n, _ in group.layers)):
+                group.invalidate(rect)
+
+    def compose(self, presenter=None):
+        """Dessine toutes les couches ; les zones de couches fixes redessinées sont signalées à presenter."""
+        if self.groups is None:
+            self._build()
+        for group in self.groups:
+            if isinstance(group, _Cache):
+                changed = group.update()
+                if presenter is not None:
+                    for rect in changed:
+                        presenter.mark(rect)
+                self.screen.blit(group.surface, (0, 0))
+            else:
+                group[1](self.screen)
+
+    def rebuilds(self):
+        """Nombre de rendus complets de couches fixes (pour mesurer)."""
+        return sum(g.rebuilds for g in self.groups or () if isinstance(g, _Cache))
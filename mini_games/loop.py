@@ -0,0 +1,169 @@
+# -------------------------
+# mini_games/loop.py
+# -------------------------
+# Boucle de jeu commune à pas fixe.
+# La simulation avance toujours par pas de 1/TICK_RATE seconde (update),
+# quel que soit le nombre d'images affichées : la vitesse du jeu ne dépend
+# plus de la machine. L'affichage (render) se fait au plus RENDER_FPS fois
+# par seconde avec alpha in [0, 1] = fraction du pas suivant déjà écoulée,
+# pour interpoler les objets en mouvement. Une seule présentation par image :
+# render signale ses éléments variables à self.presenter (present.py).
+# Sur une borne peu puissante : MINI_JEUX_FPS=30 python main.py
+#
+# Les jeux au tour par tour (Sudoku, 2048, Taquin...) utilisent plutôt
+# FrameGovernor : rien n'est redessiné tant que rien ne change, le processus
+# dort dans event.wait() jusqu'à la prochaine entrée ou la prochaine
+# échéance visible (le chrono qui passe à la seconde suivante).
+import math
+import os
+import time
+
+import pygame
+
+from .overlay import get_overlay
+from .present import Presenter
+
+TICK_RATE = 60  # pas de simulation par seconde
+RENDER_FPS = int(os.environ.get('MINI_JEUX_FPS', 60))
+MAX_FRAME_TIME = 0.25  # au-delà (fenêtre déplacée, machine figée) on ne rattrape pas
+# Événements qui ne changent pas l'image d'un jeu au tour par tour
+PASSIVE_EVENTS = (pygame.MOUSEMOTION, pygame.ACTIVEEVENT, pygame.WINDOWENTER, pygame.WINDOWLEAVE)
+
+
+def lerp(a, b, alpha):
+    return a + (b - a) * alpha
+
+
+class GameLoop:
+    """Base des jeux en temps réel : redéfinir handle_event, update et render."""
+
+    tick_rate = TICK_RATE
+    render_fps = RENDER_FPS
+
+    def handle_event(self, event):
+        if event.type == pygame.QUIT:
+            self.stop()
+
+    def update(self, dt):
+        """Avance la simulation d'un pas de dt secondes."""
+
+    def render(self, alpha):
+        """Dessine l'image (sans flip) entre l'état précédent et l'actuel.
+
+        Les éléments qui bougent ou changent sont signalés avec
+        self.presenter.sprite(clé, rect, apparence).
+        """
+
+    def stop(self):
+        self.running = False
+
+    def run_loop(self):
+        """Fait tourner la boucle jusqu'à stop() ; self.time = temps simulé (s)."""
+        dt = 1.0 / self.tick_rate
+        clock = pygame.time.Clock()
+        self.presenter = Presenter(self.screen, type(self).__name__)
+        overlay = get_overlay()  # panneau F3 : phases de chaque image
+        self.running = True
+        self.time = 0.0
+        accumulator = 0.0
+        previous = time.perf_counter()
+        while self.running:
+            now = time.perf_counter()
+            accumulator += min(now - previous, MAX_FRAME_TIME)
+            previous = now
+            overlay.begin('update')
+            for event in pygame.event.get():
+                self.presenter.notice(event)
+                self.handle_event(event)
+            while accumulator >= dt and self.running:
+                self.update(dt)
+                self.time += dt
+                accumulator -= dt
+            if not self.running:
+                break
+            overlay.begin('draw')
+            self.render(accumulator / dt)
+            self.presenter.present()
+            clock.tick(self.render_fps)
+
+
+class FrameGovernor:
+    """Cadence d'affichage des jeux au tour par tour.
+
+    while running:
+        if governor.frame():      # vrai seulement si quelque chose a changé
+            self.draw()
+        for event in governor.events():  # dort tant qu'il n'y a rien à faire
+            ...
+    """
+
+    def __init__(self, max_fps=RENDER_FPS):
+        self.max_fps = max_fps
+        self.clock = pygame.time.Clock()
+        self.overlay = get_overlay()
+        self.dirty = True
+        self.timer_origin = None  # chrono affiché en secondes depuis cet instant
+        self.shown_second = None
+        self.deadline = None  # réveil ponctuel (time.time())
+        self.frames = 0
+
+    def invalidate(self):
+        """À appeler quand l'état change hors entrée (coup de l'IA...)."""
+        self.dirty = True
+
+    def tick_every_second(self, origin):
+        """Redessine à chaque seconde entière écoulée depuis origin (None : arrête)."""
+        self.timer_origin = origin
+        self.shown_second = None
+        self.dirty = True
+
+    def wake_at(self, when):
+        if self.deadline is None or when < self.deadline:
+            self.deadline = when
+
+    def _next_wake(self):
+        wakes = []
+        if self.timer_origin is not None:
+            wakes.append(self.timer_origin + math.floor(time.time() - self.timer_origin) + 1)
+        if self.deadline is not None:
+            wakes.append(self.deadline)
+        return min(wakes) if wakes else None
+
+    def _check_schedule(self):
+        now = time.time()
+        if self.timer_origin is not None and int(now - self.timer_origin) != self.shown_second:
+            self.dirty = True
+        if self.deadline is not None and now >= self.deadline:
+            self.deadline = None
+            self.dirty = True
+
+    def events(self):
+        """Événements à traiter ; bloque dans event.wait() si rien n'est à redessiner."""
+        self.overlay.begin(None)  # l'attente ne compte pas dans l'image
+        events = pygame.event.get()
+        self._check_schedule()
+        if not events and not self.dirty:
+            wake = self._next_wake()
+            if wake is None:
+                event = pygame.event.wait()
+            else:
+                event = pygame.event.wait(max(1, math.ceil((wake - time.time()) * 1000)))
+            if event.type != pygame.NOEVENT:
+                events = [event] + pygame.event.get()
+            self._check_schedule()
+        if any(e.type not in PASSIVE_EVENTS for e in events):
+            self.dirty = True
+        self.overlay.begin('update')  # le jeu traite les événements
+        return events
+
+    def frame(self):
+        """Vrai s'il faut redessiner maintenant (au plus max_fps fois par seconde)."""
+        if not self.dirty:
+            return False
+        self.dirty = False
+        if self.timer_origin is not None:
+            self.shown_second = int(time.time() - self.timer_origin)
+        self.frames += 1
+        self.clock.tick(self.max_fps)
+        self.overlay.begin('draw')
+        return True
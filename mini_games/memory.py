@@ -4,8 +4,15 @@
 import pygame
 import random
 import time
-import json
-import os
+
+from .assets import get_atlas
+from .fonts import get_font
+from .loop import FrameGovernor
+from .modal import wait_key
+from .present import Presenter
+from .scores import get_store
+
+GAME_INFO = {"name": "Jeu de mémoire", "class": "MemoryGame", "scores": {"Memory": "min"}, "order": 60}
 
 ROWS = 3
 COLS = 4
@@ -15,12 +22,16 @@ BG = (20, 60, 20)
 CARD_BACK = (50, 100, 150)
 CARD_BORDER = (240, 240, 240)
 FONT_SIZE = 32
-SCORES_FILE = os.path.join(os.path.dirname(__file__), '..', 'best_scores.json')
 
 class MemoryGame:
     def __init__(self, screen):
         self.screen = screen
-        self.font = pygame.font.Font(None, FONT_SIZE)
+        self.font = get_font(FONT_SIZE)
+        self.deal()
+        self.sprites = get_atlas("MemoryGame", self.define_sprites)
+
+    def deal(self):
+        # à chaque partie : l'instance est réutilisée d'une partie à l'autre (scenes.py)
         values = list(range(1, ROWS*COLS//2 + 1)) * 2
         random.shuffle(values)
         self.cards = []
@@ -36,34 +47,38 @@ class MemoryGame:
         self.first = None
         self.locked = False
 
-    def load_scores(self):
-        try:
-            with open(SCORES_FILE, 'r') as f:
-                return json.load(f)
-        except Exception:
-            return {}
+    def define_sprites(self, atlas):
+        # dos de carte, et une face (cadre + numéro) par valeur
+        atlas.rect('back', CARD_BACK, CARD_SIZE)
+        for value in range(1, ROWS*COLS//2 + 1):
+            atlas.add(value, CARD_SIZE, lambda surf, value=value: self.paint_face(surf, value))
 
-    def save_scores(self, scores):
-        with open(SCORES_FILE, 'w') as f:
-            json.dump(scores, f)
+    def paint_face(self, surf, value):
+        rect = surf.get_rect()
+        surf.fill(BG)  # face opaque : le numéro anticrénelé se fond dans le fond
+        pygame.draw.rect(surf, CARD_BORDER, rect, 2)
+        txt = self.font.render(str(value), True, CARD_BORDER)
+        surf.blit(txt, txt.get_rect(center=rect.center))
 
     def run(self):
-        scores = self.load_scores()
+        self.deal()
+        scores = get_store()
         start = time.time()
         running = True
-        clock = pygame.time.Clock()
+        # le retournement des cartes arrive par USEREVENT : il réveille aussi l'attente
+        governor = FrameGovernor()
+        present = Presenter(self.screen, "MemoryGame")
         pygame.time.set_timer(pygame.USEREVENT, 0)
         while running:
-            self.screen.fill(BG)
-            for c in self.cards:
-                pygame.draw.rect(self.screen, CARD_BORDER, c["rect"], 2)
-                if c["revealed"] or c["matched"]:
-                    txt = self.font.render(str(c["value"]), True, CARD_BORDER)
-                    self.screen.blit(txt, txt.get_rect(center=c["rect"].center))
-                else:
-                    pygame.draw.rect(self.screen, CARD_BACK, c["rect"])
-            pygame.display.flip()
-            for event in pygame.event.get():
+            if governor.frame():
+                self.screen.fill(BG)
+                for i, c in enumerate(self.cards):
+                    shown = c["revealed"] or c["matched"]
+                    sprite = c["value"] if shown else 'back'
+                    present.sprite(i, self.sprites.blit(self.screen, sprite, c["rect"].topleft), shown)
+                present.present()
+            for event in governor.events():
+                present.notice(event)
                 if event.type == pygame.QUIT:
                     running = False
                 elif event.type == pygame.MOUSEBUTTONDOWN and not self.locked:
@@ -95,10 +110,8 @@ class MemoryGame:
                 record = scores.get(mode_key)
                 if record is None or duration < record:
                     scores[mode_key] = int(duration)
-                    self.save_scores(scores)
+                scores.record_run("Memory", None, int(duration), duration)
                 txt = self.font.render("Bravo! Temps: %ds" % int(duration), True, CARD_BORDER)
                 self.screen.blit(txt, txt.get_rect(center=(320,240)))
-                pygame.display.flip()
-                pygame.time.wait(2000)
+                wait_key(timeout=2)  # Entrée pour passer
                 running = False
-            clock.tick(30)
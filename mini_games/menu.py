@@ -0,0 +1,82 @@
+# -------------------------
+# mini_games/menu.py
+# -------------------------
+# Menu principal : chaque libellé est rendu une seule fois, en couleur
+# normale et en surbrillance. Seules les lignes de la fenêtre visible
+# sont affichées ; la fenêtre défile pour suivre la sélection.
+# Quand la sélection bouge sans faire défiler, on ne redessine que les
+# deux lignes concernées (display.update sur leurs rectangles).
+import pygame
+
+BG_COLOR = (30, 30, 60)
+HIGHLIGHT = (100, 200, 255)
+TEXT_COLOR = (240, 240, 240)
+ARROW_COLOR = (120, 120, 170)
+ROW_HEIGHT = 44
+LIST_TOP = 130
+LIST_BOTTOM = 420
+
+
+class Menu:
+    def __init__(self, screen, font, options, title, info):
+        self.screen = screen
+        self.width, _ = screen.get_size()
+        self.options = options
+        self.selected = 0
+        self.scroll = 0  # index de la première ligne visible
+        self.visible_rows = (LIST_BOTTOM - LIST_TOP) // ROW_HEIGHT
+        # (normal, surbrillance) pour chaque option
+        self.labels = [(font.render(name, True, TEXT_COLOR), font.render(name, True, HIGHLIGHT))
+                       for name in options]
+        self.title = font.render(title, True, TEXT_COLOR)
+        self.info = font.render(info, True, TEXT_COLOR)
+
+    def row_rect(self, idx):
+        y = LIST_TOP + (idx - self.scroll) * ROW_HEIGHT
+        return pygame.Rect(0, y, self.width, ROW_HEIGHT)
+
+    def draw_row(self, idx):
+        rect = self.row_rect(idx)
+        self.screen.fill(BG_COLOR, rect)
+        label = self.labels[idx][idx == self.selected]
+        self.screen.blit(label, label.get_rect(center=rect.center))
+        return rect
+
+    def draw(self):
+        """Redessine tout le menu (au démarrage, au retour d'un jeu, après défilement)."""
+        self.screen.fill(BG_COLOR)
+        self.screen.blit(self.title, self.title.get_rect(center=(self.width // 2, 80)))
+        last = min(len(self.options), self.scroll + self.visible_rows)
+        for idx in range(self.scroll, last):
+            self.draw_row(idx)
+        # flèches si des options sont cachées au-dessus / en dessous
+        cx = self.width // 2
+        if self.scroll > 0:
+            pygame.draw.polygon(self.screen, ARROW_COLOR,
+                                [(cx - 10, LIST_TOP - 6), (cx + 10, LIST_TOP - 6), (cx, LIST_TOP - 16)])
+        if last < len(self.options):
+            pygame.draw.polygon(self.screen, ARROW_COLOR,
+                                [(cx - 10, LIST_BOTTOM + 6), (cx + 10, LIST_BOTTOM + 6), (cx, LIST_BOTTOM + 16)])
+        self.screen.blit(self.info, self.info.get_rect(center=(self.width // 2, 450)))
+        pygame.display.flip()
+
+    def resume(self):
+        """Retour d'un jeu (scenes.py) : le jeu a dessiné par-dessus."""
+        self.draw()
+
+    def move(self, delta):
+        previous = self.selected
+        self.selected = (self.selected + delta) % len(self.options)
+        if self.selected < self.scroll:
+            self.scroll = self.selected
+        elif self.selected >= self.scroll + self.visible_rows:
+            self.scroll = self.selected - self.visible_rows + 1
+        else:
+            # pas de défilement : seules l'ancienne et la nouvelle ligne changent
+            pygame.display.update([self.draw_row(previous), self.draw_row(self.selected)])
+            return
+        self.draw()
+
+    @property
+    def current(self):
+        return self.options[self.selected]
@@ -0,0 +1,201 @@
+# -------------------------
+# mini_games/metrics.py
+# -------------------------
+# Compteurs de fonctionnement, écrits sur disque pendant que les jeux tournent.
+# Contrairement au panneau F3 (overlay.py), rien n'est affiché : les jeux et
+# les moteurs enregistrent dans un registre commun, et un fil d'arrière-plan
+# ajoute toutes les EXPORT_SECONDS une ligne à metrics.jsonl (à côté de
+# best_scores.json). On compare ainsi les p50 / p99 de milliers de sessions
+# de bornes sans lancer de profileur.
+#   get_counter(nom).inc(n)      total depuis le lancement (images, blits...)
+#   get_gauge(nom).set(v)        dernière valeur connue
+#   get_histogram(nom).record(v) distribution d'entiers (µs, nœuds...)
+# Les histogrammes sont de type HDR : un seau par valeur jusqu'à 2**SUB_BITS,
+# puis SUB_BITS - 1 bits de précision par puissance de deux (moins de 1 %
+# d'erreur relative), quelle que soit l'étendue des valeurs. Les seaux non
+# vides sont exportés avec les percentiles : deux sessions se fusionnent en
+# additionnant leurs seaux.
+# Chaque ligne : {"ts", "session", "uptime", "counters", "gauges",
+# "histograms"} avec les totaux depuis le lancement (une ligne identique à la
+# précédente n'est pas réécrite ; la dernière est écrite à la sortie).
+# Un compteur peut être incrémenté par plusieurs fils (générateur de grilles
+# de runtime.background() et boucle de jeu) : inc() prend son verrou. Une
+# jauge ou un histogramme n'a qu'un fil qui l'écrit (la boucle de jeu), sans
+# verrou ; l'export ne fait que copier. MINI_JEUX_METRICS=0 désactive
+# l'écriture (les compteurs restent disponibles via snapshot()).
+import atexit
+import json
+import os
+import threading
+import time
+
+METRICS_FILE = os.path.join(os.path.dirname(__file__), '..', 'metrics.jsonl')
+EXPORT_SECONDS = 30
+MAX_BYTES = 16 * 1024 * 1024  # au-delà, le fichier devient metrics.jsonl.1 (un seul ancien gardé)
+SUB_BITS = 7
+PERCENTILES = (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("p999", 0.999))
+ENABLED = os.environ.get('MINI_JEUX_METRICS', '1') != '0'
+
+_counters = {}
+_gauges = {}
+_histograms = {}
+_registry_lock = threading.Lock()  # création des mesures seulement
+_exporter = None
+_started = time.monotonic()
+SESSION = os.urandom(6).hex()
+
+
+def bucket_index(value):
+    if value < 1 << SUB_BITS:
+        return value
+    shift = value.bit_length() - SUB_BITS
+    return (shift << (SUB_BITS - 1)) + (value >> shift)
+
+
+def bucket_value(index):
+    """Plus petite valeur du seau index (inverse de bucket_index)."""
+    if index < 1 << SUB_BITS:
+        return index
+    shift = (index >> (SUB_BITS - 1)) - 1
+    return (index - (shift << (SUB_BITS - 1))) << shift
+
+
+class Counter:
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, n=1):
+        with self._lock:  # += n n'est pas atomique entre fils
+            self.value += n
+
+
+class Gauge:
+    def __init__(self):
+        self.value = None
+
+    def set(self, value):
+        self.value = value
+
+
+class Histogram:
+    def __init__(self, unit=None):
+        self.unit = unit
+        self.counts = {}  # seau -> nombre de valeurs
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def record(self, value):
+        value = max(0, int(value))
+        index = bucket_index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if self.max is None or value > self.max:
+            self.max = value
+        if self.min is None or value < self.min:
+            self.min = value
+
+    def snapshot(self):
+        counts = dict(self.counts)  # copie d'un bloc : l'enregistrement peut continuer
+        count = sum(counts.values())
+        report = {"unit": self.unit, "count": count, "min": self.min, "max": self.max,
+                  "mean": round(self.total / count, 1) if count else None}
+        ordered = sorted(counts.items())
+        for name, fraction in PERCENTILES:
+            report[name] = None
+            rank, seen = fraction * count, 0
+            for index, n in ordered:
+                seen += n
+                if seen >= rank:
+                    report[name] = bucket_value(index)
+                    break
+        report["buckets"] = {str(index): n for index, n in ordered}
+        return report
+
+
+def _get(table, name, factory):
+    metric = table.get(name)
+    if metric is None:
+        with _registry_lock:
+            metric = table.get(name)
+            if metric is None:
+                metric = table[name] = factory()
+    return metric
+
+
+def get_counter(name):
+    return _get(_counters, name, Counter)
+
+
+def get_gauge(name):
+    return _get(_gauges, name, Gauge)
+
+
+def get_histogram(name, unit=None):
+    return _get(_histograms, name, lambda: Histogram(unit))
+
+
+def snapshot():
+    """Valeurs courantes de toutes les mesures (totaux depuis le lancement)."""
+    with _registry_lock:
+        counters, gauges, histograms = dict(_counters), dict(_gauges), dict(_histograms)
+    return {
+        "counters": {name: c.value for name, c in sorted(counters.items())},
+        "gauges": {name: g.value for name, g in sorted(gauges.items())},
+        "histograms": {name: h.snapshot() for name, h in sorted(histograms.items())},
+    }
+
+
+class Exporter:
+    """Fil qui ajoute un instantané au fichier toutes les EXPORT_SECONDS."""
+
+    def __init__(self, path=METRICS_FILE, interval=EXPORT_SECONDS):
+        self.path = path
+        self.interval = interval
+        self.last = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metrics-export", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.export()
+
+    def export(self):
+        with self._lock:
+            data = snapshot()
+            if data == self.last:
+                return  # rien de nouveau depuis la dernière ligne
+            line = {"ts": round(time.time(), 3), "session": SESSION,
+                    "uptime": round(time.monotonic() - _started, 3), **data}
+            try:
+                if os.path.exists(self.path) and os.path.getsize(self.path) > MAX_BYTES:
+                    os.replace(self.path, self.path + '.1')
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(line, separators=(',', ':')) + '\n')
+            except OSError:
+                return  # disque plein ou en lecture seule : on réessaiera
+            self.last = data
+
+    def close(self):
+        self._stop.set()
+        self.export()
+
+
+def start_export():
+    """Lance l'export périodique (une fois par processus) ; None si désactivé."""
+    global _exporter
+    if not ENABLED:
+        return None
+    with _registry_lock:
+        if _exporter is None:
+            _exporter = Exporter()
+            _exporter.start()
+    return _exporter
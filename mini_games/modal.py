@@ -0,0 +1,78 @@
+# -------------------------
+# mini_games/modal.py
+# -------------------------
+# Écrans « modaux » partagés : choix de difficulté/mode et écrans de fin.
+# L'écran est dessiné une fois, puis on dort dans pygame.event.wait()
+# (avec délai) au lieu de boucler sur event.get() : 0 % de CPU en attente.
+# Il n'est redessiné que si la fenêtre le demande (exposition).
+# draw est une fonction qui dessine tout l'écran, sans display.flip() ;
+# sans draw, on affiche ce qui est déjà dessiné (écrans de fin) et on en
+# garde une copie pour le réafficher.
+import time
+
+import pygame
+
+from .display import get_display
+from .present import REDRAW_EVENTS
+
+WAIT_MS = 500  # réveil périodique : permet les délais (timeout) sans événement
+
+
+def _painter(draw):
+    if draw is not None:
+        return draw
+    screen = get_display().surface  # surface logique du jeu en cours
+    snapshot = screen.copy()
+    return lambda: screen.blit(snapshot, (0, 0))
+
+
+def _show(draw):
+    draw()
+    get_display().flip()
+
+
+def wait_key(draw=None, keys=(pygame.K_RETURN,), timeout=None):
+    """Affiche draw puis attend l'une des touches.
+
+    Retourne la touche pressée, ou None si la fenêtre est fermée ou si
+    timeout (secondes) est écoulé.
+    """
+    draw = _painter(draw)
+    _show(draw)
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        wait = WAIT_MS
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            wait = max(1, min(wait, int(remaining * 1000)))
+        event = pygame.event.wait(wait)
+        if event.type == pygame.QUIT:
+            return None
+        if event.type in REDRAW_EVENTS:
+            _show(draw)
+        elif event.type == pygame.KEYDOWN and event.key in keys:
+            return event.key
+
+
+def pick(draw, choices, quit_keys=(pygame.K_q,)):
+    """Affiche un menu de choix au clavier et attend une réponse.
+
+    choices : caractères acceptés (event.unicode), ex. '123' ou un dict
+    DIFFICULTIES. Retourne le caractère choisi, ou None pour quitter
+    (fenêtre fermée ou touche de quit_keys).
+    """
+    draw = _painter(draw)
+    _show(draw)
+    while True:
+        event = pygame.event.wait(WAIT_MS)
+        if event.type == pygame.QUIT:
+            return None
+        if event.type in REDRAW_EVENTS:
+            _show(draw)
+        elif event.type == pygame.KEYDOWN:
+            if event.key in quit_keys:
+                return None
+            if event.unicode and event.unicode in choices:
+                return event.unicode
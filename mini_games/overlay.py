@@ -0,0 +1,175 @@
+# -------------------------
+# mini_games/overlay.py
+# -------------------------
+# Panneau de performances, affiché ou caché avec F3 dans n'importe quel jeu.
+# Il montre le temps entre deux images (dernière, médiane p50, p99 sur les
+# HISTORY dernières), la part de mise à jour / dessin / envoi à l'écran,
+# le nombre d'événements par image, les textes servis par le cache de
+# fonts.py, et la courbe des derniers temps d'image (ligne = budget de
+# 60 images/s).
+# Rien n'est à faire dans les jeux : la touche est vue par
+# Presenter.notice(), le panneau est dessiné par Presenter.present() juste
+# avant l'envoi, puis la zone qu'il recouvrait est remise telle quelle (le
+# jeu retrouve son image intacte). Les phases sont signalées par les
+# boucles communes (loop.py) : begin('update') avant les événements et la
+# simulation, begin('draw') avant le dessin ; l'envoi est mesuré par le
+# Presenter. Un jeu qui a sa propre boucle n'a que le temps d'image et
+# l'envoi.
+# Caché, le panneau ne mesure rien : begin() et present() s'arrêtent au
+# premier test.
+import time
+from collections import deque
+
+import pygame
+
+from . import fonts
+from .fonts import get_font
+
+TOGGLE_KEY = pygame.K_F3
+HISTORY = 240  # images gardées pour p50 / p99 et la courbe
+REFRESH = 0.25  # s entre deux mises à jour des chiffres (lisibles, et moins de calcul)
+FONT_SIZE = 18
+PANEL_WIDTH = 250
+GRAPH_HEIGHT = 40
+MARGIN = 4
+BUDGET_MS = 1000 / 60
+PANEL_BG = (20, 20, 28)
+TEXT_COLOR = (230, 230, 230)
+GOOD_COLOR = (90, 200, 90)
+SLOW_COLOR = (230, 170, 40)
+BAD_COLOR = (230, 60, 60)
+BUDGET_COLOR = (120, 120, 140)
+PHASES = ('update', 'draw')
+
+_overlay = None
+
+
+def percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class PerfOverlay:
+    def __init__(self):
+        self.visible = False
+        self.font = None  # chargée au premier affichage
+        self.glyphs = None
+        self.reset()
+
+    def reset(self):
+        self.frame_ms = deque(maxlen=HISTORY)
+        self.split = deque(maxlen=HISTORY)  # (update, draw, envoi) en ms
+        self.event_counts = deque(maxlen=HISTORY)
+        self.phase = None
+        self.phase_start = 0.0
+        self.spent = dict.fromkeys(PHASES, 0.0)
+        self.events = 0
+        self.last_present = None
+        self.cache_seen = (fonts.text_cache.hits, fonts.text_cache.misses)
+        self.cache_hits = self.cache_misses = 0
+        self.lines = []
+        self.refreshed = 0.0
+        self.graph = None
+        self.under = None  # ce que le panneau recouvre, remis après l'envoi
+
+    def toggle(self):
+        self.visible = not self.visible
+        if self.font is None:
+            self.font = get_font(FONT_SIZE)
+            self.glyphs = self.font.glyphs(TEXT_COLOR, PANEL_BG)
+        self.reset()
+
+    def begin(self, phase):
+        """Début d'une phase de l'image en cours ('update', 'draw', ou None : attente)."""
+        if not self.visible:
+            return
+        now = time.perf_counter()
+        if self.phase is not None:
+            self.spent[self.phase] += now - self.phase_start
+        self.phase, self.phase_start = phase, now
+
+    def count_event(self):
+        self.events += 1
+
+    def end_frame(self, present_seconds):
+        """Appelé par Presenter.present() après l'envoi à l'écran."""
+        now = time.perf_counter()
+        self.begin(None)
+        if self.last_present is not None:
+            ms = (now - self.last_present) * 1000
+            self.frame_ms.append(ms)
+            self.split.append((self.spent['update'] * 1000, self.spent['draw'] * 1000, present_seconds * 1000))
+            self.event_counts.append(self.events)
+            self.add_bar(ms)
+        self.last_present = now
+        self.spent = dict.fromkeys(PHASES, 0.0)
+        self.events = 0
+        if now - self.refreshed >= REFRESH:
+            self.refreshed = now
+            self.refresh()
+
+    def refresh(self):
+        hits, misses = fonts.text_cache.hits, fonts.text_cache.misses
+        self.cache_hits, self.cache_misses = hits - self.cache_seen[0], misses - self.cache_seen[1]
+        self.cache_seen = (hits, misses)
+        if not self.frame_ms:
+            self.lines = ["F3 : performances"]
+            return
+        ordered = sorted(self.frame_ms)
+        count = len(self.split)
+        update, draw, present = (sum(s[i] for s in self.split) / count for i in range(3))
+        lookups = self.cache_hits + self.cache_misses
+        rate = round(100 * self.cache_hits / lookups) if lookups else 100
+        self.lines = [
+            f"image {self.frame_ms[-1]:5.1f} ms  p50 {percentile(ordered, 0.5):.1f}  p99 {percentile(ordered, 0.99):.1f}",
+            f"maj {update:.2f}  dessin {draw:.2f}  envoi {present:.2f} ms",
+            f"événements/image {sum(self.event_counts) / len(self.event_counts):.1f}",
+            f"textes en cache {self.cache_hits}/{lookups} ({rate}%)",
+        ]
+
+    def add_bar(self, ms):
+        # la courbe défile d'un pixel par image : une seule barre dessinée
+        if self.graph is None:
+            return
+        graph = self.graph
+        height = graph.get_height()
+        graph.scroll(-1, 0)
+        x = graph.get_width() - 1
+        graph.fill(PANEL_BG, (x, 0, 1, height))
+        color = GOOD_COLOR if ms <= BUDGET_MS * 1.1 else SLOW_COLOR if ms <= BUDGET_MS * 2 else BAD_COLOR
+        bar = min(height, round(ms / (BUDGET_MS * 2) * height))
+        graph.fill(color, (x, height - bar, 1, bar))
+        graph.set_at((x, height - height // 2), BUDGET_COLOR)
+
+    def panel_rect(self, surface):
+        line = self.font.get_linesize()
+        rect = pygame.Rect(0, 0, PANEL_WIDTH, MARGIN * 3 + line * 4 + GRAPH_HEIGHT)
+        rect.bottomright = (surface.get_width() - MARGIN, surface.get_height() - MARGIN)
+        return rect.clip(surface.get_rect())
+
+    def draw(self, surface):
+        """Dessine le panneau sur surface ; retourne sa zone (à envoyer puis à remettre avec restore())."""
+        rect = self.panel_rect(surface)
+        if self.under is None or self.under.get_size() != rect.size:
+            self.under = surface.subsurface(rect).copy()
+            self.graph = pygame.Surface((rect.width - 2 * MARGIN, GRAPH_HEIGHT)).convert(surface)
+            self.graph.fill(PANEL_BG)
+        else:
+            self.under.blit(surface, (0, 0), rect)
+        surface.fill(PANEL_BG, rect)
+        y = rect.y + MARGIN
+        for text in self.lines:
+            self.glyphs.draw(surface, text, (rect.x + MARGIN, y))
+            y += self.font.get_linesize()
+        surface.blit(self.graph, (rect.x + MARGIN, rect.bottom - MARGIN - GRAPH_HEIGHT))
+        return rect
+
+    def restore(self, surface, rect):
+        surface.blit(self.under, rect)
+
+
+def get_overlay():
+    """Panneau de performances partagé par tous les jeux."""
+    global _overlay
+    if _overlay is None:
+        _overlay = PerfOverlay()
+    return _overlay
@@ -1,8 +1,14 @@
 import pygame
 import random
 import time
-import json
-import os
+
+from .fonts import get_font
+from .loop import FrameGovernor
+from .modal import pick, wait_key
+from .present import Presenter
+from .scores import get_store
+
+GAME_INFO = {"name": "Pendu", "class": "HangmanGame", "scores": {"Hangman_*_best_time": "min", "Hangman_*": "max"}, "order": 120}
 
 # mini_games/hangman.py (Pendu)
 # Sauvegarde des meilleurs scores dans best_scores.json :
@@ -16,8 +22,6 @@ WRONG_COLOR = (220, 100, 100)
 CORRECT_COLOR = (100, 255, 100)
 FONT_SIZE = 32
 
-SCORES_FILE = os.path.join(os.path.dirname(__file__), '..', 'best_scores.json')
-
 DIFFICULTIES = {
     '1': ('Facile', 4, 5, 8),    # nom, min_len, max_len, vies
     '2': ('Moyen', 6, 7, 6),
@@ -36,8 +40,8 @@ class HangmanGame:
     def __init__(self, screen):
         self.screen = screen
         self.width, self.height = screen.get_size()
-        self.font = pygame.font.Font(None, FONT_SIZE)
-        self.best_scores = self.load_scores()
+        self.font = get_font(FONT_SIZE)
+        self.best_scores = get_store()
         self.difficulty = None
         self.word = ""
         self.masked = []
@@ -47,46 +51,26 @@ class HangmanGame:
         self.remaining = 0
         self.start_time = 0
 
-    def load_scores(self):
-        try:
-            with open(SCORES_FILE, 'r') as f:
-                return json.load(f)
-        except Exception:
-            return {}
-
-    def save_scores(self):
-        try:
-            with open(SCORES_FILE, 'w') as f:
-                json.dump(self.best_scores, f)
-        except Exception:
-            pass
+    def draw_difficulty_menu(self):
+        self.screen.fill(BG)
+        title = self.font.render("Pendu : Choisis la difficulté", True, TEXT_COLOR)
+        self.screen.blit(title, title.get_rect(center=(self.width // 2, 60)))
+        for key, (name, mn, mx, lives) in DIFFICULTIES.items():
+            desc = f"{key}. {name} ({mn}-{mx} lettres), {lives} vies"
+            txt = self.font.render(desc, True, TEXT_COLOR)
+            self.screen.blit(txt, (60, 140 + int(key) * 50))
+        info = self.font.render("1/2/3 pour choisir, Q pour quitter", True, TEXT_COLOR)
+        self.screen.blit(info, (60, self.height - 60))
 
     def choose_difficulty(self):
-        choosing = True
-        while choosing:
-            self.screen.fill(BG)
-            title = self.font.render("Pendu : Choisis la difficulté", True, TEXT_COLOR)
-            self.screen.blit(title, title.get_rect(center=(self.width // 2, 60)))
-            for key, (name, mn, mx, lives) in DIFFICULTIES.items():
-                desc = f"{key}. {name} ({mn}-{mx} lettres), {lives} vies"
-                txt = self.font.render(desc, True, TEXT_COLOR)
-                self.screen.blit(txt, (60, 140 + int(key) * 50))
-            info = self.font.render("1/2/3 pour choisir, Q pour quitter", True, TEXT_COLOR)
-            self.screen.blit(info, (60, self.height - 60))
-            pygame.display.flip()
-            for e in pygame.event.get():
-                if e.type == pygame.QUIT:
-                    return False
-                elif e.type == pygame.KEYDOWN:
-                    if e.key == pygame.K_q:
-                        return False
-                    if e.unicode in DIFFICULTIES:
-                        self.difficulty, minlen, maxlen, lives = DIFFICULTIES[e.unicode]
-                        self.max_lives = lives
-                        self.remaining = lives
-                        self.pick_word(minlen, maxlen)
-                        return True
-        return False
+        choice = pick(self.draw_difficulty_menu, DIFFICULTIES)
+        if choice is None:
+            return False
+        self.difficulty, minlen, maxlen, lives = DIFFICULTIES[choice]
+        self.max_lives = lives
+        self.remaining = lives
+        self.pick_word(minlen, maxlen)
+        return True
 
     def pick_word(self, min_len, max_len):
         candidates = [w.lower() for w in WORD_POOL if min_len <= len(w) <= max_len]
@@ -135,32 +119,43 @@ class HangmanGame:
             pygame.draw.line(self.screen, TEXT_COLOR, (base_x - 80, base_y + 120), (base_x - 100, base_y + 150), 3)
         if errors >= 6:
             pygame.draw.line(self.screen, TEXT_COLOR, (base_x - 80, base_y + 120), (base_x - 60, base_y + 150), 3)
+        # zone couverte par le dessin (épaisseur des traits comprise)
+        return pygame.Rect(base_x - 105, base_y - 5, 110, 210)
+
+    def draw(self):
+        present = self.presenter
+        self.screen.fill(BG)
+        elapsed = int(time.time() - self.start_time)
+        # Affichage de l'état
+        title = self.font.render(f"Pendu - {self.difficulty}", True, TEXT_COLOR)
+        self.screen.blit(title, (20, 20))
+        word = " ".join(self.masked)
+        word_txt = self.font.render(word, True, HIGHLIGHT)
+        present.sprite('word', self.screen.blit(word_txt, (20, 80)), word)
+        info = self.font.render(f"Vies restantes : {self.remaining}", True, TEXT_COLOR)
+        present.sprite('lives', self.screen.blit(info, (20, 120)), self.remaining)
+        tried = ' '.join(sorted(self.guessed | self.wrong))
+        guessed_txt = self.font.render(f"Lettres tentées : {tried}", True, TEXT_COLOR)
+        present.sprite('tried', self.screen.blit(guessed_txt, (20, 160)), tried)
+        present.sprite('timer', self.font.glyphs(TEXT_COLOR, BG).draw(self.screen, f"Temps: {elapsed}s", (20, 200)), elapsed)
+        present.sprite('hangman', self.draw_hangman(), self.max_lives - self.remaining)
+
+        prompt = self.font.render("Tape une lettre (A-Z), Q pour quitter", True, TEXT_COLOR)
+        self.screen.blit(prompt, (20, self.height - 60))
+        present.present()
 
     def run(self):
         if not self.choose_difficulty():
             return
         running = True
-        clock = pygame.time.Clock()
+        governor = FrameGovernor()
+        governor.tick_every_second(self.start_time)
+        self.presenter = Presenter(self.screen, "HangmanGame")
         won = False
 
         while running:
-            self.screen.fill(BG)
-            elapsed = int(time.time() - self.start_time)
-            # Affichage de l'état
-            title = self.font.render(f"Pendu - {self.difficulty}", True, TEXT_COLOR)
-            self.screen.blit(title, (20, 20))
-            word_txt = self.font.render(" ".join(self.masked), True, HIGHLIGHT)
-            self.screen.blit(word_txt, (20, 80))
-            info = self.font.render(f"Vies restantes : {self.remaining}", True, TEXT_COLOR)
-            self.screen.blit(info, (20, 120))
-            guessed_txt = self.font.render(f"Lettres tentées : {' '.join(sorted(self.guessed | self.wrong))}", True, TEXT_COLOR)
-            self.screen.blit(guessed_txt, (20, 160))
-            time_txt = self.font.render(f"Temps: {elapsed}s", True, TEXT_COLOR)
-            self.screen.blit(time_txt, (20, 200))
-            self.draw_hangman()
-
-            prompt = self.font.render("Tape une lettre (A-Z), Q pour quitter", True, TEXT_COLOR)
-            self.screen.blit(prompt, (20, self.height - 60))
+            if governor.frame():
+                self.draw()
 
             # Vérifie victoire / défaite
             if '_' not in self.masked:
@@ -169,11 +164,12 @@ class HangmanGame:
             if self.remaining <= 0:
                 won = False
                 running = False
-
-            pygame.display.flip()
+            if not running:
+                break
 
             # Événements
-            for e in pygame.event.get():
+            for e in governor.events():
+                self.presenter.notice(e)
                 if e.type == pygame.QUIT:
                     running = False
                 elif e.type == pygame.KEYDOWN:
@@ -190,12 +186,11 @@ class HangmanGame:
                                 self.wrong.add(c)
                                 self.remaining -= 1
 
-            clock.tick(60)
-
         # Fin de partie : enregistrement
         key_score = f"Hangman_{self.difficulty}_best_lives"
         key_time = f"Hangman_{self.difficulty}_best_time"
         duration = time.time() - self.start_time
+        self.best_scores.record_run("Hangman", self.difficulty, self.remaining if won else 0, duration)
         if won:
             prev_lives = self.best_scores.get(key_score, -1)
             if self.remaining > prev_lives:
@@ -203,7 +198,6 @@ class HangmanGame:
             prev_time = self.best_scores.get(key_time)
             if (prev_time is None) or (duration < prev_time):
                 self.best_scores[key_time] = round(duration, 1)
-            self.save_scores()
 
         # Écran de fin
         self.screen.fill(BG)
@@ -220,12 +214,4 @@ class HangmanGame:
         self.screen.blit(stats, (self.width//2 - stats.get_width()//2, 170))
         self.screen.blit(best_txt, (self.width//2 - best_txt.get_width()//2, 220))
         self.screen.blit(prompt2, (self.width//2 - prompt2.get_width()//2, 280))
-        pygame.display.flip()
-
-        waiting = True
-        while waiting:
-            for e in pygame.event.get():
-                if e.type == pygame.QUIT:
-                    waiting = False
-                elif e.type == pygame.KEYDOWN and e.key == pygame.K_RETURN:
-                    waiting = False
+        wait_key()
@@ -2,140 +2,193 @@
 # mini_games/pong.py
 # -------------------------
 import pygame
-import time
-import json
-import os
+
+from .assets import get_atlas
+from .audio import play_sound, tone
+from .fonts import get_font
+from .loop import GameLoop, lerp
+from .modal import pick, wait_key
+from .replay import Recorder
+from .scores import get_store
+from .sim import GameState
+
+GAME_INFO = {"name": "Pong", "class": "PongGame", "scores": {"Pong_solo": "max", "Pong_2joueurs": "min"}, "order": 10}
 
 # Paramètres du jeu
 PADDLE_WIDTH, PADDLE_HEIGHT = 10, 100
 BALL_SIZE = 15
-PADDLE_SPEED = 5
-PADDLE_SPEED_AI = 4
-BALL_SPEED = 4
+# Vitesses en pixels par seconde
+PADDLE_SPEED = 300
+PADDLE_SPEED_AI = 240
+BALL_SPEED = 240
 WIN_SCORE = 3
 BG = (0, 0, 0)
 TEXT_COLOR = (255, 255, 255)
 WIN_COLOR = (255, 200, 50)
-SCORES_FILE = os.path.join(os.path.dirname(__file__), '..', 'best_scores.json')
+# Sons (Hz, s) : raquette, mur, point marqué
+PADDLE_TONE = (459, 0.03)
+WALL_TONE = (226, 0.03)
+SCORE_TONE = (490, 0.25)
 
-class PongGame:
-    def __init__(self, screen):
-        self.screen = screen
-        self.width, self.height = screen.get_size()
-        self.paddle1 = pygame.Rect(20, (self.height-PADDLE_HEIGHT)//2, PADDLE_WIDTH, PADDLE_HEIGHT)
-        self.paddle2 = pygame.Rect(self.width-20-PADDLE_WIDTH, (self.height-PADDLE_HEIGHT)//2, PADDLE_WIDTH, PADDLE_HEIGHT)
-        self.ball = pygame.Rect((self.width-BALL_SIZE)//2, (self.height-BALL_SIZE)//2, BALL_SIZE, BALL_SIZE)
+
+class PongState(GameState):
+    """Règles de Pong ; action = (sens raquette gauche, sens raquette droite), -1, 0 ou 1.
+
+    Avec ai=True, la raquette droite suit la balle et action[1] est ignoré.
+    Événements : 'wall', 'paddle', 'score'.
+    """
+
+    def __init__(self, width, height, ai=False, rng=None):
+        super().__init__(rng)
+        self.width, self.height = width, height
+        self.ai = ai
+        self.bounds = pygame.Rect(0, 0, width, height)
+        self.paddle1 = pygame.Rect(20, (height-PADDLE_HEIGHT)//2, PADDLE_WIDTH, PADDLE_HEIGHT)
+        self.paddle2 = pygame.Rect(width-20-PADDLE_WIDTH, (height-PADDLE_HEIGHT)//2, PADDLE_WIDTH, PADDLE_HEIGHT)
+        self.ball = pygame.Rect((width-BALL_SIZE)//2, (height-BALL_SIZE)//2, BALL_SIZE, BALL_SIZE)
+        self.ball_pos = [float(self.ball.x), float(self.ball.y)]  # position exacte (le Rect est arrondi)
+        self.prev_ball_pos = list(self.ball_pos)
         self.ball_vel = [BALL_SPEED, BALL_SPEED]
         self.score1 = 0
         self.score2 = 0
-        self.font = pygame.font.Font(None, 36)
-        self.clock = pygame.time.Clock()
+
+    @property
+    def score(self):
+        """Score (gauche, droite), noté en fin de relecture."""
+        return self.score1, self.score2
+
+    def reset_ball(self):
+        self.ball.center = (self.width//2, self.height//2)
+        self.ball_pos = [float(self.ball.x), float(self.ball.y)]
+        self.prev_ball_pos = list(self.ball_pos)
+        self.ball_vel[0] = -self.ball_vel[0]
+
+    def move_paddle(self, paddle, step):
+        paddle.y += step
+        paddle.clamp_ip(self.bounds)
+
+    def advance(self, action, dt):
+        dir1, dir2 = action
+        step = round(PADDLE_SPEED * dt)
+        self.move_paddle(self.paddle1, dir1 * step)
+        if not self.ai:
+            self.move_paddle(self.paddle2, dir2 * step)
+        else:
+            step_ai = round(PADDLE_SPEED_AI * dt)
+            if self.ball.centery < self.paddle2.centery:
+                self.move_paddle(self.paddle2, -step_ai)
+            elif self.ball.centery > self.paddle2.centery:
+                self.move_paddle(self.paddle2, step_ai)
+        self.prev_ball_pos = list(self.ball_pos)
+        self.ball_pos[0] += self.ball_vel[0] * dt
+        self.ball_pos[1] += self.ball_vel[1] * dt
+        self.ball.topleft = (round(self.ball_pos[0]), round(self.ball_pos[1]))
+        if self.ball.top <= 0 or self.ball.bottom >= self.height:
+            self.ball_vel[1] = -self.ball_vel[1]
+            self.emit('wall')
+        if self.ball.colliderect(self.paddle1) or self.ball.colliderect(self.paddle2):
+            self.ball_vel[0] = -self.ball_vel[0]
+            self.emit('paddle')
+        if self.ball.left <= 0:
+            self.score2 += 1
+            self.emit('score')
+            self.reset_ball()
+        if self.ball.right >= self.width:
+            self.score1 += 1
+            self.emit('score')
+            self.reset_ball()
+        if self.score1 >= WIN_SCORE or self.score2 >= WIN_SCORE:
+            self.over = True
+
+
+class PongGame(GameLoop):
+    def __init__(self, screen):
+        self.screen = screen
+        self.width, self.height = screen.get_size()
         self.mode = None
-        self.start_time = 0
+        self.new_match()
+        self.font = get_font(36)
+        self.sprites = get_atlas("PongGame", self.define_sprites)
+        tone('pong_paddle', *PADDLE_TONE)
+        tone('pong_wall', *WALL_TONE)
+        tone('pong_score', *SCORE_TONE, wave='square')
+
+    def new_match(self, replay=None):
+        # l'instance est gardée entre deux parties (scenes.py) : tout repart de zéro
+        params = {"width": self.width, "height": self.height, "ai": self.mode == 'solo'}
+        self.session = replay or Recorder(self, PongState, params, dt=1 / self.tick_rate,
+                                          settings={"mode": self.mode})
+        self.state = self.session.state
 
-    def load_scores(self):
-        try:
-            with open(SCORES_FILE, 'r') as f:
-                return json.load(f)
-        except Exception:
-            return {}
+    def define_sprites(self, atlas):
+        atlas.ellipse('ball', TEXT_COLOR, (BALL_SIZE, BALL_SIZE))
 
-    def save_scores(self, scores):
-        with open(SCORES_FILE, 'w') as f:
-            json.dump(scores, f)
+    def draw_mode_menu(self):
+        self.screen.fill(BG)
+        title = self.font.render("Pong : choisissez le mode", True, TEXT_COLOR)
+        self.screen.blit(title, title.get_rect(center=(self.width//2, 100)))
+        m1 = self.font.render("1. 2 Joueurs (W/S vs ↑/↓)", True, TEXT_COLOR)
+        m2 = self.font.render("2. Solo vs IA", True, TEXT_COLOR)
+        self.screen.blit(m1, m1.get_rect(center=(self.width//2, 200)))
+        self.screen.blit(m2, m2.get_rect(center=(self.width//2, 260)))
 
     def choose_mode(self):
-        choosing = True
-        while choosing:
-            self.screen.fill(BG)
-            title = self.font.render("Pong : choisissez le mode", True, TEXT_COLOR)
-            self.screen.blit(title, title.get_rect(center=(self.width//2, 100)))
-            m1 = self.font.render("1. 2 Joueurs (W/S vs ↑/↓)", True, TEXT_COLOR)
-            m2 = self.font.render("2. Solo vs IA", True, TEXT_COLOR)
-            self.screen.blit(m1, m1.get_rect(center=(self.width//2, 200)))
-            self.screen.blit(m2, m2.get_rect(center=(self.width//2, 260)))
-            pygame.display.flip()
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    return False
-                elif event.type == pygame.KEYDOWN and event.unicode in ('1', '2'):
-                    self.mode = '2joueurs' if event.unicode == '1' else 'solo'
-                    return True
-        return False
+        choice = pick(self.draw_mode_menu, '12', quit_keys=())
+        if choice is None:
+            return False
+        self.mode = '2joueurs' if choice == '1' else 'solo'
+        return True
 
-    def reset_ball(self):
-        self.ball.center = (self.width//2, self.height//2)
-        self.ball_vel[0] = -self.ball_vel[0]
+    def update(self, dt):
+        keys = pygame.key.get_pressed()
+        action = (keys[pygame.K_s] - keys[pygame.K_w], keys[pygame.K_DOWN] - keys[pygame.K_UP])
+        for name, _ in self.session.step(action, dt):
+            play_sound('pong_' + name)
+        if self.state.over or self.session.finished:
+            self.stop()
+
+    def render(self, alpha):
+        state = self.state
+        present = self.presenter
+        self.screen.fill(BG)
+        present.sprite('paddle1', pygame.draw.rect(self.screen, TEXT_COLOR, state.paddle1))
+        present.sprite('paddle2', pygame.draw.rect(self.screen, TEXT_COLOR, state.paddle2))
+        ball = state.ball.copy()
+        ball.topleft = (round(lerp(state.prev_ball_pos[0], state.ball_pos[0], alpha)),
+                        round(lerp(state.prev_ball_pos[1], state.ball_pos[1], alpha)))
+        present.sprite('ball', self.sprites.blit(self.screen, 'ball', ball.topleft))
+        score = f"{state.score1} : {state.score2}"
+        score_txt = self.font.render(score, True, TEXT_COLOR)
+        present.sprite('score', self.screen.blit(score_txt, (self.width//2 - score_txt.get_width()//2, 20)), score)
+        if self.mode == 'solo':
+            # Affiche temps actuel (temps de la partie, pas l'horloge murale)
+            elapsed = int(state.time)
+            timer_txt = self.font.render(f"Temps: {elapsed}s", True, TEXT_COLOR)
+            present.sprite('timer', self.screen.blit(timer_txt, (10, self.height-30)), elapsed)
 
     def run(self):
         if not self.choose_mode():
             return
-        scores = self.load_scores()
+        self.new_match()
+        scores = get_store()
         mode_key = f"Pong_{self.mode}"
-        self.start_time = time.time()
-        running = True
-        while running:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-            keys = pygame.key.get_pressed()
-            if keys[pygame.K_w] and self.paddle1.top > 0:
-                self.paddle1.y -= PADDLE_SPEED
-            if keys[pygame.K_s] and self.paddle1.bottom < self.height:
-                self.paddle1.y += PADDLE_SPEED
-            if self.mode == '2joueurs':
-                if keys[pygame.K_UP] and self.paddle2.top > 0:
-                    self.paddle2.y -= PADDLE_SPEED
-                if keys[pygame.K_DOWN] and self.paddle2.bottom < self.height:
-                    self.paddle2.y += PADDLE_SPEED
-            else:
-                if self.ball.centery < self.paddle2.centery and self.paddle2.top > 0:
-                    self.paddle2.y -= PADDLE_SPEED_AI
-                elif self.ball.centery > self.paddle2.centery and self.paddle2.bottom < self.height:
-                    self.paddle2.y += PADDLE_SPEED_AI
-            self.ball.x += self.ball_vel[0]
-            self.ball.y += self.ball_vel[1]
-            if self.ball.top <= 0 or self.ball.bottom >= self.height:
-                self.ball_vel[1] = -self.ball_vel[1]
-            if self.ball.colliderect(self.paddle1) or self.ball.colliderect(self.paddle2):
-                self.ball_vel[0] = -self.ball_vel[0]
-            if self.ball.left <= 0:
-                self.score2 += 1
-                self.reset_ball()
-            if self.ball.right >= self.width:
-                self.score1 += 1
-                self.reset_ball()
-            self.screen.fill(BG)
-            pygame.draw.rect(self.screen, TEXT_COLOR, self.paddle1)
-            pygame.draw.rect(self.screen, TEXT_COLOR, self.paddle2)
-            pygame.draw.ellipse(self.screen, TEXT_COLOR, self.ball)
-            score_txt = self.font.render(f"{self.score1} : {self.score2}", True, TEXT_COLOR)
-            self.screen.blit(score_txt, (self.width//2 - score_txt.get_width()//2, 20))
-            pygame.display.flip()
+        self.run_loop()
+        self.session.save()
+        if self.state.over:
+            duration = self.state.time
+            # Calcul du score à enregistrer
             if self.mode == 'solo':
-                # Affiche temps actuel
-                elapsed = int(time.time() - self.start_time)
-                timer_txt = self.font.render(f"Temps: {elapsed}s", True, TEXT_COLOR)
-                self.screen.blit(timer_txt, (10, self.height-30))
-                pygame.display.flip()
-            if (self.score1 >= WIN_SCORE or self.score2 >= WIN_SCORE):
-                end_time = time.time()
-                duration = end_time - self.start_time
-                # Calcul du score à enregistrer
-                if self.mode == 'solo':
-                    record = scores.get(mode_key, 0)
-                    if duration > record:
-                        scores[mode_key] = int(duration)
-                else:
-                    record = scores.get(mode_key)
-                    if record is None or duration < record:
-                        scores[mode_key] = int(duration)
-                self.save_scores(scores)
-                winner = "Joueur 1" if self.score1 > self.score2 else "Joueur 2"
-                win_txt = self.font.render(f"{winner} a gagné!", True, WIN_COLOR)
-                self.screen.blit(win_txt, win_txt.get_rect(center=(self.width//2, self.height//2)))
-                pygame.display.flip()
-                pygame.time.wait(2000)
-                running = False
-            self.clock.tick(60)
+                record = scores.get(mode_key, 0)
+                if duration > record:
+                    scores[mode_key] = int(duration)
+            else:
+                record = scores.get(mode_key)
+                if record is None or duration < record:
+                    scores[mode_key] = int(duration)
+            scores.record_run("Pong", self.mode, int(duration), duration)
+            self.render(1.0)
+            winner = "Joueur 1" if self.state.score1 > self.state.score2 else "Joueur 2"
+            win_txt = self.font.render(f"{winner} a gagné!", True, WIN_COLOR)
+            self.screen.blit(win_txt, win_txt.get_rect(center=(self.width//2, self.height//2)))
+            wait_key(timeout=2)  # Entrée pour passer
         # Retour automatique au menu
@@ -0,0 +1,165 @@
+# -------------------------
+# mini_games/present.py
+# -------------------------
+# Présentation à l'écran par rectangles modifiés (dirty rects).
+# Le jeu redessine son image comme avant, mais au lieu de display.flip()
+# (toute la fenêtre 640x480 envoyée à l'écran), il signale ce qu'il a
+# dessiné de variable : presenter.sprite(clé, rect, apparence).
+# Seul ce qui a bougé ou changé d'apparence depuis l'image précédente, et
+# ce qui n'a pas été redessiné (à effacer), part à l'écran avec
+# display.update(rects). Le fond et le décor dessinés à l'identique à chaque
+# image n'ont pas besoin d'être signalés.
+# Au-delà de FULL_FLIP_RATIO de la fenêtre (ou de MAX_RECTS zones), un
+# flip complet coûte moins cher : on y revient. La première image, et toute
+# image après une exposition de la fenêtre, est envoyée en entier.
+# L'envoi passe par display.py (mise à l'échelle si le jeu dessine dans
+# une surface logique plus petite ou plus grande que la fenêtre).
+# F3 affiche le panneau de performances (overlay.py), ajouté ici à l'image.
+# Chaque envoi est aussi compté dans metrics.py (images, temps d'image et
+# d'envoi, zones envoyées) pour l'export sur disque.
+import time
+
+import pygame
+
+from .display import get_display
+from .metrics import get_counter, get_gauge, get_histogram
+from .overlay import TOGGLE_KEY, get_overlay
+
+FULL_FLIP_RATIO = 0.5  # part de la fenêtre au-delà de laquelle on fait un flip
+MAX_RECTS = 48
+# Événements après lesquels la fenêtre doit être entièrement réaffichée
+REDRAW_EVENTS = (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE, pygame.WINDOWRESTORED)
+IDLE_SECONDS = 1.0  # écart plus long entre deux envois : pause ou attente, pas un temps d'image
+
+FRAMES = get_counter("present.frames")
+FLIPS = get_counter("present.flips")
+RECTS = get_counter("present.rects")
+PIXELS = get_gauge("present.pixels")
+FRAME_TIME = get_histogram("present.frame_us", "us")
+PRESENT_TIME = get_histogram("present.send_us", "us")
+
+_stats = {}  # nom du jeu -> compteurs cumulés (toutes parties)
+
+
+def merge_rects(rects, bounds):
+    """Découpe à bounds et fusionne les rectangles qui se chevauchent."""
+    merged = []
+    for rect in rects:
+        rect = rect.clip(bounds)
+        if not rect.width or not rect.height:
+            continue
+        i = rect.collidelist(merged)
+        while i != -1:
+            rect.union_ip(merged.pop(i))
+            i = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+
+class Presenter:
+    """Remplace display.flip() pour un jeu.
+
+    Chaque image : dessiner, appeler sprite() pour chaque élément variable
+    (une clé unique par élément et par image), puis present().
+    """
+
+    def __init__(self, screen, name="?"):
+        self.screen = screen
+        self.bounds = screen.get_rect()
+        self.name = name
+        self.rects = []
+        self.full = True  # première image : tout
+        self.shown = {}  # clé -> (rect, apparence) à l'écran
+        self.drawn = {}  # clé -> (rect, apparence) de l'image en cours
+        self.stats = _stats.setdefault(name, {"frames": 0, "flips": 0, "updates": 0,
+                                              "pixels": 0, "seconds": 0.0})
+        self.overlay = get_overlay()
+        self.last_present = None
+
+    def mark(self, rect):
+        """Signale une zone modifiée à la main."""
+        self.rects.append(pygame.Rect(rect))
+
+    def mark_all(self):
+        self.full = True
+
+    def notice(self, event):
+        """À appeler avec chaque événement : réaffiche tout après une exposition, F3 pour le panneau."""
+        if event.type in REDRAW_EVENTS:
+            self.full = True
+        elif event.type == pygame.KEYDOWN and event.key == TOGGLE_KEY:
+            self.overlay.toggle()
+            self.full = True  # panneau montré ou retiré : tout renvoyer
+        if self.overlay.visible:
+            self.overlay.count_event()
+
+    def sprite(self, key, rect, look=None):
+        """Signale un élément dessiné dans rect ; look décrit son apparence (texte, couleur...)."""
+        rect = pygame.Rect(rect)
+        shown = self.shown.pop(key, None)
+        if shown is None:
+            self.rects.append(rect)
+        elif shown[0] != rect or shown[1] != look:
+            self.rects.append(shown[0])
+            self.rects.append(rect)
+        self.drawn[key] = (rect, look)
+        return rect
+
+    def present(self):
+        # affiché à l'image précédente mais pas redessiné : à effacer
+        for rect, _ in self.shown.values():
+            self.rects.append(rect)
+        self.shown, self.drawn = self.drawn, {}
+        overlay = self.overlay
+        if overlay.visible:
+            panel = overlay.draw(self.screen)
+            self.rects.append(panel)
+        start = time.perf_counter()
+        stats = self.stats
+        area = self.bounds.width * self.bounds.height
+        rects = [] if self.full else merge_rects(self.rects, self.bounds)
+        pixels = sum(r.width * r.height for r in rects)
+        if self.full or pixels > area * FULL_FLIP_RATIO or len(rects) > MAX_RECTS:
+            get_display().flip()
+            stats["flips"] += 1
+            FLIPS.inc()
+            pixels = area
+        elif rects:
+            get_display().update(rects)
+            stats["updates"] += 1
+            RECTS.inc(len(rects))
+        stats["frames"] += 1
+        stats["pixels"] += pixels
+        end = time.perf_counter()
+        seconds = end - start
+        stats["seconds"] += seconds
+        FRAMES.inc()
+        PIXELS.set(pixels)
+        PRESENT_TIME.record(seconds * 1e6)
+        if self.last_present is not None and end - self.last_present < IDLE_SECONDS:
+            FRAME_TIME.record((end - self.last_present) * 1e6)
+        self.last_present = end
+        self.rects = []
+        self.full = False
+        if overlay.visible:
+            overlay.restore(self.screen, panel)
+            overlay.end_frame(seconds)
+
+
+def stats():
+    """Par jeu : images présentées, flips complets, part moyenne de l'écran envoyée, coût moyen."""
+    area = None
+    surface = pygame.display.get_surface()
+    if surface is not None:
+        area = surface.get_width() * surface.get_height()
+    report = {}
+    for name, s in _stats.items():
+        frames = s["frames"] or 1
+        report[name] = {
+            "frames": s["frames"],
+            "flips": s["flips"],
+            "updates": s["updates"],
+            "screen_share": round(s["pixels"] / frames / area, 3) if area else None,
+            "present_ms": round(s["seconds"] / frames * 1000, 3),
+        }
+    return report
@@ -2,8 +2,14 @@
 import pygame
 import random
 import time
-import json
-import os
+
+from .fonts import get_font
+from .modal import pick, wait_key
+from .present import Presenter
+from .runtime import pause
+from .scores import get_store
+
+GAME_INFO = {"name": "Reaction Timer", "class": "ReactionTimerGame", "scores": {"Reaction_*": "min"}, "order": 100}
 
 # Configuration visuelle
 BG = (30, 30, 30)
@@ -13,8 +19,6 @@ TOO_SOON_COLOR = (220, 100, 100)
 TEXT_COLOR = (240, 240, 240)
 FONT_SIZE = 32
 
-SCORES_FILE = os.path.join(os.path.dirname(__file__), '..', 'best_scores.json')
-
 # Difficultés : (nom, max_delay, min_delay, trials)
 DIFFICULTIES = {
     '1': ('Facile', 2.5, 1.0, 5),
@@ -27,54 +31,34 @@ class ReactionTimerGame:
     def __init__(self, screen):
         self.screen = screen
         self.width, self.height = screen.get_size()
-        self.font = pygame.font.Font(None, FONT_SIZE)
+        self.font = get_font(FONT_SIZE)
         self.difficulty = None
         self.max_delay = 2.5
         self.min_delay = 1.0
         self.trials = 5
-        self.best_scores = self.load_scores()
-
-    def load_scores(self):
-        try:
-            with open(SCORES_FILE, 'r') as f:
-                return json.load(f)
-        except Exception:
-            return {}
-
-    def save_scores(self):
-        try:
-            with open(SCORES_FILE, 'w') as f:
-                json.dump(self.best_scores, f)
-        except Exception:
-            pass
+        self.best_scores = get_store()
+
+    def draw_difficulty_menu(self):
+        self.screen.fill(BG)
+        title = self.font.render("Reaction Timer : Choisis la difficulté", True, TEXT_COLOR)
+        self.screen.blit(title, title.get_rect(center=(self.width // 2, 60)))
+        for key, (name, maxd, mind, trials) in DIFFICULTIES.items():
+            desc = f"{key}. {name} - {trials} essais, attente aléatoire [{mind:.1f}-{maxd:.1f}]s"
+            txt = self.font.render(desc, True, TEXT_COLOR)
+            self.screen.blit(txt, (40, 140 + int(key) * 50))
+        info = self.font.render("1/2/3 pour choisir, Q pour quitter", True, TEXT_COLOR)
+        self.screen.blit(info, (40, self.height - 50))
 
     def choose_difficulty(self):
-        choosing = True
-        while choosing:
-            self.screen.fill(BG)
-            title = self.font.render("Reaction Timer : Choisis la difficulté", True, TEXT_COLOR)
-            self.screen.blit(title, title.get_rect(center=(self.width // 2, 60)))
-            for key, (name, maxd, mind, trials) in DIFFICULTIES.items():
-                desc = f"{key}. {name} - {trials} essais, attente aléatoire [{mind:.1f}-{maxd:.1f}]s"
-                txt = self.font.render(desc, True, TEXT_COLOR)
-                self.screen.blit(txt, (40, 140 + int(key) * 50))
-            info = self.font.render("1/2/3 pour choisir, Q pour quitter", True, TEXT_COLOR)
-            self.screen.blit(info, (40, self.height - 50))
-            pygame.display.flip()
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    return False
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_q:
-                        return False
-                    if event.unicode in DIFFICULTIES:
-                        name, maxd, mind, trials = DIFFICULTIES[event.unicode]
-                        self.difficulty = name
-                        self.max_delay = maxd
-                        self.min_delay = mind
-                        self.trials = trials
-                        return True
-        return False
+        choice = pick(self.draw_difficulty_menu, DIFFICULTIES)
+        if choice is None:
+            return False
+        name, maxd, mind, trials = DIFFICULTIES[choice]
+        self.difficulty = name
+        self.max_delay = maxd
+        self.min_delay = mind
+        self.trials = trials
+        return True
 
     def run_trial(self):
         # Phase attente random puis signal
@@ -85,10 +69,12 @@ class ReactionTimerGame:
         reacted = False
         reaction = None
         early = False
+        present = Presenter(self.screen, "ReactionTimerGame")
 
         while True:
             now = time.time()
             for event in pygame.event.get():
+                present.notice(event)
                 if event.type == pygame.QUIT:
                     return None, False  # abort
                 elif event.type == pygame.KEYDOWN:
@@ -126,10 +112,11 @@ class ReactionTimerGame:
                 color = WAIT_COLOR
                 message = ""
 
-            self.screen.fill(color)
+            # changement de couleur : tout l'écran ; sinon rien ne bouge
+            present.sprite('background', self.screen.fill(color), color)
             txt = self.font.render(message, True, TEXT_COLOR)
-            self.screen.blit(txt, txt.get_rect(center=(self.width // 2, self.height // 2)))
-            pygame.display.flip()
+            present.sprite('message', self.screen.blit(txt, txt.get_rect(center=(self.width // 2, self.height // 2))), message)
+            present.present()
             pygame.time.Clock().tick(60)
 
     def run(self):
@@ -140,27 +127,13 @@ class ReactionTimerGame:
         running = True
         for i in range(1, self.trials + 1):
             # écran de préparation
-            prep = True
-            while prep:
-                self.screen.fill(BG)
-                info = self.font.render(f"Essai {i}/{self.trials} - Appuie sur ESPACE pour commencer", True, TEXT_COLOR)
-                diff_txt = self.font.render(f"Difficulté: {self.difficulty}", True, TEXT_COLOR)
-                self.screen.blit(info, info.get_rect(center=(self.width // 2, self.height // 2 - 20)))
-                self.screen.blit(diff_txt, diff_txt.get_rect(center=(self.width // 2, self.height // 2 + 20)))
-                pygame.display.flip()
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        running = False
-                        prep = False
-                    elif event.type == pygame.KEYDOWN:
-                        if event.key == pygame.K_SPACE:
-                            prep = False
-                        elif event.key == pygame.K_q:
-                            running = False
-                            prep = False
-                if not running:
-                    break
-            if not running:
+            self.screen.fill(BG)
+            info = self.font.render(f"Essai {i}/{self.trials} - Appuie sur ESPACE pour commencer", True, TEXT_COLOR)
+            diff_txt = self.font.render(f"Difficulté: {self.difficulty}", True, TEXT_COLOR)
+            self.screen.blit(info, info.get_rect(center=(self.width // 2, self.height // 2 - 20)))
+            self.screen.blit(diff_txt, diff_txt.get_rect(center=(self.width // 2, self.height // 2 + 20)))
+            if wait_key(keys=(pygame.K_SPACE, pygame.K_q)) != pygame.K_SPACE:
+                running = False
                 break
             reaction, ok = self.run_trial()
             if reaction is None and not ok:
@@ -177,7 +150,9 @@ class ReactionTimerGame:
             feedback = self.font.render(msg, True, TEXT_COLOR)
             self.screen.blit(feedback, feedback.get_rect(center=(self.width // 2, self.height // 2)))
             pygame.display.flip()
-            pygame.time.delay(800)
+            if not pause(0.8):
+                running = False
+                break
 
         # Calcul des statistiques
         valid_times = [r for r in results if r is not None]
@@ -190,38 +165,28 @@ class ReactionTimerGame:
         key_single = f"Reaction_{self.difficulty}_best_single"
         prev_avg = self.best_scores.get(key_avg)
         prev_single = self.best_scores.get(key_single)
-        updated = False
         if avg is not None:
             if (prev_avg is None) or (avg < prev_avg):
                 self.best_scores[key_avg] = round(avg, 3)
-                updated = True
             if (prev_single is None) or (best < prev_single):
                 self.best_scores[key_single] = round(best, 3)
-                updated = True
-        if updated:
-            self.save_scores()
+            self.best_scores.record_run("Reaction", self.difficulty, round(avg, 3), sum(valid_times))
 
         # Écran de résultat
-        while True:
-            self.screen.fill(BG)
-            y = 80
-            title = self.font.render("Résultats", True, TEXT_COLOR)
-            self.screen.blit(title, title.get_rect(center=(self.width // 2, y)))
-            y += 50
-            if avg is not None:
-                self.screen.blit(self.font.render(f"Temps moyen   : {avg*1000:.0f} ms", True, TEXT_COLOR), (60, y)); y += 30
-                self.screen.blit(self.font.render(f"Meilleur      : {best*1000:.0f} ms", True, TEXT_COLOR), (60, y)); y += 30
-                self.screen.blit(self.font.render(f"Pire          : {worst*1000:.0f} ms", True, TEXT_COLOR), (60, y)); y += 30
-            else:
-                self.screen.blit(self.font.render("Aucun temps valide enregistré.", True, TEXT_COLOR), (60, y)); y += 30
-            self.screen.blit(self.font.render(f"Scores enregistrés ({self.difficulty}):", True, TEXT_COLOR), (60, y)); y += 30
-            self.screen.blit(self.font.render(f"Meilleure moyenne : {self.best_scores.get(key_avg, '-')}", True, TEXT_COLOR), (60, y)); y += 30
-            self.screen.blit(self.font.render(f"Meilleur simple   : {self.best_scores.get(key_single, '-')}", True, TEXT_COLOR), (60, y)); y += 40
-            prompt = self.font.render("Appuie sur Entrée pour revenir", True, TEXT_COLOR)
-            self.screen.blit(prompt, (self.width // 2 - prompt.get_width() // 2, self.height - 80))
-            pygame.display.flip()
-            for e in pygame.event.get():
-                if e.type == pygame.QUIT:
-                    return
-                elif e.type == pygame.KEYDOWN and e.key == pygame.K_RETURN:
-                    return
+        self.screen.fill(BG)
+        y = 80
+        title = self.font.render("Résultats", True, TEXT_COLOR)
+        self.screen.blit(title, title.get_rect(center=(self.width // 2, y)))
+        y += 50
+        if avg is not None:
+            self.screen.blit(self.font.render(f"Temps moyen   : {avg*1000:.0f} ms", True, TEXT_COLOR), (60, y)); y += 30
+            self.screen.blit(self.font.render(f"Meilleur      : {best*1000:.0f} ms", True, TEXT_COLOR), (60, y)); y += 30
+            self.screen.blit(self.font.render(f"Pire          : {worst*1000:.0f} ms", True, TEXT_COLOR), (60, y)); y += 30
+        else:
+            self.screen.blit(self.font.render("Aucun temps valide enregistré.", True, TEXT_COLOR), (60, y)); y += 30
+        self.screen.blit(self.font.render(f"Scores enregistrés ({self.difficulty}):", True, TEXT_COLOR), (60, y)); y += 30
+        self.screen.blit(self.font.render(f"Meilleure moyenne : {self.best_scores.get(key_avg, '-')}", True, TEXT_COLOR), (60, y)); y += 30
+        self.screen.blit(self.font.render(f"Meilleur simple   : {self.best_scores.get(key_single, '-')}", True, TEXT_COLOR), (60, y)); y += 40
+        prompt = self.font.render("Appuie sur Entrée pour revenir", True, TEXT_COLOR)
+        self.screen.blit(prompt, (self.width // 2 - prompt.get_width() // 2, self.height - 80))
+        wait_key()
@@ -0,0 +1,65 @@
+# -------------------------
+# mini_games/registry.py
+# -------------------------
+# Registre des jeux du menu : libellé -> (module, classe).
+# La liste vient de discovery.py (GAME_INFO de chaque module, lu sans
+# import) : un nouveau fichier de jeu dans mini_games/ apparaît au menu.
+# Les modules ne sont importés (importlib) qu'au moment où le jeu est
+# choisi, puis gardés en cache : le menu s'affiche sans attendre tous
+# les jeux, et un module cassé n'empêche pas les autres de se lancer.
+# Les clés de scores déclarées dans GAME_INFO["scores"] disent à quel jeu
+# appartient une clé et dans quel sens la classer (score_rule).
+import functools
+import importlib
+from fnmatch import fnmatchcase
+
+from .discovery import discover
+
+_INFOS = discover()
+
+# Noms de modules tels qu'ils sont sur le disque (breackout, tic-tac-toe...)
+GAMES = [(info["name"], info["module"], info["class"]) for info in _INFOS]
+
+
+def _rules(info):
+    rules = info.get("scores") or {}
+    if isinstance(rules, list):  # ancien format : liste de motifs, plus haut = mieux
+        rules = dict.fromkeys(rules, "max")
+    return rules.items()
+
+
+# (motif, libellé du jeu, "max" ou "min") dans l'ordre du menu
+SCORE_RULES = [(pattern, info["name"], direction) for info in _INFOS for pattern, direction in _rules(info)]
+
+MENU_OPTIONS = [label for label, _, _ in GAMES]
+
+_entries = {label: (module, cls) for label, module, cls in GAMES}
+_classes = {}  # libellé -> classe déjà importée
+
+
+def load_game(label):
+    """Importe (une seule fois) et retourne la classe du jeu associé au libellé."""
+    cls = _classes.get(label)
+    if cls is None:
+        module_name, class_name = _entries[label]
+        module = importlib.import_module(f"{__package__}.{module_name}")
+        cls = getattr(module, class_name)
+        _classes[label] = cls
+    return cls
+
+
+@functools.lru_cache(maxsize=None)
+def score_rule(key):
+    """(libellé du jeu, "max" ou "min") pour une clé de score, ou None si aucun jeu ne la déclare."""
+    for pattern, name, direction in SCORE_RULES:
+        if fnmatchcase(key, pattern):
+            return name, direction
+    return None
+
+
+def find_class(class_name):
+    """Retrouve un jeu par nom de classe (ex. 'SnakeGame')."""
+    for label, _, cls in GAMES:
+        if cls == class_name:
+            return load_game(label)
+    raise KeyError(class_name)
@@ -0,0 +1,244 @@
+# -------------------------
+# mini_games/replay.py
+# -------------------------
+# Enregistrement et relecture des parties (Snake, Flappy, Casse-briques,
+# Pong, 2048).
+# Chaque partie a sa graine : l'état (sim.py) tire tout son hasard d'un
+# random.Random à lui, initialisé par rng_stream(graine, nom de l'état), et
+# ne lit jamais l'horloge. Rejouer les mêmes actions aux mêmes pas avec la
+# même graine redonne donc exactement la même partie.
+# Recorder joue la partie en notant chaque changement d'action ; à la fin,
+# save() écrit replays/<jeu>-<date>-<graine>.jsonl :
+#   1re ligne : en-tête (jeu, état, paramètres, graine, pas dt)
+#   puis      : [horodatage, action] à chaque changement d'action
+#               (horodatage = numéro du pas ; pour le 2048, qui n'a pas de
+#               pas fixe, secondes depuis le début, un coup par ligne)
+#   dernière  : fin (nombre de pas, score, empreinte de l'état final)
+# Replay relit ce fichier et s'utilise à la place de Recorder : la vue
+# appelle step() comme d'habitude, l'action enregistrée remplace la sienne.
+#   python -m mini_games.replay replays/fichier.jsonl            (affiché, vitesse réelle)
+#   python -m mini_games.replay --headless replays/fichier.jsonl (sans fenêtre, au plus vite)
+# MINI_JEUX_REPLAYS=0 désactive l'enregistrement ; seuls les MAX_REPLAYS
+# fichiers les plus récents sont gardés. L'écriture et le ménage se font
+# dans un thread (runtime.background), comme les scores : la fin de partie
+# ne touche pas au disque ; les écritures en cours sont attendues à la sortie.
+import argparse
+import atexit
+import concurrent.futures
+import glob
+import hashlib
+import json
+import os
+import random
+import sys
+import time
+
+import pygame
+
+from .display import get_display
+from .present import Presenter
+from .registry import find_class
+from .runtime import background, pause
+
+FORMAT = 1
+REPLAY_DIR = os.path.join(os.path.dirname(__file__), '..', 'replays')
+MAX_REPLAYS = 200
+ENABLED = os.environ.get('MINI_JEUX_REPLAYS', '1') != '0'
+EXIT_WAIT = 2.0  # s accordées à la sortie aux écritures pas encore finies
+
+_saving = set()  # écritures en cours (Futures)
+
+
+def rng_stream(seed, name):
+    """Générateur propre à une partie et à un usage : deux flux ne se décalent jamais l'un l'autre."""
+    return random.Random(f"{seed}/{name}")
+
+
+def new_seed():
+    return random.SystemRandom().getrandbits(32)
+
+
+def digest(state):
+    """Empreinte de l'état de la partie (hors horloge), pour vérifier une relecture."""
+    fields = sorted((k, repr(v)) for k, v in vars(state).items() if k not in ('rng', 'events', 'time'))
+    return hashlib.sha1(repr(fields).encode()).hexdigest()[:16]
+
+
+def _action(value):
+    # JSON ne connaît que les listes : les directions redeviennent des tuples
+    return tuple(value) if isinstance(value, list) else value
+
+
+class Recorder:
+    """Partie en cours, enregistrée ; state est l'état à afficher.
+
+    dt : pas fixe de la vue (None pour un jeu au tour par tour : chaque
+    step() est alors un coup, noté avec son heure). settings : réglages de
+    la vue à remettre pour rejouer avec affichage (difficulté, mode...).
+    """
+
+    finished = False  # la partie s'arrête quand le joueur (ou l'état) le décide
+
+    def __init__(self, game, state_class, params, dt=None, settings=None, seed=None):
+        self.seed = new_seed() if seed is None else seed
+        self.header = {
+            "format": FORMAT,
+            "game": type(game).__name__,
+            "state": state_class.__name__,
+            "params": params,
+            "seed": self.seed,
+            "dt": dt,
+            "settings": settings or {},
+            "date": time.strftime('%Y-%m-%dT%H:%M:%S'),
+        }
+        self.state = state_class(rng=rng_stream(self.seed, state_class.__name__), **params)
+        self.dt = dt
+        self.inputs = []
+        self.ticks = 0
+        self.last = None
+
+    def step(self, action, dt):
+        if self.dt is None:
+            self.inputs.append([self.state.time + dt, action])
+        elif action != self.last or not self.inputs:
+            self.inputs.append([self.ticks, action])
+            self.last = action
+        self.ticks += 1
+        return self.state.step(action, dt)
+
+    def save(self, directory=REPLAY_DIR):
+        """Écrit le fichier de relecture en arrière-plan ; retourne la tâche (résultat : son chemin), None si désactivé."""
+        if not ENABLED or not self.ticks:
+            return None
+        stamp = time.strftime('%Y%m%d-%H%M%S')
+        path = os.path.join(directory, f"{self.header['game']}-{stamp}-{self.seed}.jsonl")
+        end = {"end": self.ticks, "time": self.state.time, "score": getattr(self.state, 'score', None),
+               "over": self.state.over, "digest": digest(self.state)}
+        # lignes figées ici : la partie suivante peut commencer pendant l'écriture
+        lines = [self.header, *self.inputs, end]
+        task = background(_write, path, lines)
+        _saving.add(task)
+        task.add_done_callback(_saving.discard)
+        return task
+
+
+def _write(path, lines):
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        for line in lines:
+            f.write(json.dumps(line, separators=(',', ':')) + '\n')
+    # seuls les plus récents sont gardés
+    for old in sorted(glob.glob(os.path.join(directory, '*.jsonl')), key=os.path.getmtime)[:-MAX_REPLAYS]:
+        os.remove(old)
+    return path
+
+
+def _finish():
+    concurrent.futures.wait(list(_saving), timeout=EXIT_WAIT)
+
+
+atexit.register(_finish)
+
+
+class Replay:
+    """Partie relue depuis un fichier : même interface que Recorder."""
+
+    def __init__(self, path):
+        with open(path, encoding='utf-8') as f:
+            lines = [json.loads(line) for line in f if line.strip()]
+        self.header, self.end = lines[0], lines[-1]
+        if self.header.get("format") != FORMAT:
+            raise ValueError(f"{path} : format de relecture inconnu")
+        self.inputs = [(stamp, _action(action)) for stamp, action in lines[1:-1]]
+        self.dt = self.header["dt"]
+        self.game_class = find_class(self.header["game"])
+        state_class = getattr(sys.modules[self.game_class.__module__], self.header["state"])
+        self.state = state_class(rng=rng_stream(self.header["seed"], state_class.__name__),
+                                 **self.header["params"])
+        self.ticks = 0
+        self.index = 0
+        self.action = None
+        self.last_stamp = 0.0
+
+    @property
+    def finished(self):
+        return self.ticks >= self.end["end"]
+
+    def step(self, action, dt):
+        """Avance d'un pas avec l'action enregistrée (action et dt de la vue ignorés)."""
+        if self.dt is None:
+            stamp, self.action = self.inputs[self.ticks]
+            dt, self.last_stamp = stamp - self.last_stamp, stamp
+        else:
+            while self.index < len(self.inputs) and self.inputs[self.index][0] <= self.ticks:
+                self.action = self.inputs[self.index][1]
+                self.index += 1
+            dt = self.dt
+        self.ticks += 1
+        return self.state.step(self.action, dt)
+
+    def run(self):
+        """Rejoue toute la partie sans affichage, au plus vite."""
+        while not self.finished:
+            self.step(None, None)
+        return self.state
+
+    def check(self):
+        """Vrai si la partie rejouée aboutit au même état que celle enregistrée."""
+        return digest(self.state) == self.end["digest"]
+
+
+def play(replay, speed=1.0):
+    """Rejoue la partie dans la fenêtre, à vitesse réelle, avec le dessin du jeu."""
+    pygame.init()
+    screen = get_display().open()
+    game = replay.game_class(screen)
+    for name, value in replay.header["settings"].items():
+        setattr(game, name, value)
+    game.new_match(replay)
+    if replay.dt is not None:
+        game.tick_rate = max(1, round(speed / replay.dt))  # au moins un pas par seconde
+        game.run_loop()
+    else:
+        # jeu au tour par tour : un coup enregistré après l'autre, au même rythme
+        game.presenter = Presenter(screen, replay.header["game"])
+        game.draw()
+        for stamp, _ in replay.inputs:
+            if not pause((stamp - replay.last_stamp) / speed, game.presenter):
+                break
+            replay.step(None, None)  # pas game.move() : la relecture ne touche pas aux records
+            game.draw()
+    pygame.quit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Relecture d'une partie enregistrée.")
+    parser.add_argument('path', help="fichier replays/*.jsonl")
+    parser.add_argument('--headless', action='store_true', help="sans fenêtre, au plus vite")
+    parser.add_argument('--speed', type=float, default=1.0, help="vitesse de relecture affichée (2 = deux fois plus vite)")
+    args = parser.parse_args()
+    if args.speed <= 0:
+        parser.error("--speed doit être positive")
+
+    replay = Replay(args.path)
+    start = time.perf_counter()
+    if args.headless:
+        replay.run()
+    else:
+        play(replay, args.speed)
+    elapsed = time.perf_counter() - start
+    state = replay.state
+    print(f"{replay.header['game']} graine {replay.header['seed']} : {replay.ticks} pas en {elapsed * 1000:.1f} ms "
+          f"({replay.ticks / max(elapsed, 1e-9):.0f} pas/s), {state.time:.1f} s de jeu")
+    if not replay.finished:
+        print("relecture interrompue")
+    elif replay.check():
+        print("identique à la partie enregistrée")
+    else:
+        print(f"DIFFÉRENT de la partie enregistrée (score {getattr(state, 'score', None)}, attendu {replay.end['score']})")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# -------------------------
+# mini_games/runtime.py
+# -------------------------
+# Attentes et calculs sans figer la fenêtre.
+# pygame.time.delay() endort tout le programme : pendant ce temps la
+# fenêtre n'est plus réaffichée (exposition) et la fermer ne fait rien.
+# pause() attend aussi sans consommer de CPU (dans event.wait), mais
+# réaffiche l'image si besoin et s'arrête dès que la fenêtre est fermée.
+# Les calculs longs (IA...) partent dans un thread avec background() ;
+# pause(..., until=tâche) attend en plus leur fin : un événement TASK_DONE
+# la réveille aussitôt. Les écritures de fichiers sont déjà différées
+# (thread d'écriture de scores.py).
+# Les événements reçus pendant l'attente (touches, clics) sont remis dans
+# la file, comme avec delay() : le jeu les traite ensuite.
+import concurrent.futures
+import math
+import threading
+import time
+
+import pygame
+
+from .display import get_display
+from .present import REDRAW_EVENTS
+
+POLL_MS = 100  # réveil de sécurité pendant l'attente d'une tâche
+TASK_DONE = pygame.event.custom_type()  # une tâche de background() est terminée
+
+
+def _notify(future):
+    # appelé dans le thread de la tâche : event.post est sûr entre threads
+    try:
+        pygame.event.post(pygame.event.Event(TASK_DONE))
+    except pygame.error:
+        pass  # pygame déjà arrêté
+
+
+def background(fn, *args):
+    """Lance fn(*args) dans un thread ; retourne un concurrent.futures.Future.
+
+    Thread démon (comme l'écriture des scores) : une tâche encore en cours
+    n'empêche pas de quitter le programme.
+    """
+    future = concurrent.futures.Future()
+
+    def work():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            result = fn(*args)
+        except BaseException as exc:
+            future.set_exception(exc)
+        else:
+            future.set_result(result)
+    future.add_done_callback(_notify)
+    threading.Thread(target=work, name="mini-jeux-task", daemon=True).start()
+    return future
+
+
+def _reshow(presenter):
+    if presenter is not None:
+        presenter.mark_all()
+        presenter.present()
+    else:
+        get_display().flip()
+
+
+def pause(seconds, presenter=None, until=None):
+    """Attend seconds, et la fin de la tâche until si précisée, fenêtre active.
+
+    L'image déjà présentée reste affichée (réaffichée par presenter, ou
+    en entier sans presenter). Retourne False si la fenêtre a été fermée.
+    """
+    deadline = time.monotonic() + seconds
+    kept = []
+    closed = False
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            if until is None or until.done():
+                break
+            wait = POLL_MS
+        else:
+            wait = max(1, math.ceil(remaining * 1000))
+        event = pygame.event.wait(wait)
+        if event.type == pygame.QUIT:
+            closed = True
+            break
+        if event.type in REDRAW_EVENTS:
+            _reshow(presenter)
+        elif event.type not in (pygame.NOEVENT, TASK_DONE):
+            kept.append(event)
+    for event in kept:
+        pygame.event.post(event)
+    return not closed
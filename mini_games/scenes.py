@@ -0,0 +1,52 @@
+# -------------------------
+# mini_games/scenes.py
+# -------------------------
+# Pile de scènes : le menu en bas, le jeu lancé au-dessus.
+# play() empile une scène et la fait tourner (run) ; quand elle rend la
+# main, elle est dépilée et la scène revenue au sommet est réaffichée
+# (resume). Les choix de difficulté et les écrans de fin restent des
+# écrans modaux du jeu (modal.py).
+# Chaque jeu n'est construit qu'une fois par session : l'instance reste
+# chaude avec ses caches (polices, atlas, grilles préparées...) et
+# relancer un jeu ne fait qu'appeler run() à nouveau. Chaque jeu remet
+# donc sa partie à zéro au début de run().
+from .display import get_display
+from .registry import load_game
+
+
+class SceneStack:
+    def __init__(self, screen):
+        self.screen = screen
+        self.scenes = []
+        self.games = {}  # libellé -> instance gardée entre deux parties
+
+    @property
+    def top(self):
+        return self.scenes[-1] if self.scenes else None
+
+    def push(self, scene):
+        self.scenes.append(scene)
+
+    def pop(self):
+        scene = self.scenes.pop()
+        # retour à la scène du dessous : fenêtre rendue, tout réaffiché
+        get_display().restore()
+        resume = getattr(self.top, 'resume', None)
+        if resume is not None:
+            resume()
+        return scene
+
+    def game(self, label):
+        """Instance du jeu label, construite au premier lancement seulement."""
+        game = self.games.get(label)
+        if game is None:
+            game = self.games[label] = load_game(label)(self.screen)
+        return game
+
+    def play(self, scene):
+        """Empile scene, la fait tourner, puis revient à la scène précédente."""
+        self.push(scene)
+        try:
+            scene.run()
+        finally:
+            self.pop()
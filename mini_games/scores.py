@@ -0,0 +1,248 @@
+# -------------------------
+# mini_games/scores.py
+# -------------------------
+# Stockage partagé des meilleurs scores.
+# best_scores.json est lu une seule fois par processus, toutes les lectures
+# se font en mémoire et les écritures sont regroupées par un thread
+# d'écriture en arrière-plan (fichier temporaire + rename atomique).
+# Aucun jeu ne touche donc au disque depuis sa boucle de jeu.
+# Chaque partie terminée est aussi ajoutée à l'historique (history.py)
+# par le même thread d'écriture.
+# Plusieurs copies du programme peuvent tourner en même temps : chaque
+# écriture relit le fichier sous verrou et fusionne clé par clé en gardant
+# le meilleur résultat (max pour les scores, min pour les temps/coups).
+import atexit
+import json
+import os
+import tempfile
+import threading
+import time
+
+from .filelock import file_lock
+from .history import DATA_DIR, HISTORY_FILE, ScoreJournal, history_key, keep_mode, make_record
+from .registry import score_rule
+
+SCORES_FILE = os.path.join(DATA_DIR, 'best_scores.json')
+# 'json' (défaut) ou 'sqlite' pour les bornes qui accumulent beaucoup de parties
+BACKEND = os.environ.get('MINI_JEUX_SCORES', 'json')
+FLUSH_DELAY = 0.5  # secondes d'attente pour regrouper les écritures rapprochées
+
+def lower_is_better(key):
+    """Vrai pour les clés où la plus petite valeur est la meilleure (temps, coups).
+
+    Le sens vient de GAME_INFO["scores"] du jeu (registry.score_rule) ;
+    clé inconnue : plus c'est haut, mieux c'est.
+    """
+    rule = score_rule(key)
+    return rule is not None and rule[1] == 'min'
+
+
+def runs_lower_is_better(game, difficulty=None):
+    """Sens du classement des parties d'un jeu (difficulty None : toutes les difficultés)."""
+    rule = score_rule(history_key(game, difficulty or '*')) or score_rule(game)
+    return rule is not None and rule[1] == 'min'
+
+
+def better(key, a, b):
+    """Retourne la meilleure des deux valeurs pour cette clé."""
+    if a is None:
+        return b
+    if b is None:
+        return a
+    if not (isinstance(a, (int, float)) and isinstance(b, (int, float))):
+        return b
+    return min(a, b) if lower_is_better(key) else max(a, b)
+
+
+def merge_scores(base, other):
+    """Fusion clé par clé de deux dictionnaires de meilleurs scores."""
+    merged = dict(base)
+    for key, value in other.items():
+        merged[key] = better(key, merged.get(key), value)
+    return merged
+
+
+class ScoreStore:
+    def __init__(self, path=SCORES_FILE, history_path=HISTORY_FILE):
+        self.path = os.path.abspath(path)
+        self.journal = ScoreJournal(history_path)
+        self._pending_runs = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # une seule écriture disque à la fois
+        self._seen = self._stamp()
+        self._scores = self._read()
+        self._dirty_keys = set()
+        self._wake = threading.Event()
+        self._writer = None
+
+    def _stamp(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def reload(self):
+        """Récupère les records écrits par les autres instances depuis la dernière lecture.
+
+        Un simple stat si le fichier n'a pas changé ; sinon relecture et
+        fusion (les records de cette instance ne sont jamais perdus).
+        Retourne True si le fichier a été relu.
+        """
+        stamp = self._stamp()
+        if stamp == self._seen:
+            return False
+        self._seen = stamp
+        self._absorb(self._read())
+        return True
+
+    def _read(self):
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except Exception:
+            return {}
+
+    # --- lecture (mémoire uniquement) ---
+    def get(self, key, default=None):
+        with self._lock:
+            return self._scores.get(key, default)
+
+    def __getitem__(self, key):
+        with self._lock:
+            return self._scores[key]
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._scores
+
+    def __len__(self):
+        with self._lock:
+            return len(self._scores)
+
+    def items(self):
+        return self.snapshot().items()
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._scores)
+
+    # --- écriture (différée) ---
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._scores[key] = value
+            self._dirty_keys.add(key)
+        self._schedule()
+
+    def update(self, values):
+        with self._lock:
+            self._scores.update(values)
+            self._dirty_keys.update(values)
+        self._schedule()
+
+    def record_run(self, game, difficulty, score, duration=None):
+        """Ajoute une partie terminée à l'historique (écriture différée)."""
+        with self._lock:
+            self._pending_runs.append(make_record(game, difficulty, score, duration))
+        self._schedule()
+
+    def history_bests(self):
+        """Résumé de l'historique par jeu/difficulté (lit le disque, hors boucle de jeu)."""
+        self.flush()
+        return self.journal.bests()
+
+    def top(self, game, difficulty=None, limit=20, offset=0, since=None):
+        """Classement des parties d'un jeu, meilleures d'abord (parcourt tout le journal JSONL)."""
+        self.flush()
+        runs = [r for r in self.journal.runs(game, difficulty)
+                if isinstance(r.get("score"), (int, float)) and (since is None or r.get("ts", 0) >= since)]
+        runs.sort(key=lambda r: r["score"], reverse=not runs_lower_is_better(game, difficulty))
+        return runs[offset:offset + limit]
+
+    def _schedule(self):
+        if self._writer is None or not self._writer.is_alive():
+            self._writer = threading.Thread(target=self._write_loop, name="score-writer", daemon=True)
+            self._writer.start()
+        self._wake.set()
+
+    def _write_loop(self):
+        while True:
+            self._wake.wait()
+            # laisse les mises à jour suivantes s'accumuler avant d'écrire
+            self._wake.clear()
+            time.sleep(FLUSH_DELAY)
+            self.flush()
+
+    def flush(self):
+        """Écrit immédiatement les scores en attente (appelé aussi à la sortie)."""
+        with self._flush_lock:
+            with self._lock:
+                changed, self._dirty_keys = self._dirty_keys, set()
+                data = dict(self._scores) if changed else None
+                runs, self._pending_runs = self._pending_runs, []
+            if data is not None:
+                try:
+                    self._write_scores(data, changed)
+                except Exception:
+                    with self._lock:
+                        self._dirty_keys |= changed
+            if runs:
+                try:
+                    self._write_runs(runs)
+                except Exception:
+                    with self._lock:
+                        self._pending_runs[:0] = runs
+
+    def _absorb(self, merged):
+        # récupère en mémoire les records écrits par les autres instances
+        with self._lock:
+            for key, value in merged.items():
+                self._scores[key] = better(key, self._scores.get(key), value)
+
+    # --- persistance (redéfinie par les autres backends) ---
+    def _write_scores(self, data, changed):
+        with file_lock(self.path):
+            merged = merge_scores(self._read(), data)
+            self._write_atomic(merged)
+        self._absorb(merged)
+
+    def _write_runs(self, runs):
+        with file_lock(self.journal.path):
+            self.journal.append(runs)
+            self.journal.maybe_compact()
+
+    def _write_atomic(self, data):
+        directory = os.path.dirname(self.path)
+        fd, tmp = tempfile.mkstemp(prefix='.best_scores.', suffix='.tmp', dir=directory)
+        try:
+            keep_mode(fd, self.path)
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+        except Exception:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Retourne le ScoreStore unique du processus (créé au premier appel)."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            if BACKEND == 'sqlite':
+                from .scores_sqlite import SQLiteScoreStore
+                _store = SQLiteScoreStore()
+            else:
+                _store = ScoreStore()
+            atexit.register(_store.flush)
+        return _store
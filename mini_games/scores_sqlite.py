@@ -0,0 +1,160 @@
+# -------------------------
+# mini_games/scores_sqlite.py
+# -------------------------
+# Backend SQLite optionnel pour les scores (MINI_JEUX_SCORES=sqlite).
+# Même interface que ScoreStore (get / []= / record_run...), mais les
+# parties sont stockées dans une table indexée sur (game, difficulty, score)
+# pour répondre aux classements ("top 20 Sudoku_Difficile cette semaine")
+# sans charger tout l'historique.
+# À la première ouverture, best_scores.json et score_history.jsonl sont
+# importés dans la base (voir migrate_json).
+import json
+import os
+import sqlite3
+import threading
+
+from .history import DATA_DIR, HISTORY_FILE, ScoreJournal, history_key
+from .scores import SCORES_FILE, ScoreStore, better, runs_lower_is_better
+
+SCORES_DB = os.path.join(DATA_DIR, 'best_scores.sqlite3')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS bests (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    game TEXT NOT NULL,
+    difficulty TEXT NOT NULL DEFAULT '',
+    score REAL NOT NULL,
+    duration REAL,
+    ts REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_game_difficulty_score ON runs (game, difficulty, score);
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def _run_row(r):
+    return (r.get("game"), r.get("difficulty") or '', r.get("score"), r.get("duration"), r.get("ts", 0))
+
+
+def migrate_json(conn, json_path=SCORES_FILE, history_path=HISTORY_FILE):
+    """Importe best_scores.json et l'historique JSONL dans la base.
+    Ne s'exécute qu'une fois par base, même si plusieurs instances démarrent
+    ensemble ; retourne (nb de meilleurs scores, nb de parties)."""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        if conn.execute("SELECT 1 FROM meta WHERE name = 'json_migrated'").fetchone():
+            conn.rollback()
+            return 0, 0
+        try:
+            with open(json_path, 'r') as f:
+                bests = json.load(f)
+            if not isinstance(bests, dict):
+                bests = {}
+        except Exception:
+            bests = {}
+        runs = [_run_row(r) for r in ScoreJournal(history_path).runs()
+                if isinstance(r.get("score"), (int, float))]
+        conn.executemany("INSERT OR REPLACE INTO bests (key, value) VALUES (?, ?)",
+                         [(k, json.dumps(v)) for k, v in bests.items()])
+        conn.executemany("INSERT INTO runs (game, difficulty, score, duration, ts) VALUES (?, ?, ?, ?, ?)", runs)
+        conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('json_migrated', ?)",
+                     (os.path.abspath(json_path),))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return len(bests), len(runs)
+
+
+class SQLiteScoreStore(ScoreStore):
+    def __init__(self, path=SCORES_DB, json_path=SCORES_FILE, history_path=HISTORY_FILE):
+        # une seule connexion, partagée entre le thread d'écriture et les requêtes
+        self._db_lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.abspath(path), check_same_thread=False)
+        with self._db_lock:
+            self._conn.executescript(SCHEMA)
+            migrate_json(self._conn, json_path, history_path)
+        super().__init__(path, history_path)
+
+    def _read(self):
+        with self._db_lock:
+            rows = self._conn.execute("SELECT key, value FROM bests").fetchall()
+        return {k: json.loads(v) for k, v in rows}
+
+    def _write_scores(self, data, changed):
+        # BEGIN IMMEDIATE : lecture + fusion + écriture atomiques vis-à-vis
+        # des autres instances qui partagent la même base
+        merged = {}
+        with self._db_lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for key in changed:
+                    if key not in data:
+                        continue
+                    row = self._conn.execute("SELECT value FROM bests WHERE key = ?", (key,)).fetchone()
+                    merged[key] = better(key, json.loads(row[0]) if row else None, data[key])
+                self._conn.executemany("INSERT OR REPLACE INTO bests (key, value) VALUES (?, ?)",
+                                       [(k, json.dumps(v)) for k, v in merged.items()])
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+        self._absorb(merged)
+
+    def _write_runs(self, runs):
+        rows = [_run_row(r) for r in runs if isinstance(r.get("score"), (int, float))]
+        with self._db_lock, self._conn:
+            self._conn.executemany("INSERT INTO runs (game, difficulty, score, duration, ts) VALUES (?, ?, ?, ?, ?)", rows)
+
+    # --- requêtes pour l'écran des meilleurs scores ---
+    @staticmethod
+    def _where(game, difficulty, since):
+        clauses = ["game = ?"]
+        params = [game]
+        if difficulty is not None:
+            clauses.append("difficulty = ?")
+            params.append(difficulty)
+        if since is not None:
+            clauses.append("ts >= ?")
+            params.append(since)
+        return " AND ".join(clauses), params
+
+    def top(self, game, difficulty=None, limit=20, offset=0, since=None):
+        """Classement trié par score (sens du jeu), paginé avec limit/offset."""
+        self.flush()
+        where, params = self._where(game, difficulty, since)
+        order = "ASC" if runs_lower_is_better(game, difficulty) else "DESC"
+        sql = (f"SELECT game, difficulty, score, duration, ts FROM runs WHERE {where} "
+               f"ORDER BY score {order}, ts ASC LIMIT ? OFFSET ?")
+        with self._db_lock:
+            rows = self._conn.execute(sql, params + [limit, offset]).fetchall()
+        return [{"game": g, "difficulty": d, "score": s, "duration": du, "ts": ts} for g, d, s, du, ts in rows]
+
+    def history_bests(self):
+        self.flush()
+        with self._db_lock:
+            rows = self._conn.execute(
+                "SELECT game, difficulty, COUNT(*), MAX(score), MIN(score), MAX(ts) "
+                "FROM runs GROUP BY game, difficulty").fetchall()
+        bests = {}
+        for game, difficulty, runs, hi, lo, last in rows:
+            bests[history_key(game, difficulty)] = {
+                "game": game, "difficulty": difficulty or None, "runs": runs,
+                "max": hi, "min": lo, "last": last,
+            }
+        return bests
+
+
+if __name__ == '__main__':
+    # python -m mini_games.scores_sqlite : importe les fichiers JSON existants
+    conn = sqlite3.connect(os.path.abspath(SCORES_DB))
+    conn.executescript(SCHEMA)
+    n_bests, n_runs = migrate_json(conn)
+    print(f"{n_bests} meilleurs scores et {n_runs} parties importés dans {os.path.abspath(SCORES_DB)}")
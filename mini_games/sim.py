@@ -0,0 +1,43 @@
+# -------------------------
+# mini_games/sim.py
+# -------------------------
+# Règles des jeux sans fenêtre.
+# Snake, Flappy, Casse-briques, Pong et 2048 gardent leurs règles dans un
+# objet d'état (SnakeState, FlappyState...) défini à côté du jeu : il ne
+# dessine rien, ne lit ni le clavier ni l'horloge et ne joue aucun son.
+# step(action, dt) avance la partie de dt secondes avec l'action du joueur
+# (sens de la raquette, battement d'ailes, direction...) ; state.time est
+# l'horloge de la partie, avancée uniquement par step(). Le jeu affiché
+# n'est qu'une vue : il traduit le clavier en action, passe le temps écoulé
+# et dessine l'état. Sans vue, on enchaîne les pas aussi vite que possible
+# (benchmarks/suite.py, section « sim »).
+# Ce que la vue doit faire entendre ou redessiner (rebond, brique cassée...)
+# est retourné par step() : liste de (nom, détail).
+# Les collisions utilisent pygame.Rect, qui ne demande ni fenêtre ni
+# pygame.init(). Le hasard vient de self.rng (un random.Random par partie,
+# graine fixée par replay.py) et jamais du module random partagé.
+import random
+
+
+class GameState:
+    """Base des états : redéfinir advance(action, dt)."""
+
+    def __init__(self, rng=None):
+        self.rng = rng if rng is not None else random.Random()
+        self.time = 0.0  # temps simulé depuis le début de la partie (s)
+        self.over = False
+        self.events = []
+
+    def emit(self, name, detail=None):
+        self.events.append((name, detail))
+
+    def advance(self, action, dt):
+        """Applique les règles sur un pas ; self.time est déjà avancé de dt."""
+
+    def step(self, action, dt):
+        """Avance la partie de dt secondes ; retourne les événements du pas."""
+        if not self.over:
+            self.time += dt
+            self.advance(action, dt)
+        events, self.events = self.events, []
+        return events
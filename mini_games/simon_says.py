@@ -1,8 +1,15 @@
 import pygame
 import random
 import time
-import json
-import os
+
+from .audio import play_sound, tone
+from .fonts import get_font
+from .modal import pick, wait_key
+from .present import Presenter
+from .runtime import pause
+from .scores import get_store
+
+GAME_INFO = {"name": "Simon Says", "class": "SimonSaysGame", "scores": {"SimonSays_*": "max"}, "order": 90}
 
 # Simon Says
 BG = (20, 20, 40)
@@ -18,11 +25,13 @@ HIGHLIGHT_COLORS = [
     (100, 100, 255),
     (255, 255, 150),
 ]
+# Note de chaque bouton (Hz), dans l'ordre de BUTTON_COLORS, comme le Simon d'origine
+BUTTON_TONES = [310, 415, 209, 252]
+TONE_SECONDS = 0.35
+ERROR_TONE = (42, 0.8)  # son grave de fin de partie
 TEXT_COLOR = (240, 240, 240)
 FONT_SIZE = 32
 
-SCORES_FILE = os.path.join(os.path.dirname(__file__), '..', 'best_scores.json')
-
 DIFFICULTIES = {
     '1': ('Facile', 0.8),   # délai entre flashs
     '2': ('Moyen', 0.5),
@@ -34,14 +43,17 @@ class SimonSaysGame:
     def __init__(self, screen):
         self.screen = screen
         self.width, self.height = screen.get_size()
-        self.font = pygame.font.Font(None, FONT_SIZE)
+        self.font = get_font(FONT_SIZE)
         self.sequence = []
         self.user_input = []
         self.flash_delay = 0.7
         self.difficulty_name = ''
-        self.best_scores = self.load_scores()
+        self.best_scores = get_store()
         self.round = 0
         self.input_timeout = 5  # secondes sans appui = game over
+        # sons synthétisés une fois pour la session (audio.py)
+        self.tones = [tone(f"simon_{i}", freq, TONE_SECONDS) for i, freq in enumerate(BUTTON_TONES)]
+        tone('simon_error', *ERROR_TONE, wave='square')
 
         # Zones 2x2
         w2 = self.width // 2
@@ -53,62 +65,42 @@ class SimonSaysGame:
             pygame.Rect(w2, h2, w2, h2),
         ]
 
-    def load_scores(self):
-        try:
-            with open(SCORES_FILE, 'r') as f:
-                return json.load(f)
-        except Exception:
-            return {}
-
-    def save_scores(self):
-        try:
-            with open(SCORES_FILE, 'w') as f:
-                json.dump(self.best_scores, f)
-        except Exception:
-            pass
+    def draw_difficulty_menu(self):
+        self.screen.fill(BG)
+        title = self.font.render("Simon Says : Choisis la difficulté", True, TEXT_COLOR)
+        self.screen.blit(title, title.get_rect(center=(self.width // 2, 60)))
+        for key, (name, delay) in DIFFICULTIES.items():
+            txt = self.font.render(f"{key}. {name} (vitesse: {1/delay:.1f})", True, TEXT_COLOR)
+            self.screen.blit(txt, (80, 160 + int(key) * 50))
+        info = self.font.render("1/2/3 pour choisir, Q pour quitter", True, TEXT_COLOR)
+        self.screen.blit(info, (80, self.height - 60))
 
     def choose_difficulty(self):
-        choosing = True
-        while choosing:
-            self.screen.fill(BG)
-            title = self.font.render("Simon Says : Choisis la difficulté", True, TEXT_COLOR)
-            self.screen.blit(title, title.get_rect(center=(self.width // 2, 60)))
-            for key, (name, delay) in DIFFICULTIES.items():
-                txt = self.font.render(f"{key}. {name} (vitesse: {1/delay:.1f})", True, TEXT_COLOR)
-                self.screen.blit(txt, (80, 160 + int(key) * 50))
-            info = self.font.render("1/2/3 pour choisir, Q pour quitter", True, TEXT_COLOR)
-            self.screen.blit(info, (80, self.height - 60))
-            pygame.display.flip()
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    return False
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_q:
-                        return False
-                    if event.unicode in DIFFICULTIES:
-                        self.difficulty_name, self.flash_delay = DIFFICULTIES[event.unicode]
-                        return True
-        return False
+        choice = pick(self.draw_difficulty_menu, DIFFICULTIES)
+        if choice is None:
+            return False
+        self.difficulty_name, self.flash_delay = DIFFICULTIES[choice]
+        return True
 
     def flash_sequence(self):
+        """Montre la séquence ; retourne False si la fenêtre est fermée."""
         for idx in self.sequence:
             # Highlight button
-            start = time.time()
-            while time.time() - start < self.flash_delay:
-                self.screen.fill(BG)
-                self.draw_buttons(highlight=idx)
-                self.draw_status(f"Round {self.round} - Observe", show_best=True)
-                pygame.display.flip()
-                pygame.event.pump()
+            self.screen.fill(BG)
+            self.draw_buttons(highlight=idx)
+            self.draw_status(f"Round {self.round} - Observe", show_best=True)
+            self.presenter.present()
+            play_sound(self.tones[idx])
+            if not pause(self.flash_delay, self.presenter):
+                return False
             # gap
-            gap_start = time.time()
-            while time.time() - gap_start < 0.2:
-                self.screen.fill(BG)
-                self.draw_buttons()
-                self.draw_status(f"Round {self.round} - Observe", show_best=True)
-                pygame.display.flip()
-                pygame.event.pump()
+            self.screen.fill(BG)
+            self.draw_buttons()
+            self.draw_status(f"Round {self.round} - Observe", show_best=True)
+            self.presenter.present()
+            if not pause(0.2, self.presenter):
+                return False
+        return True
 
     def draw_buttons(self, highlight=None, press_idx=None):
         for i, rect in enumerate(self.button_rects):
@@ -120,35 +112,40 @@ class SimonSaysGame:
                 color = HIGHLIGHT_COLORS[i]
             pygame.draw.rect(self.screen, color, rect)
             # border
-            pygame.draw.rect(self.screen, (30, 30, 30), rect, 4)
+            self.presenter.sprite(('button', i), pygame.draw.rect(self.screen, (30, 30, 30), rect, 4), color)
 
     def draw_status(self, msg, show_best=False):
+        # tout est signalé : l'écran « Bien joué » n'affiche pas ces lignes
+        present = self.presenter
         info = self.font.render(msg, True, TEXT_COLOR)
-        self.screen.blit(info, (10, self.height - 100))
+        present.sprite('status', self.screen.blit(info, (10, self.height - 100)), msg)
         diff = self.font.render(f"Difficulté: {self.difficulty_name}", True, TEXT_COLOR)
-        self.screen.blit(diff, (10, self.height - 70))
+        present.sprite('difficulty', self.screen.blit(diff, (10, self.height - 70)))
         round_txt = self.font.render(f"Round: {self.round}", True, TEXT_COLOR)
-        self.screen.blit(round_txt, (10, self.height - 40))
+        present.sprite('round', self.screen.blit(round_txt, (10, self.height - 40)), self.round)
         if show_best:
             key = f"SimonSays_{self.difficulty_name}"
             best = self.best_scores.get(key, 0)
             best_txt = self.font.render(f"Meilleur round: {best}", True, TEXT_COLOR)
-            self.screen.blit(best_txt, (self.width - 300, 10))
+            present.sprite('best', self.screen.blit(best_txt, (self.width - 300, 10)), best)
 
     def run(self):
         if not self.choose_difficulty():
             return
         pygame.display.set_caption("Simon Says")
         clock = pygame.time.Clock()
+        self.presenter = Presenter(self.screen, "SimonSaysGame")
         playing = True
         self.sequence = []
         self.round = 0
+        game_start = time.time()
 
         while playing:
             self.round += 1
             self.sequence.append(random.randrange(0, 4))
             # montrer la séquence
-            self.flash_sequence()
+            if not self.flash_sequence():
+                break  # fenêtre fermée
             self.user_input = []
             input_start_time = time.time()
             correct = True
@@ -157,11 +154,12 @@ class SimonSaysGame:
                 self.screen.fill(BG)
                 self.draw_buttons()
                 self.draw_status("Reproduis la séquence", show_best=True)
-                pygame.display.flip()
+                self.presenter.present()
 
                 event = None
                 for e in pygame.event.get():
                     event = e
+                    self.presenter.notice(e)
                     if e.type == pygame.QUIT:
                         playing = False
                         correct = False
@@ -176,8 +174,12 @@ class SimonSaysGame:
                                 self.screen.fill(BG)
                                 self.draw_buttons(press_idx=i)
                                 self.draw_status("Reproduis la séquence", show_best=True)
-                                pygame.display.flip()
-                                pygame.time.delay(150)
+                                self.presenter.present()
+                                play_sound(self.tones[i])
+                                if not pause(0.15, self.presenter):
+                                    playing = False
+                                    correct = False
+                                    break
                                 self.user_input.append(i)
                                 if self.user_input[-1] != self.sequence[len(self.user_input) - 1]:
                                     correct = False
@@ -189,12 +191,13 @@ class SimonSaysGame:
 
             if not correct:
                 # game over
+                play_sound('simon_error')
                 key = f"SimonSays_{self.difficulty_name}"
                 prev = self.best_scores.get(key, 0)
                 achieved = self.round - 1
                 if achieved > prev:
                     self.best_scores[key] = achieved
-                    self.save_scores()
+                self.best_scores.record_run("SimonSays", self.difficulty_name, achieved, time.time() - game_start)
                 # écran fin
                 self.screen.fill(BG)
                 over_txt = self.font.render(f"Game Over! Round atteint: {achieved}", True, TEXT_COLOR)
@@ -203,21 +206,16 @@ class SimonSaysGame:
                 self.screen.blit(over_txt, over_txt.get_rect(center=(self.width // 2, self.height // 2 - 30)))
                 self.screen.blit(best_txt, best_txt.get_rect(center=(self.width // 2, self.height // 2 + 10)))
                 self.screen.blit(prompt, prompt.get_rect(center=(self.width // 2, self.height // 2 + 50)))
-                pygame.display.flip()
-                waiting = True
-                while waiting:
-                    for e in pygame.event.get():
-                        if e.type == pygame.QUIT:
-                            waiting = False
-                        elif e.type == pygame.KEYDOWN and e.key == pygame.K_RETURN:
-                            waiting = False
+                wait_key()
                 break
             else:
                 # succès de round, petit retour visuel
                 self.screen.fill(BG)
                 self.draw_buttons()
                 success_txt = self.font.render("Bien joué !", True, TEXT_COLOR)
-                self.screen.blit(success_txt, success_txt.get_rect(center=(self.width // 2, self.height // 2)))
-                pygame.display.flip()
-                pygame.time.delay(600)
+                success_rect = success_txt.get_rect(center=(self.width // 2, self.height // 2))
+                self.presenter.sprite('success', self.screen.blit(success_txt, success_rect))
+                self.presenter.present()
+                if not pause(0.6, self.presenter):
+                    break  # fenêtre fermée
         # fin de la partie
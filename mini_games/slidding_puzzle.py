@@ -1,8 +1,15 @@
 import pygame
 import random
 import time
-import json
-import os
+
+from .display import get_display
+from .fonts import get_font
+from .loop import FrameGovernor
+from .modal import pick, wait_key
+from .present import Presenter
+from .scores import get_store
+
+GAME_INFO = {"name": "Taquin", "class": "SlidingPuzzleGame", "scores": {"SlidingPuzzle_*": "min"}, "order": 70}
 
 # Sliding Puzzle (Taquin)
 BG = (25, 25, 60)
@@ -13,8 +20,6 @@ BORDER_COLOR = (200, 200, 200)
 FONT_SIZE = 28
 PADDING = 10
 
-SCORES_FILE = os.path.join(os.path.dirname(__file__), '..', 'best_scores.json')
-
 DIFFICULTIES = {
     '1': ('Facile', 3),   # 3x3
     '2': ('Moyen', 4),    # 4x4
@@ -26,7 +31,7 @@ class SlidingPuzzleGame:
     def __init__(self, screen):
         self.screen = screen
         self.width, self.height = screen.get_size()
-        self.font = pygame.font.Font(None, FONT_SIZE)
+        self.font = get_font(FONT_SIZE)
         self.size = 4  # default
         self.board = []
         self.empty = None  # index of empty tile
@@ -34,46 +39,34 @@ class SlidingPuzzleGame:
         self.margin_top = 120
         self.start_time = 0
         self.moves = 0
-        self.best_scores = self.load_scores()
+        self.best_scores = get_store()
         self.difficulty_name = ''
 
-    def load_scores(self):
-        try:
-            with open(SCORES_FILE, 'r') as f:
-                return json.load(f)
-        except Exception:
-            return {}
-
-    def save_scores(self):
-        try:
-            with open(SCORES_FILE, 'w') as f:
-                json.dump(self.best_scores, f)
-        except Exception:
-            pass
+    def draw_difficulty_menu(self):
+        self.screen.fill(BG)
+        title = self.font.render("Taquin : Choisis la difficulté", True, TEXT_COLOR)
+        self.screen.blit(title, title.get_rect(center=(self.width // 2, 60)))
+        for key, (name, sz) in DIFFICULTIES.items():
+            txt = self.font.render(f"{key}. {name} ({sz}x{sz})", True, TEXT_COLOR)
+            self.screen.blit(txt, (80, 160 + int(key) * 50))
+        info = self.font.render("1/2/3 pour choisir, Q pour quitter", True, TEXT_COLOR)
+        self.screen.blit(info, (80, self.height - 60))
 
     def choose_difficulty(self):
-        choosing = True
-        while choosing:
-            self.screen.fill(BG)
-            title = self.font.render("Taquin : Choisis la difficulté", True, TEXT_COLOR)
-            self.screen.blit(title, title.get_rect(center=(self.width // 2, 60)))
-            for key, (name, sz) in DIFFICULTIES.items():
-                txt = self.font.render(f"{key}. {name} ({sz}x{sz})", True, TEXT_COLOR)
-                self.screen.blit(txt, (80, 160 + int(key) * 50))
-            info = self.font.render("1/2/3 pour choisir, Q pour quitter", True, TEXT_COLOR)
-            self.screen.blit(info, (80, self.height - 60))
-            pygame.display.flip()
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    return False
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_q:
-                        return False
-                    if event.unicode in DIFFICULTIES:
-                        self.difficulty_name, self.size = DIFFICULTIES[event.unicode]
-                        return True
-        return False
+        choice = pick(self.draw_difficulty_menu, DIFFICULTIES)
+        if choice is None:
+            return False
+        self.difficulty_name, self.size = DIFFICULTIES[choice]
+        return True
+
+    def board_layout(self):
+        """(taille des tuiles, x, y du plateau), calculé une fois par taille et résolution."""
+        size, top = self.size, self.margin_top
+
+        def compute(width, height):
+            tile_size = (min(width, height - top) - 2 * PADDING) // size
+            return tile_size, (width - tile_size * size) // 2, top
+        return get_display().layout(("SlidingPuzzleGame", size), (self.width, self.height), compute)
 
     def index_to_pos(self, idx):
         row = idx // self.size
@@ -119,27 +112,24 @@ class SlidingPuzzleGame:
         title = self.font.render(f"Taquin {self.difficulty_name} ({self.size}x{self.size})", True, TEXT_COLOR)
         self.screen.blit(title, (20, 10))
         elapsed = int(time.time() - self.start_time)
-        timer_txt = self.font.render(f"Temps: {elapsed}s", True, TEXT_COLOR)
-        moves_txt = self.font.render(f"Mouvements: {self.moves}", True, TEXT_COLOR)
         best_time_key = f"SlidingPuzzle_{self.size}x{self.size}_time"
         best_moves_key = f"SlidingPuzzle_{self.size}x{self.size}_moves"
         best_time = self.best_scores.get(best_time_key)
         best_moves = self.best_scores.get(best_moves_key)
         best_txt = self.font.render(f"Meilleur temps: {best_time if best_time else '-'}s  /  meilleurs coups: {best_moves if best_moves else '-'}", True, TEXT_COLOR)
-        self.screen.blit(timer_txt, (20, 50))
-        self.screen.blit(moves_txt, (20, 80))
+        counters = self.font.glyphs(TEXT_COLOR, BG)
+        present = self.presenter
+        present.sprite('timer', counters.draw(self.screen, f"Temps: {elapsed}s", (20, 50)), elapsed)
+        present.sprite('moves', counters.draw(self.screen, f"Mouvements: {self.moves}", (20, 80)), self.moves)
         self.screen.blit(best_txt, (20, 110))
         # Compute tile layout
-        board_area = min(self.width, self.height - self.margin_top) - 2 * PADDING
-        self.tile_size = board_area // self.size
-        offset_x = (self.width - (self.tile_size * self.size)) // 2
-        offset_y = self.margin_top
+        self.tile_size, offset_x, offset_y = self.board_layout()
         # Draw tiles
         for idx, val in enumerate(self.board):
             row, col = self.index_to_pos(idx)
             x = offset_x + col * self.tile_size
             y = offset_y + row * self.tile_size
-            rect = pygame.Rect(x + 2, y + 2, self.tile_size - 4, self.tile_size - 4)
+            rect = present.sprite(idx, (x + 2, y + 2, self.tile_size - 4, self.tile_size - 4), val)
             if val == 0:
                 pygame.draw.rect(self.screen, EMPTY_COLOR, rect)
             else:
@@ -147,7 +137,7 @@ class SlidingPuzzleGame:
                 pygame.draw.rect(self.screen, BORDER_COLOR, rect, 2)
                 num_txt = self.font.render(str(val), True, TEXT_COLOR)
                 self.screen.blit(num_txt, num_txt.get_rect(center=rect.center))
-        pygame.display.flip()
+        present.present()
 
     def swap_with_empty(self, idx):
         if idx in self.valid_moves():
@@ -162,11 +152,15 @@ class SlidingPuzzleGame:
         self.start_time = time.time()
         self.moves = 0
         running = True
-        clock = pygame.time.Clock()
+        governor = FrameGovernor()
+        governor.tick_every_second(self.start_time)
+        self.presenter = Presenter(self.screen, "SlidingPuzzleGame")
 
         while running:
-            self.draw()
-            for event in pygame.event.get():
+            if governor.frame():
+                self.draw()
+            for event in governor.events():
+                self.presenter.notice(event)
                 if event.type == pygame.QUIT:
                     running = False
                 elif event.type == pygame.KEYDOWN:
@@ -197,10 +191,7 @@ class SlidingPuzzleGame:
                 elif event.type == pygame.MOUSEBUTTONDOWN:
                     mx, my = pygame.mouse.get_pos()
                     # compute clicked tile
-                    board_area = min(self.width, self.height - self.margin_top) - 2 * PADDING
-                    self.tile_size = board_area // self.size
-                    offset_x = (self.width - (self.tile_size * self.size)) // 2
-                    offset_y = self.margin_top
+                    self.tile_size, offset_x, offset_y = self.board_layout()
                     if offset_y <= my <= offset_y + self.tile_size * self.size:
                         col = (mx - offset_x) // self.tile_size
                         row = (my - offset_y) // self.tile_size
@@ -216,15 +207,11 @@ class SlidingPuzzleGame:
                 moves_key = f"SlidingPuzzle_{size_key}_moves"
                 prev_time = self.best_scores.get(time_key)
                 prev_moves = self.best_scores.get(moves_key)
-                updated = False
                 if (prev_time is None) or (elapsed < prev_time):
                     self.best_scores[time_key] = int(elapsed)
-                    updated = True
                 if (prev_moves is None) or (self.moves < prev_moves):
                     self.best_scores[moves_key] = self.moves
-                    updated = True
-                if updated:
-                    self.save_scores()
+                self.best_scores.record_run("SlidingPuzzle", size_key, self.moves, elapsed)
                 # Victoire écran
                 self.screen.fill(BG)
                 win_txt = self.font.render("Bravo! Puzzle résolu.", True, TEXT_COLOR)
@@ -233,14 +220,5 @@ class SlidingPuzzleGame:
                 self.screen.blit(win_txt, win_txt.get_rect(center=(self.width // 2, self.height // 2 - 30)))
                 self.screen.blit(stats_txt, stats_txt.get_rect(center=(self.width // 2, self.height // 2 + 10)))
                 self.screen.blit(prompt, prompt.get_rect(center=(self.width // 2, self.height // 2 + 60)))
-                pygame.display.flip()
-                waiting = True
-                while waiting:
-                    for e in pygame.event.get():
-                        if e.type == pygame.QUIT:
-                            waiting = False
-                            running = False
-                        elif e.type == pygame.KEYDOWN and e.key == pygame.K_RETURN:
-                            waiting = False
-                            running = False
-            clock.tick(60)
+                wait_key()
+                running = False
@@ -2,9 +2,22 @@
 import pygame
 import random
 import time
-import json
-import os
 import copy
+import threading
+
+from .display import get_display
+from .fonts import get_font
+from .layers import Compositor
+from .loop import FrameGovernor
+from .metrics import get_counter
+from .modal import pick
+from .present import Presenter
+from .runtime import background, pause
+from .scores import get_store
+
+GAME_INFO = {"name": "Sudoku", "class": "SudokuGame", "scores": {"Sudoku_*": "min"}, "order": 130}
+
+SOLVER_NODES = get_counter("sudoku.solver_nodes")
 
 # Sudoku avec trois niveaux de difficulté et meilleur temps
 BG = (25, 25, 60)
@@ -16,8 +29,6 @@ HIGHLIGHT_COLOR = (80, 80, 140)
 TEXT_COLOR = (240, 240, 240)
 FONT_SIZE = 28
 
-SCORES_FILE = os.path.join(os.path.dirname(__file__), '..', 'best_scores.json')
-
 DIFFICULTIES = {
     '1': ('Facile', 40),   # nombre de cases données
     '2': ('Moyen', 32),
@@ -25,11 +36,18 @@ DIFFICULTIES = {
 }
 
 
+def grid_geometry(width, height):
+    """Coin haut-gauche de la grille et taille d'une case."""
+    grid_origin = (50, 100)
+    cell_size = min((width - 100) // 9, (height - 180) // 9)
+    return grid_origin, cell_size
+
+
 class SudokuGame:
     def __init__(self, screen):
         self.screen = screen
         self.width, self.height = screen.get_size()
-        self.font = pygame.font.Font(None, FONT_SIZE)
+        self.font = get_font(FONT_SIZE)
         self.difficulty_name = ''
         self.givens = [[0] * 9 for _ in range(9)]
         self.grid = [[0] * 9 for _ in range(9)]  # joueur
@@ -37,21 +55,8 @@ class SudokuGame:
         self.selected = (0, 0)
         self.start_time = 0
         self.finished = False
-        self.best_scores = self.load_scores()
-
-    def load_scores(self):
-        try:
-            with open(SCORES_FILE, 'r') as f:
-                return json.load(f)
-        except Exception:
-            return {}
-
-    def save_scores(self):
-        try:
-            with open(SCORES_FILE, 'w') as f:
-                json.dump(self.best_scores, f)
-        except Exception:
-            pass
+        self.best_scores = get_store()
+        self.prepared = {}  # choix de difficulté -> (tâche, annulation) de la grille suivante
 
     # Génération solution complète par backtracking
     def fill_full(self, board=None):
@@ -87,7 +92,10 @@ class SudokuGame:
         return True
 
     # compte solutions (limite à 2)
-    def count_solutions(self, board, limit=2):
+    def count_solutions(self, board, limit=2, nodes=None):
+        # nodes : liste [n] propre à l'appelant, comptant les grilles examinées
+        if nodes is not None:
+            nodes[0] += 1
         # cherche vide
         for i in range(9):
             for j in range(9):
@@ -96,7 +104,7 @@ class SudokuGame:
                     for n in range(1, 10):
                         if self.is_safe(board, i, j, n):
                             board[i][j] = n
-                            cnt = self.count_solutions(board, limit)
+                            cnt = self.count_solutions(board, limit, nodes)
                             if cnt:
                                 count += cnt
                             board[i][j] = 0
@@ -106,98 +114,138 @@ class SudokuGame:
         # complet
         return 1
 
-    def dig_holes(self, clues):
-        # partir de la solution self.solution et retirer jusqu'à avoir "clues" donnés
-        board = copy.deepcopy(self.solution)
+    def dig_holes(self, solution, clues, cancel=None):
+        # partir de la solution et retirer jusqu'à avoir "clues" donnés
+        board = copy.deepcopy(solution)
         cells = [(r, c) for r in range(9) for c in range(9)]
         random.shuffle(cells)
         to_remove = 81 - clues
+        nodes = [0]
         for (r, c) in cells:
-            if to_remove <= 0:
+            if to_remove <= 0 or (cancel is not None and cancel.is_set()):
                 break
             backup = board[r][c]
             board[r][c] = 0
             board_copy = copy.deepcopy(board)
             # vérifier unicité
-            if self.count_solutions(board_copy, limit=2) == 1:
+            if self.count_solutions(board_copy, 2, nodes) == 1:
                 to_remove -= 1
             else:
                 board[r][c] = backup  # remettre
-        self.givens = board
-        self.grid = copy.deepcopy(board)
+        SOLVER_NODES.inc(nodes[0])
+        return board
 
-    def choose_difficulty(self):
-        choosing = True
-        while choosing:
-            self.screen.fill(BG)
-            title = self.font.render("Sudoku : Choisis la difficulté", True, TEXT_COLOR)
-            self.screen.blit(title, title.get_rect(center=(self.width // 2, 60)))
-            for key, (name, clues) in DIFFICULTIES.items():
-                desc = f"{key}. {name} ({clues} indices donnés)"
-                txt = self.font.render(desc, True, TEXT_COLOR)
-                self.screen.blit(txt, (80, 150 + int(key) * 50))
-            info = self.font.render("1/2/3 pour choisir, R: refaire, Q pour quitter", True, TEXT_COLOR)
-            self.screen.blit(info, (40, self.height - 60))
-            pygame.display.flip()
-            for e in pygame.event.get():
-                if e.type == pygame.QUIT:
-                    return False
-                elif e.type == pygame.KEYDOWN:
-                    if e.key == pygame.K_q:
-                        return False
-                    if e.unicode in DIFFICULTIES:
-                        self.difficulty_name, clues = DIFFICULTIES[e.unicode]
-                        # générer grille
-                        full = [[0] * 9 for _ in range(9)]
-                        self.fill_full(full)
-                        self.solution = full
-                        self.dig_holes(clues)
-                        self.start_time = time.time()
-                        self.finished = False
-                        return True
-                    elif e.key == pygame.K_r:
-                        return False  # remonter pour relancer si déjà en jeu
-        return False
+    def generate(self, clues, cancel=None):
+        """Nouvelle grille (solution, données) ; ne touche pas à la partie en cours.
 
-    def draw(self):
+        cancel : threading.Event qui arrête le travail au plus tôt (grille
+        alors inachevée, à jeter).
+        """
+        full = [[0] * 9 for _ in range(9)]
+        self.fill_full(full)
+        return full, self.dig_holes(full, clues, cancel)
+
+    def prepare(self, choice, clues):
+        # la grille suivante se génère dans un thread pendant qu'on joue (runtime.py)
+        cancel = threading.Event()
+        self.prepared[choice] = (background(self.generate, clues, cancel), cancel)
+
+    def drop_unfinished(self):
+        """Arrête les grilles encore en préparation (on quitte le Sudoku) ; les prêtes sont gardées."""
+        for choice, (task, cancel) in list(self.prepared.items()):
+            if not task.done():
+                cancel.set()
+                del self.prepared[choice]
+
+    def draw_generating(self):
         self.screen.fill(BG)
-        # titre + timer
-        title = self.font.render(f"Sudoku - {self.difficulty_name}", True, TEXT_COLOR)
-        self.screen.blit(title, (20, 10))
-        if not self.finished:
-            elapsed = int(time.time() - self.start_time)
-        else:
-            elapsed = int(self.end_time - self.start_time)
-        timer = self.font.render(f"Temps: {elapsed}s", True, TEXT_COLOR)
-        self.screen.blit(timer, (self.width - 180, 10))
-        # meilleure
-        key = f"Sudoku_{self.difficulty_name}"
-        best = self.best_scores.get(key)
-        if best:
-            best_txt = self.font.render(f"Meilleur: {best}s", True, TEXT_COLOR)
-            self.screen.blit(best_txt, (self.width - 180, 40))
+        txt = self.font.render("Préparation de la grille...", True, TEXT_COLOR)
+        self.screen.blit(txt, txt.get_rect(center=(self.width // 2, self.height // 2)))
+        get_display().flip()
 
-        # grille
-        grid_origin = (50, 100)
-        cell_size = min((self.width - 100) // 9, (self.height - 180) // 9)
-        ox, oy = grid_origin
+    def draw_difficulty_menu(self):
+        self.screen.fill(BG)
+        title = self.font.render("Sudoku : Choisis la difficulté", True, TEXT_COLOR)
+        self.screen.blit(title, title.get_rect(center=(self.width // 2, 60)))
+        for key, (name, clues) in DIFFICULTIES.items():
+            desc = f"{key}. {name} ({clues} indices donnés)"
+            txt = self.font.render(desc, True, TEXT_COLOR)
+            self.screen.blit(txt, (80, 150 + int(key) * 50))
+        info = self.font.render("1/2/3 pour choisir, R: refaire, Q pour quitter", True, TEXT_COLOR)
+        self.screen.blit(info, (40, self.height - 60))
 
+    def choose_difficulty(self):
+        choice = pick(self.draw_difficulty_menu, DIFFICULTIES, quit_keys=(pygame.K_q, pygame.K_r))
+        if choice is None:
+            return False
+        self.difficulty_name, clues = DIFFICULTIES[choice]
+        # grille préparée pendant la partie précédente, sinon générée maintenant ;
+        # dans les deux cas on l'attend fenêtre active (Difficile : plusieurs dizaines de s)
+        if choice not in self.prepared:
+            self.prepare(choice, clues)
+        task = self.prepared[choice][0]
+        if not task.done():
+            self.draw_generating()
+            if not pause(0, until=task):
+                return False  # fenêtre fermée (la génération est arrêtée en sortant de run)
+        del self.prepared[choice]
+        self.solution, self.givens = task.result()
+        self.grid = copy.deepcopy(self.givens)
+        self.selected = (0, 0)
+        self.prepare(choice, clues)
+        self.start_time = time.time()
+        self.finished = False
+        return True
+
+    def grid_geometry(self):
+        # calculée une fois par résolution (display.py), pas à chaque image
+        return get_display().layout("SudokuGame", (self.width, self.height), grid_geometry)
+
+    def paint_background(self, surf):
+        surf.fill(BG)
+        title = self.font.render(f"Sudoku - {self.difficulty_name}", True, TEXT_COLOR)
+        surf.blit(title, (20, 10))
+        # instructions
+        inst = self.font.render("Flèches: déplacer | 1-9: entrer | Effacer: Backspace | Entrée: vérifier | Q: quitter", True, TEXT_COLOR)
+        surf.blit(inst, (20, self.height - 30))
+
+    def paint_selection(self, surf):
+        (ox, oy), cell_size = self.grid_geometry()
         # surligner sélection
         sr, sc = self.selected
         sel_rect = pygame.Rect(ox + sc * cell_size, oy + sr * cell_size, cell_size, cell_size)
-        pygame.draw.rect(self.screen, HIGHLIGHT_COLOR, sel_rect)
+        self.presenter.sprite('selected', pygame.draw.rect(surf, HIGHLIGHT_COLOR, sel_rect))
 
+    def paint_grid(self, surf):
+        (ox, oy), cell_size = self.grid_geometry()
         # dessiner lignes épaisses par blocs
         for i in range(10):
             thickness = 3 if i % 3 == 0 else 1
-            pygame.draw.line(self.screen, GRID_COLOR,
+            pygame.draw.line(surf, GRID_COLOR,
                              (ox + i * cell_size, oy),
                              (ox + i * cell_size, oy + 9 * cell_size), thickness)
-            pygame.draw.line(self.screen, GRID_COLOR,
+            pygame.draw.line(surf, GRID_COLOR,
                              (ox, oy + i * cell_size),
                              (ox + 9 * cell_size, oy + i * cell_size), thickness)
 
+    def paint_numbers(self, surf):
+        present = self.presenter
+        # timer
+        if not self.finished:
+            elapsed = int(time.time() - self.start_time)
+        else:
+            elapsed = int(self.end_time - self.start_time)
+        timer_rect = self.font.glyphs(TEXT_COLOR, BG).draw(surf, f"Temps: {elapsed}s", (self.width - 180, 10))
+        present.sprite('timer', timer_rect, elapsed)
+        # meilleure
+        key = f"Sudoku_{self.difficulty_name}"
+        best = self.best_scores.get(key)
+        if best:
+            best_txt = self.font.render(f"Meilleur: {best}s", True, TEXT_COLOR)
+            present.sprite('best', surf.blit(best_txt, (self.width - 180, 40)), best)
+
         # dessiner chiffres
+        (ox, oy), cell_size = self.grid_geometry()
         for r in range(9):
             for c in range(9):
                 val = self.grid[r][c]
@@ -212,11 +260,19 @@ class SudokuGame:
                     color = CONFLICT_COLOR
                 txt = self.font.render(str(val), True, color)
                 rect = txt.get_rect(center=(x, y))
-                self.screen.blit(txt, rect)
+                present.sprite((r, c), surf.blit(txt, rect), (val, color))
 
-        # instructions
-        inst = self.font.render("Flèches: déplacer | 1-9: entrer | Effacer: Backspace | Entrée: vérifier | Q: quitter", True, TEXT_COLOR)
-        self.screen.blit(inst, (20, self.height - 30))
+    def build_layers(self):
+        self.layers = Compositor(self.screen)
+        self.layers.add('background', self.paint_background)
+        self.layers.add('selection', self.paint_selection, static=False)
+        self.layers.add('grid', self.paint_grid)
+        self.layers.add('numbers', self.paint_numbers, static=False)
+
+    def draw(self):
+        # fond et lignes de la grille en cache (layers.py) : seuls la
+        # sélection, les chiffres et les compteurs sont redessinés
+        self.layers.compose(self.presenter)
 
     def is_valid_move(self, board, row, col, val):
         # Vérifie que la valeur respecte les règles en ignorant la cellule elle-même
@@ -244,13 +300,37 @@ class SudokuGame:
         return True
 
     def run(self):
+        try:
+            self.play_rounds()
+        finally:
+            # hors du Sudoku, une grille en préparation ne doit pas ralentir les autres jeux
+            self.drop_unfinished()
+
+    def play_rounds(self):
         running = True
         while running:
             if not self.choose_difficulty():
                 return
-            clock = pygame.time.Clock()
-            while running:
-                for e in pygame.event.get():
+            # redessine seulement sur une touche ou quand le chrono change de seconde
+            governor = FrameGovernor()
+            governor.tick_every_second(self.start_time)
+            self.presenter = Presenter(self.screen, "SudokuGame")
+            self.build_layers()
+            playing = True
+            while playing:
+                if governor.frame():
+                    if self.finished:
+                        # écran de victoire
+                        self.draw()
+                        win_txt = self.font.render("Bravo ! Tu as résolu le Sudoku.", True, INPUT_COLOR)
+                        prompt = self.font.render("Appuie sur Entrée pour continuer", True, TEXT_COLOR)
+                        self.presenter.sprite('win', self.screen.blit(win_txt, (self.width // 2 - win_txt.get_width() // 2, 60)))
+                        self.presenter.sprite('prompt', self.screen.blit(prompt, (self.width // 2 - prompt.get_width() // 2, 100)))
+                    else:
+                        self.draw()
+                    self.presenter.present()
+                for e in governor.events():
+                    self.presenter.notice(e)
                     if e.type == pygame.QUIT:
                         return
                     elif e.type == pygame.KEYDOWN:
@@ -272,10 +352,14 @@ class SudokuGame:
                             r, c = self.selected
                             if self.givens[r][c] == 0:
                                 self.grid[r][c] = 0
-                        elif e.unicode in '123456789':
+                        elif e.unicode and e.unicode in '123456789':
                             r, c = self.selected
                             if self.givens[r][c] == 0:
                                 self.grid[r][c] = int(e.unicode)
+                        elif e.key == pygame.K_RETURN and self.finished:
+                            # grille résolue : retour au choix de difficulté
+                            self.finished = False
+                            playing = False
                         elif e.key == pygame.K_RETURN:
                             if self.check_complete():
                                 self.finished = True
@@ -285,26 +369,9 @@ class SudokuGame:
                                 prev = self.best_scores.get(key)
                                 if (prev is None) or (duration < prev):
                                     self.best_scores[key] = duration
-                                    self.save_scores()
+                                self.best_scores.record_run("Sudoku", self.difficulty_name, duration, duration)
+                                governor.tick_every_second(None)  # chrono arrêté
                             else:
                                 # petit feedback visuel: rien de spécial, les conflits sont en rouge
                                 pass
 
-                if self.finished:
-                    # écran de victoire
-                    self.draw()
-                    win_txt = self.font.render("Bravo ! Tu as résolu le Sudoku.", True, INPUT_COLOR)
-                    prompt = self.font.render("Appuie sur Entrée pour continuer", True, TEXT_COLOR)
-                    self.screen.blit(win_txt, (self.width // 2 - win_txt.get_width() // 2, 60))
-                    self.screen.blit(prompt, (self.width // 2 - prompt.get_width() // 2, 100))
-                    pygame.display.flip()
-                    for e in pygame.event.get():
-                        if e.type == pygame.QUIT:
-                            return
-                        elif e.type == pygame.KEYDOWN and e.key == pygame.K_RETURN:
-                            self.finished = False
-                            break
-                else:
-                    self.draw()
-                    pygame.display.flip()
-                clock.tick(60)
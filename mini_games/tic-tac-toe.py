@@ -2,6 +2,19 @@ import pygame
 import random
 import time
 
+from .display import get_display
+from .fonts import get_font
+from .layers import Compositor
+from .loop import FrameGovernor
+from .metrics import get_counter
+from .modal import pick, wait_key
+from .present import Presenter
+from .runtime import background, pause
+
+GAME_INFO = {"name": "Morpion", "class": "TicTacToeGame", "scores": {}, "order": 40}
+
+MINIMAX_NODES = get_counter("tictactoe.minimax_nodes")
+
 # Couleurs et paramètres
 BG = (25, 25, 60)
 LINE_COLOR = (200, 200, 200)
@@ -13,6 +26,7 @@ BOARD_SIZE = 3
 CELL_SIZE = 140
 PADDING = 20
 WINDOW_SIZE = BOARD_SIZE * CELL_SIZE + PADDING * 2
+AI_DELAY = 0.2  # durée minimale du tour de l'IA (lisibilité), en secondes
 
 DIFFICULTIES = {
     '1': 'Facile',
@@ -26,7 +40,7 @@ class TicTacToeGame:
         self.screen = screen
         self.width = WINDOW_SIZE
         self.height = WINDOW_SIZE + 80  # espace pour texte
-        self.font = pygame.font.Font(None, FONT_SIZE)
+        self.font = get_font(FONT_SIZE)
         self.board = [['' for _ in range(3)] for _ in range(3)]
         self.current = 'X'  # X commence
         self.mode = None  # '2joueurs' ou 'solo'
@@ -34,37 +48,44 @@ class TicTacToeGame:
         self.ai_symbol = 'O'
         self.human_symbol = 'X'
 
-    def draw_board(self):
-        self.screen.fill(BG)
+    def paint_board(self, surf):
+        surf.fill(BG)
         # Dessiner les lignes
         for i in range(1, BOARD_SIZE):
             # verticales
             x = PADDING + i * CELL_SIZE
-            pygame.draw.line(self.screen, LINE_COLOR, (x, PADDING), (x, PADDING + BOARD_SIZE * CELL_SIZE), 4)
+            pygame.draw.line(surf, LINE_COLOR, (x, PADDING), (x, PADDING + BOARD_SIZE * CELL_SIZE), 4)
             # horizontales
             y = PADDING + i * CELL_SIZE
-            pygame.draw.line(self.screen, LINE_COLOR, (PADDING, y), (PADDING + BOARD_SIZE * CELL_SIZE, y), 4)
+            pygame.draw.line(surf, LINE_COLOR, (PADDING, y), (PADDING + BOARD_SIZE * CELL_SIZE, y), 4)
 
+    def paint_pieces(self, surf):
         # Dessiner X et O
         for row in range(3):
             for col in range(3):
                 val = self.board[row][col]
+                cell = (PADDING + col * CELL_SIZE, PADDING + row * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+                self.presenter.sprite((row, col), cell, val)
                 center_x = PADDING + col * CELL_SIZE + CELL_SIZE // 2
                 center_y = PADDING + row * CELL_SIZE + CELL_SIZE // 2
                 if val == 'X':
                     # deux lignes croisées
                     offset = CELL_SIZE // 3
-                    pygame.draw.line(self.screen, X_COLOR,
+                    pygame.draw.line(surf, X_COLOR,
                                      (center_x - offset, center_y - offset),
                                      (center_x + offset, center_y + offset), 8)
-                    pygame.draw.line(self.screen, X_COLOR,
+                    pygame.draw.line(surf, X_COLOR,
                                      (center_x + offset, center_y - offset),
                                      (center_x - offset, center_y + offset), 8)
                 elif val == 'O':
-                    pygame.draw.circle(self.screen, O_COLOR, (center_x, center_y), CELL_SIZE // 3, 8)
+                    pygame.draw.circle(surf, O_COLOR, (center_x, center_y), CELL_SIZE // 3, 8)
+
+    def draw_board(self):
+        # fond et lignes en cache (layers.py), pièces redessinées
+        self.layers.compose()
 
-    def check_winner(self):
-        b = self.board
+    def check_winner(self, board=None):
+        b = self.board if board is None else board
         lines = []
 
         # lignes et colonnes
@@ -87,7 +108,10 @@ class TicTacToeGame:
             return 'Draw'
         return None
 
-    def minimax(self, board, depth, is_maximizing):
+    def minimax(self, board, depth, is_maximizing, nodes=None):
+        # nodes : liste [n] propre à l'appelant, comptant les positions examinées
+        if nodes is not None:
+            nodes[0] += 1
         winner = self._evaluate_board(board)
         if winner is not None:
             return winner
@@ -98,7 +122,7 @@ class TicTacToeGame:
                 for c in range(3):
                     if board[r][c] == '':
                         board[r][c] = self.ai_symbol
-                        score = self.minimax(board, depth + 1, False)
+                        score = self.minimax(board, depth + 1, False, nodes)
                         board[r][c] = ''
                         best = max(best, score)
             return best
@@ -108,7 +132,7 @@ class TicTacToeGame:
                 for c in range(3):
                     if board[r][c] == '':
                         board[r][c] = self.human_symbol
-                        score = self.minimax(board, depth + 1, True)
+                        score = self.minimax(board, depth + 1, True, nodes)
                         board[r][c] = ''
                         best = min(best, score)
             return best
@@ -133,108 +157,114 @@ class TicTacToeGame:
             return 0
         return None  # pas fini
 
-    def ai_move(self):
+    def ai_move(self, board):
+        """Coup de l'IA (ligne, colonne) sur board, une copie de la grille : appelé dans un thread."""
         if self.difficulty == 'Facile':
-            choices = [(r, c) for r in range(3) for c in range(3) if self.board[r][c] == '']
+            choices = [(r, c) for r in range(3) for c in range(3) if board[r][c] == '']
             return random.choice(choices) if choices else None
 
         elif self.difficulty == 'Moyen':
             # gagner si possible
             for r in range(3):
                 for c in range(3):
-                    if self.board[r][c] == '':
-                        self.board[r][c] = self.ai_symbol
-                        if self.check_winner() == self.ai_symbol:
-                            self.board[r][c] = ''
+                    if board[r][c] == '':
+                        board[r][c] = self.ai_symbol
+                        if self.check_winner(board) == self.ai_symbol:
+                            board[r][c] = ''
                             return (r, c)
-                        self.board[r][c] = ''
+                        board[r][c] = ''
             # bloquer l'humain
             for r in range(3):
                 for c in range(3):
-                    if self.board[r][c] == '':
-                        self.board[r][c] = self.human_symbol
-                        if self.check_winner() == self.human_symbol:
-                            self.board[r][c] = ''
+                    if board[r][c] == '':
+                        board[r][c] = self.human_symbol
+                        if self.check_winner(board) == self.human_symbol:
+                            board[r][c] = ''
                             return (r, c)
-                        self.board[r][c] = ''
+                        board[r][c] = ''
             # sinon aléatoire
-            return self.ai_move_easy_fallback()
+            return self.ai_move_easy_fallback(board)
 
         else:  # Difficile
             best_score = -float('inf')
             best_move = None
+            nodes = [0]
             for r in range(3):
                 for c in range(3):
-                    if self.board[r][c] == '':
-                        self.board[r][c] = self.ai_symbol
-                        score = self.minimax(self.board, 0, False)
-                        self.board[r][c] = ''
+                    if board[r][c] == '':
+                        board[r][c] = self.ai_symbol
+                        score = self.minimax(board, 0, False, nodes)
+                        board[r][c] = ''
                         if score is None:
                             continue
                         if score > best_score:
                             best_score = score
                             best_move = (r, c)
-            return best_move if best_move else self.ai_move_easy_fallback()
+            MINIMAX_NODES.inc(nodes[0])
+            return best_move if best_move else self.ai_move_easy_fallback(board)
 
-    def ai_move_easy_fallback(self):
+    def ai_move_easy_fallback(self, board):
         # fallback aléatoire
-        choices = [(r, c) for r in range(3) for c in range(3) if self.board[r][c] == '']
+        choices = [(r, c) for r in range(3) for c in range(3) if board[r][c] == '']
         return random.choice(choices) if choices else None
 
+    def draw_mode_menu(self):
+        self.screen.fill(BG)
+        title = self.font.render("Morpion : mode", True, TEXT_COLOR)
+        self.screen.blit(title, title.get_rect(center=(self.width // 2, 60)))
+        m1 = self.font.render("1. 2 Joueurs", True, TEXT_COLOR)
+        m2 = self.font.render("2. Solo contre IA", True, TEXT_COLOR)
+        self.screen.blit(m1, (100, 140))
+        self.screen.blit(m2, (100, 190))
+        info = self.font.render("1/2 pour choisir, Q pour quitter", True, TEXT_COLOR)
+        self.screen.blit(info, (80, self.height - 60))
+
     def choose_mode_and_difficulty(self):
-        choosing = True
-        while choosing:
-            self.screen.fill(BG)
-            title = self.font.render("Morpion : mode", True, TEXT_COLOR)
-            self.screen.blit(title, title.get_rect(center=(self.width // 2, 60)))
-            m1 = self.font.render("1. 2 Joueurs", True, TEXT_COLOR)
-            m2 = self.font.render("2. Solo contre IA", True, TEXT_COLOR)
-            self.screen.blit(m1, (100, 140))
-            self.screen.blit(m2, (100, 190))
-            info = self.font.render("1/2 pour choisir, Q pour quitter", True, TEXT_COLOR)
-            self.screen.blit(info, (80, self.height - 60))
-            pygame.display.flip()
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    return False
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_q:
-                        return False
-                    if event.unicode == '1':
-                        self.mode = '2joueurs'
-                        return True
-                    elif event.unicode == '2':
-                        self.mode = 'solo'
-                        # choisir difficulté
-                        return self.choose_difficulty()
+        choice = pick(self.draw_mode_menu, '12')
+        if choice == '1':
+            self.mode = '2joueurs'
+            return True
+        if choice == '2':
+            self.mode = 'solo'
+            # choisir difficulté
+            return self.choose_difficulty()
         return False
 
+    def draw_difficulty_menu(self):
+        self.screen.fill(BG)
+        title = self.font.render("Choisis la difficulté IA", True, TEXT_COLOR)
+        self.screen.blit(title, title.get_rect(center=(self.width // 2, 60)))
+        for key, name in DIFFICULTIES.items():
+            txt = self.font.render(f"{key}. {name}", True, TEXT_COLOR)
+            self.screen.blit(txt, (120, 160 + int(key) * 50))
+        info = self.font.render("1/2/3 pour choisir, Q pour revenir", True, TEXT_COLOR)
+        self.screen.blit(info, (80, self.height - 60))
+
     def choose_difficulty(self):
-        choosing = True
-        while choosing:
-            self.screen.fill(BG)
-            title = self.font.render("Choisis la difficulté IA", True, TEXT_COLOR)
-            self.screen.blit(title, title.get_rect(center=(self.width // 2, 60)))
-            for key, name in DIFFICULTIES.items():
-                txt = self.font.render(f"{key}. {name}", True, TEXT_COLOR)
-                self.screen.blit(txt, (120, 160 + int(key) * 50))
-            info = self.font.render("1/2/3 pour choisir, Q pour revenir", True, TEXT_COLOR)
-            self.screen.blit(info, (80, self.height - 60))
-            pygame.display.flip()
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    return False
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_q:
-                        return False
-                    if event.unicode in DIFFICULTIES:
-                        self.difficulty = DIFFICULTIES[event.unicode]
-                        return True
-        return False
+        choice = pick(self.draw_difficulty_menu, DIFFICULTIES)
+        if choice is None:
+            return False
+        self.difficulty = DIFFICULTIES[choice]
+        return True
 
     def run(self):
-        # redimensionne l'écran si besoin
-        self.screen = pygame.display.set_mode((self.width, self.height))
+        # plateau plus haut que la fenêtre : on dessine dans une surface à sa
+        # taille, mise à l'échelle dans la fenêtre (display.py), sans
+        # recréer la fenêtre ; elle est rendue au menu en sortant
+        display = get_display()
+        self.screen = display.use((self.width, self.height))
+        try:
+            self.play()
+        finally:
+            display.restore()
+
+    def build_layers(self):
+        self.layers = Compositor(self.screen)
+        self.layers.add('board', self.paint_board)
+        self.layers.add('pieces', self.paint_pieces, static=False)
+
+    def play(self):
+        self.build_layers()
         if not self.choose_mode_and_difficulty():
             return
 
@@ -242,18 +272,20 @@ class TicTacToeGame:
         self.board = [['' for _ in range(3)] for _ in range(3)]
         self.current = 'X'
         running = True
-        clock = pygame.time.Clock()
+        governor = FrameGovernor()
+        self.presenter = Presenter(self.screen, "TicTacToeGame")
 
         while running:
-            self.draw_board()
-            # info
-            turn_txt = f"Tour: {self.current}" if self.mode == '2joueurs' or self.current == self.human_symbol else "IA joue..."
-            info1 = self.font.render(turn_txt, True, TEXT_COLOR)
-            self.screen.blit(info1, (10, self.height - 70))
-            if self.mode == 'solo':
-                diff_txt = self.font.render(f"Difficulté: {self.difficulty}", True, TEXT_COLOR)
-                self.screen.blit(diff_txt, (10, self.height - 40))
-            pygame.display.flip()
+            if governor.frame():
+                self.draw_board()
+                # info
+                turn_txt = f"Tour: {self.current}" if self.mode == '2joueurs' or self.current == self.human_symbol else "IA joue..."
+                info1 = self.font.render(turn_txt, True, TEXT_COLOR)
+                self.presenter.sprite('turn', self.screen.blit(info1, (10, self.height - 70)), turn_txt)
+                if self.mode == 'solo':
+                    diff_txt = self.font.render(f"Difficulté: {self.difficulty}", True, TEXT_COLOR)
+                    self.screen.blit(diff_txt, (10, self.height - 40))
+                self.presenter.present()
 
             winner = self.check_winner()
             if winner:
@@ -262,46 +294,37 @@ class TicTacToeGame:
                     result_msg = "Égalité!"
                 else:
                     result_msg = f"{winner} a gagné!"
-                self.screen.fill(BG)
                 self.draw_board()
                 end_txt = self.font.render(result_msg, True, TEXT_COLOR)
                 prompt = self.font.render("Appuie sur Entrée pour revenir", True, TEXT_COLOR)
                 self.screen.blit(end_txt, end_txt.get_rect(center=(self.width // 2, self.height // 2 - 20)))
                 self.screen.blit(prompt, prompt.get_rect(center=(self.width // 2, self.height // 2 + 30)))
-                pygame.display.flip()
-                waiting = True
-                while waiting:
-                    for e in pygame.event.get():
-                        if e.type == pygame.QUIT:
-                            waiting = False
-                            running = False
-                        elif e.type == pygame.KEYDOWN and e.key == pygame.K_RETURN:
-                            waiting = False
-                            running = False
+                wait_key()
                 break
 
             if self.mode == 'solo' and self.current == self.ai_symbol:
-                # tour de l'IA
-                move = self.ai_move()
+                # tour de l'IA : calculé dans un thread (runtime.py) pendant que
+                # la fenêtre reste active, affiché après au moins AI_DELAY
+                # sur une copie : la boucle continue de dessiner self.board pendant le calcul
+                task = background(self.ai_move, [row[:] for row in self.board])
+                if not pause(AI_DELAY, self.presenter, until=task):
+                    break  # fenêtre fermée
+                move = task.result()
                 if move:
                     r, c = move
                     self.board[r][c] = self.ai_symbol
                     self.current = self.human_symbol
+                governor.invalidate()  # coup joué sans entrée : on redessine
             else:
-                for event in pygame.event.get():
+                for event in governor.events():
+                    self.presenter.notice(event)
                     if event.type == pygame.QUIT:
                         running = False
                     elif event.type == pygame.MOUSEBUTTONDOWN and self.current != self.ai_symbol:
-                        mx, my = pygame.mouse.get_pos()
+                        mx, my = get_display().to_logical(event.pos)
                         # clique sur une case
                         col = (mx - PADDING) // CELL_SIZE
                         row = (my - PADDING) // CELL_SIZE
                         if 0 <= row < 3 and 0 <= col < 3 and self.board[row][col] == '':
                             self.board[row][col] = self.current
                             self.current = 'O' if self.current == 'X' else 'X'
-
-            # Si mode solo et c'est au tour IA, small délai pour lisibilité
-            if self.mode == 'solo' and self.current == self.ai_symbol:
-                pygame.time.delay(200)
-
-            clock.tick(60)
@@ -1,8 +1,14 @@
 import pygame
 import random
-import time
-import json
-import os
+
+from .assets import get_atlas
+from .fonts import get_font
+from .layers import Compositor
+from .loop import GameLoop
+from .modal import wait_key
+from .scores import get_store
+
+GAME_INFO = {"name": "La taupe", "class": "WhackAMoleGame", "scores": {"WhackAMole_*_time": "min", "WhackAMole_*": "max"}, "order": 80}
 
 # Whack-a-Mole avec niveaux
 # Fichier attendu : mini_games/whack_a_mole.py
@@ -16,8 +22,6 @@ HOLE_COLOR = (50, 50, 80)
 TEXT_COLOR = (240, 240, 240)
 FONT_SIZE = 28
 
-SCORES_FILE = os.path.join(os.path.dirname(__file__), '..', 'best_scores.json')
-
 # Configuration des niveaux
 LEVELS = [
     {"name": "Facile", "mole_interval": 1.2, "visible_time": 1.0, "simultaneous": 1, "target_hits": 10, "time_limit": 30},
@@ -26,28 +30,19 @@ LEVELS = [
     {"name": "Expert", "mole_interval": 0.5, "visible_time": 0.5, "simultaneous": 4, "target_hits": 25, "time_limit": 30},
 ]
 
-class WhackAMoleGame:
+class WhackAMoleGame(GameLoop):
     def __init__(self, screen):
         self.screen = screen
         self.width, self.height = screen.get_size()
-        self.font = pygame.font.Font(None, FONT_SIZE)
-        self.best_scores = self.load_scores()
+        self.font = get_font(FONT_SIZE)
+        self.best_scores = get_store()
         self.holes = []  # positions des trous
         self.moles = []  # moles actives
+        self.sprites = get_atlas("WhackAMoleGame", self.define_sprites)
 
-    def load_scores(self):
-        try:
-            with open(SCORES_FILE, 'r') as f:
-                return json.load(f)
-        except Exception:
-            return {}
-
-    def save_scores(self):
-        try:
-            with open(SCORES_FILE, 'w') as f:
-                json.dump(self.best_scores, f)
-        except Exception:
-            pass
+    def define_sprites(self, atlas):
+        atlas.circle(MOLE_COLOR, MOLE_COLOR, 30)
+        atlas.circle(MOLE_HIT_COLOR, MOLE_HIT_COLOR, 30)
 
     def prepare_holes(self):
         # grille 4x3 de trous centrés
@@ -64,10 +59,10 @@ class WhackAMoleGame:
                 y = margin_y + r * spacing_y
                 self.holes.append((x, y))
 
-    def draw_holes(self):
+    def draw_holes(self, surf):
         for pos in self.holes:
             x, y = pos
-            pygame.draw.circle(self.screen, HOLE_COLOR, (x, y), 35)
+            pygame.draw.circle(surf, HOLE_COLOR, (x, y), 35)
 
     def spawn_moles(self, level_conf, now, last_spawn):
         # créer jusqu'à simultaneous moles si temps écoulé
@@ -90,83 +85,113 @@ class WhackAMoleGame:
             })
         return now
 
-    def draw_moles(self, now):
+    def expire_moles(self, now):
         for m in self.moles:
-            if m.get("removed"):
-                continue
-            if now > m["visible_until"] and not m.get("hit"):
+            if not m.get("removed") and not m.get("hit") and now > m["visible_until"]:
                 m["removed"] = True
+
+    def draw_moles(self, surf):
+        for i, m in enumerate(self.moles):
+            if m.get("removed"):
                 continue
             x, y = m["pos"]
             color = MOLE_HIT_COLOR if m.get("hit") else MOLE_COLOR
-            pygame.draw.circle(self.screen, color, (x, y), 30)
+            self.presenter.sprite(('mole', i), self.sprites.blit(surf, color, center=(x, y)), color)
+
+    def start_level(self, level_index):
+        self.level_index = level_index
+        self.level_conf = LEVELS[level_index]
+        self.hits = 0
+        self.last_spawn = 0
+        self.moles = []
+        self.level_complete_time = None
+        self.result = None
+        self.layers.invalidate('background')  # titre et meilleur temps du niveau
 
     def run_level(self, level_index):
-        level_conf = LEVELS[level_index]
+        self.start_level(level_index)
+        # temps en secondes de jeu (self.time), avancé par la boucle à pas fixe
+        self.run_loop()
+        if self.result is None:  # fenêtre fermée
+            return False, level_index, self.hits
+        return self.result
+
+    def handle_event(self, event):
+        if event.type == pygame.QUIT:
+            self.stop()
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            mx, my = event.pos
+            for m in self.moles:
+                if m.get("removed") or m.get("hit"):
+                    continue
+                x, y = m["pos"]
+                dist = ((mx - x) ** 2 + (my - y) ** 2) ** 0.5
+                if dist <= 30:
+                    m["hit"] = True
+                    self.hits += 1
+                    # un petit feedback visuel, la mole disparaît
+                    m["removed"] = True
+                    if self.hits >= self.level_conf["target_hits"] and self.level_complete_time is None:
+                        self.level_complete_time = self.time
+
+    def update(self, dt):
+        level_conf = self.level_conf
+        now = self.time
+        self.expire_moles(now)
+        # spawn
+        self.last_spawn = self.spawn_moles(level_conf, now, self.last_spawn)
+        # conditions de fin
+        hits = self.hits
         target = level_conf["target_hits"]
         time_limit = level_conf["time_limit"]
-        hits = 0
-        start = time.time()
-        last_spawn = 0
-        self.moles = []
-        level_complete_time = None
-        while True:
-            now = time.time()
-            elapsed = now - start
-            remaining = max(0, int(time_limit - elapsed))
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    return False, level_index, hits
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    mx, my = pygame.mouse.get_pos()
-                    for m in self.moles:
-                        if m.get("removed") or m.get("hit"):
-                            continue
-                        x, y = m["pos"]
-                        dist = ((mx - x) ** 2 + (my - y) ** 2) ** 0.5
-                        if dist <= 30:
-                            m["hit"] = True
-                            hits += 1
-                            # un petit feedback visuel, la mole disparaît
-                            m["removed"] = True
-                            if hits >= target and level_complete_time is None:
-                                level_complete_time = now - start
-            # spawn
-            last_spawn = self.spawn_moles(level_conf, now, last_spawn)
-            # dessin
-            self.screen.fill(BG)
-            # en-tête
-            title = self.font.render(f"Whack-a-Mole - Niveau {level_conf['name']}", True, TEXT_COLOR)
-            self.screen.blit(title, (20, 10))
-            score_txt = self.font.render(f"Touches: {hits}/{target}", True, TEXT_COLOR)
-            self.screen.blit(score_txt, (20, 40))
-            timer_txt = self.font.render(f"Temps: {remaining}s", True, TEXT_COLOR)
-            self.screen.blit(timer_txt, (20, 70))
+        if hits >= target or now >= time_limit:
+            self.best_scores.record_run("WhackAMole", level_conf['name'], hits, min(now, time_limit))
+            self.stop()
+        if hits >= target:
+            # niveau terminé
+            # enregistre temps si meilleur
             best_key_level = f"WhackAMole_{level_conf['name']}_time"
-            best_time = self.best_scores.get(best_key_level)
-            if best_time:
-                best_txt = self.font.render(f"Meilleur temps: {best_time:.1f}s", True, TEXT_COLOR)
-                self.screen.blit(best_txt, (20, 100))
-            self.draw_holes()
-            self.draw_moles(now)
-            pygame.display.flip()
-            # conditions de fin
-            if hits >= target:
-                # niveau terminé
-                # enregistre temps si meilleur
-                if level_complete_time is not None:
-                    prev = self.best_scores.get(best_key_level)
-                    if (prev is None) or (level_complete_time < prev):
-                        self.best_scores[best_key_level] = round(level_complete_time, 1)
-                        self.save_scores()
-                return True, level_index + 1, hits
-            if elapsed >= time_limit:
-                return False, level_index, hits
-            time.sleep(0.01)
-        # fin boucle
+            if self.level_complete_time is not None:
+                prev = self.best_scores.get(best_key_level)
+                if (prev is None) or (self.level_complete_time < prev):
+                    self.best_scores[best_key_level] = round(self.level_complete_time, 1)
+            self.result = (True, self.level_index + 1, hits)
+        elif now >= time_limit:
+            self.result = (False, self.level_index, hits)
+
+    def paint_background(self, surf):
+        level_conf = self.level_conf
+        surf.fill(BG)
+        # en-tête
+        title = self.font.render(f"Whack-a-Mole - Niveau {level_conf['name']}", True, TEXT_COLOR)
+        surf.blit(title, (20, 10))
+        best_time = self.best_scores.get(f"WhackAMole_{level_conf['name']}_time")
+        if best_time:
+            best_txt = self.font.render(f"Meilleur temps: {best_time:.1f}s", True, TEXT_COLOR)
+            surf.blit(best_txt, (20, 100))
+
+    def paint_hud(self, surf):
+        level_conf = self.level_conf
+        remaining = max(0, int(level_conf["time_limit"] - self.time))
+        counters = self.font.glyphs(TEXT_COLOR, BG)
+        hits_rect = counters.draw(surf, f"Touches: {self.hits}/{level_conf['target_hits']}", (20, 40))
+        self.presenter.sprite('hits', hits_rect, self.hits)
+        self.presenter.sprite('timer', counters.draw(surf, f"Temps: {remaining}s", (20, 70)), remaining)
+
+    def render(self, alpha):
+        self.layers.compose(self.presenter)
+
+    def build_layers(self):
+        # fond et trous en cache : seuls les taupes et les compteurs sont redessinés
+        self.layers = Compositor(self.screen)
+        self.layers.add('background', self.paint_background)
+        self.layers.add('holes', self.draw_holes)
+        self.layers.add('moles', self.draw_moles, static=False)
+        self.layers.add('hud', self.paint_hud, static=False)
 
     def run(self):
         self.prepare_holes()
+        self.build_layers()
         level_index = 0
         total_hits = 0
         progressed = True
@@ -178,25 +203,19 @@ class WhackAMoleGame:
                 prev_lvl = self.best_scores.get("WhackAMole_MaxLevel", 0)
                 if level_index + 1 > prev_lvl:
                     self.best_scores["WhackAMole_MaxLevel"] = level_index + 1
-                    self.save_scores()
                 # message de transition
                 self.screen.fill(BG)
                 msg = self.font.render(f"Niveau {LEVELS[level_index]['name']} réussi!", True, TEXT_COLOR)
                 prompt = self.font.render("Appuie sur Entrée pour continuer", True, TEXT_COLOR)
                 self.screen.blit(msg, msg.get_rect(center=(self.width//2, self.height//2 - 20)))
                 self.screen.blit(prompt, prompt.get_rect(center=(self.width//2, self.height//2 + 20)))
-                pygame.display.flip()
-                waiting = True
-                while waiting:
-                    for e in pygame.event.get():
-                        if e.type == pygame.QUIT:
-                            waiting = False
-                            progressed = False
-                        elif e.type == pygame.KEYDOWN and e.key == pygame.K_RETURN:
-                            waiting = False
+                if wait_key() is None:
+                    return  # fenêtre fermée
                 level_index = next_index
             else:
                 progressed = False
+        if self.result is None:
+            return  # fenêtre fermée pendant le niveau
         # fin jeu: écran résultat global
         self.screen.fill(BG)
         if level_index >= len(LEVELS):
@@ -211,12 +230,4 @@ class WhackAMoleGame:
         self.screen.blit(txt, txt.get_rect(center=(self.width//2, self.height//2 - 30)))
         self.screen.blit(best_lvl_txt, best_lvl_txt.get_rect(center=(self.width//2, self.height//2 + 10)))
         self.screen.blit(prompt, prompt.get_rect(center=(self.width//2, self.height//2 + 50)))
-        pygame.display.flip()
-        waiting = True
-        while waiting:
-            for e in pygame.event.get():
-                if e.type == pygame.QUIT:
-                    waiting = False
-                elif e.type == pygame.KEYDOWN and e.key == pygame.K_RETURN:
-                    waiting = False
-```}
+        wait_key()